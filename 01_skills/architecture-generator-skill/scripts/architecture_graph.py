@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Graph intermediate representation for architecture diagrams
+ArchitectureGenerator populates an ArchitectureGraph (nodes, edges,
+subgraphs and styles) once; serializers turn the same graph into Mermaid,
+Graphviz DOT or JSON. Node labels use '\\n' for line breaks, each serializer
+writes them in its own syntax. from_mermaid() reads a (possibly hand-edited)
+Mermaid diagram back into a graph, e.g. for render_diagram.py. split_graph()
+breaks a graph over a node budget into an overview plus linked sub-diagrams.
+
+Adding a format:
+    def to_plantuml(graph: ArchitectureGraph) -> str:
+        ...
+    SERIALIZERS["plantuml"] = to_plantuml
+    FILE_SUFFIXES["plantuml"] = "_architecture.puml"
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Shared utilities live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+import patterns
+
+
+class NodeStyle(NamedTuple):
+    """Box colours and border width of a node"""
+    fill: str
+    stroke: str
+    stroke_width: int = 2
+    color: str = '#000000'
+
+
+# Mermaid's default node colours, for nodes without a style of their own
+DEFAULT_STYLE = NodeStyle('#ececff', '#9370db', 1, '#333333')
+# split_graph(): overview nodes standing for a sub-diagram, and the outside nodes a sub-diagram points to
+LINK_STYLE = NodeStyle('#fffde7', '#f9a825', 2, '#000000')
+STUB_STYLE = NodeStyle('#fafafa', '#9e9e9e', 1, '#616161')
+
+
+class Node(NamedTuple):
+    id: str
+    label: str
+    style: Optional[NodeStyle] = None
+    css_class: Optional[str] = None
+
+
+class Edge(NamedTuple):
+    source: str
+    target: str
+    label: Optional[str] = None
+    dashed: bool = False
+
+
+class Subgraph(NamedTuple):
+    title: str
+    nodes: List[str]
+    direction: Optional[str] = None
+
+
+class ArchitectureGraph:
+    """Nodes, edges and subgraphs of one diagram, in drawing order"""
+
+    def __init__(self, direction: str = 'TB'):
+        self.direction = direction
+        self.nodes: Dict[str, Node] = {}
+        self.edges: List[Edge] = []
+        self.subgraphs: Dict[str, Subgraph] = {}
+        self.class_defs: Dict[str, NodeStyle] = {}
+
+    def add_subgraph(self, title: str, direction: Optional[str] = None) -> Subgraph:
+        subgraph = Subgraph(title, [], direction)
+        self.subgraphs[title] = subgraph
+        return subgraph
+
+    def add_node(self, node_id: str, label: str, style: Optional[NodeStyle] = None,
+                 css_class: Optional[str] = None, subgraph: Optional[str] = None) -> Node:
+        """Add a node, optionally inside the subgraph with the given title"""
+        if node_id in self.nodes:
+            raise ValueError(f"Duplicate node id: {node_id}")
+        node = Node(node_id, label, style, css_class)
+        self.nodes[node_id] = node
+        if subgraph is not None:
+            self.subgraphs[subgraph].nodes.append(node_id)
+        return node
+
+    def add_edge(self, source: str, target: str, label: Optional[str] = None, dashed: bool = False) -> Edge:
+        edge = Edge(source, target, label, dashed)
+        self.edges.append(edge)
+        return edge
+
+    def node_style(self, node: Node) -> Optional[NodeStyle]:
+        """Style drawn for a node: its own, else its class's"""
+        return node.style or self.class_defs.get(node.css_class)
+
+
+# Serializers
+
+def _mermaid_style(style: NodeStyle) -> str:
+    return f"fill:{style.fill},stroke:{style.stroke},stroke-width:{style.stroke_width}px,color:{style.color}"
+
+
+def to_mermaid(graph: ArchitectureGraph) -> str:
+    """Mermaid flowchart ("graph TB") source"""
+    def node_line(node):
+        return f'{node.id}["{node.label.replace(chr(10), "<br/>")}"]'
+
+    lines = [f"graph {graph.direction}"]
+    grouped = set()
+    for subgraph in graph.subgraphs.values():
+        lines.append(f'    subgraph "{subgraph.title}"')
+        if subgraph.direction:
+            lines.append(f"        direction {subgraph.direction}")
+        lines.extend(f"        {node_line(graph.nodes[node_id])}" for node_id in subgraph.nodes)
+        lines.append("    end")
+        lines.append("")
+        grouped.update(subgraph.nodes)
+    lines.extend(f"    {node_line(node)}" for node in graph.nodes.values() if node.id not in grouped)
+
+    for edge in graph.edges:
+        arrow = '-.->' if edge.dashed else '-->'
+        label = f"|{edge.label}|" if edge.label else ''
+        lines.append(f"    {edge.source} {arrow}{label} {edge.target}")
+
+    lines.extend(f"    style {node.id} {_mermaid_style(node.style)}" for node in graph.nodes.values() if node.style)
+    lines.extend(f"    classDef {name} {_mermaid_style(style)}" for name, style in graph.class_defs.items())
+    lines.extend(f"    class {node.id} {node.css_class}" for node in graph.nodes.values() if node.css_class)
+    return '\n'.join(lines) + '\n'
+
+
+def _dot_string(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def to_dot(graph: ArchitectureGraph) -> str:
+    """Graphviz DOT source (subgraphs become clusters)"""
+    def node_line(node):
+        attributes = [f"label={_dot_string(node.label)}"]
+        style = graph.node_style(node)
+        if style:
+            attributes += [f'fillcolor="{style.fill}"', f'color="{style.stroke}"',
+                           f"penwidth={style.stroke_width}", f'fontcolor="{style.color}"']
+        return f"{node.id} [{', '.join(attributes)}];"
+
+    lines = [
+        "digraph architecture {",
+        f"    rankdir={graph.direction};",
+        '    node [shape=box, style="rounded,filled", fillcolor="#ffffff", fontname="Helvetica"];',
+        '    edge [fontname="Helvetica", fontsize=10];',
+    ]
+    grouped = set()
+    for index, subgraph in enumerate(graph.subgraphs.values(), 1):
+        lines.append(f"    subgraph cluster_{index} {{")
+        lines.append(f"        label={_dot_string(subgraph.title)};")
+        if subgraph.direction in ('LR', 'RL'):
+            lines.append("        rank=same;")
+        lines.extend(f"        {node_line(graph.nodes[node_id])}" for node_id in subgraph.nodes)
+        lines.append("    }")
+        grouped.update(subgraph.nodes)
+    lines.extend(f"    {node_line(node)}" for node in graph.nodes.values() if node.id not in grouped)
+
+    for edge in graph.edges:
+        attributes = []
+        if edge.label:
+            attributes.append(f"label={_dot_string(edge.label)}")
+        if edge.dashed:
+            attributes.append("style=dashed")
+        suffix = f" [{', '.join(attributes)}]" if attributes else ''
+        lines.append(f"    {edge.source} -> {edge.target}{suffix};")
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def to_json(graph: ArchitectureGraph) -> str:
+    """The graph itself as JSON (styles resolved per node)"""
+    membership = {node_id: subgraph.title for subgraph in graph.subgraphs.values() for node_id in subgraph.nodes}
+    data = {
+        "direction": graph.direction,
+        "subgraphs": [{"title": subgraph.title, "direction": subgraph.direction, "nodes": subgraph.nodes}
+                      for subgraph in graph.subgraphs.values()],
+        "nodes": [{
+            "id": node.id,
+            "label": node.label,
+            "subgraph": membership.get(node.id),
+            "class": node.css_class,
+            "style": graph.node_style(node)._asdict() if graph.node_style(node) else None,
+        } for node in graph.nodes.values()],
+        "edges": [edge._asdict() for edge in graph.edges],
+    }
+    return json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+
+
+def _parse_style(value: str) -> NodeStyle:
+    """NodeStyle from Mermaid "fill:#fff,stroke:#333,stroke-width:2px,color:#000" (missing parts: defaults)"""
+    properties = dict(part.split(':', 1) for part in value.split(',') if ':' in part)
+    width = properties.get('stroke-width', '2').strip().rstrip('px') or '2'
+    return NodeStyle(properties.get('fill', DEFAULT_STYLE.fill), properties.get('stroke', DEFAULT_STYLE.stroke),
+                     int(float(width)), properties.get('color', DEFAULT_STYLE.color))
+
+
+def from_mermaid(source: str) -> ArchitectureGraph:
+    """
+    Read a Mermaid flowchart back into a graph
+
+    Understands what to_mermaid() writes plus common hand edits (unquoted or
+    (round) labels, unlabelled edges, nodes only named in edges). Other
+    Mermaid syntax raises ValueError naming the line.
+    """
+    graph = None
+    open_subgraphs: List[str] = []
+
+    def ensure_node(node_id):
+        if node_id not in graph.nodes:
+            graph.add_node(node_id, node_id, subgraph=open_subgraphs[-1] if open_subgraphs else None)
+
+    for line_number, raw_line in enumerate(source.splitlines(), 1):
+        line = raw_line.strip().rstrip(';')
+        if not line or line.startswith('%%'):
+            continue
+        if graph is None:
+            header = patterns.MERMAID_HEADER.match(line)
+            if not header:
+                raise ValueError(f"Line {line_number}: expected 'graph TB' (or flowchart), got: {line}")
+            graph = ArchitectureGraph('TB' if header.group(1) == 'TD' else header.group(1))
+            continue
+
+        if line == 'end':
+            if not open_subgraphs:
+                raise ValueError(f"Line {line_number}: 'end' without subgraph")
+            open_subgraphs.pop()
+            continue
+
+        match = patterns.MERMAID_SUBGRAPH.match(line)
+        if match:
+            title = next(group for group in (match.group(1), match.group(3), match.group(4)) if group is not None)
+            graph.add_subgraph(title.strip())
+            open_subgraphs.append(title.strip())
+            continue
+
+        match = patterns.MERMAID_DIRECTION.match(line)
+        if match:
+            if open_subgraphs:
+                title = open_subgraphs[-1]
+                graph.subgraphs[title] = graph.subgraphs[title]._replace(direction=match.group(1))
+            continue
+
+        match = patterns.MERMAID_EDGE.match(line)
+        if match:
+            source_id, arrow, label, target_id = match.groups()
+            ensure_node(source_id)
+            ensure_node(target_id)
+            graph.add_edge(source_id, target_id, label.strip() if label else None, dashed=arrow == '-.->')
+            continue
+
+        match = patterns.MERMAID_STYLE.match(line)
+        if match:
+            ensure_node(match.group(1))
+            graph.nodes[match.group(1)] = graph.nodes[match.group(1)]._replace(style=_parse_style(match.group(2)))
+            continue
+
+        match = patterns.MERMAID_CLASS_DEF.match(line)
+        if match:
+            graph.class_defs[match.group(1)] = _parse_style(match.group(2))
+            continue
+
+        match = patterns.MERMAID_CLASS.match(line)
+        if match:
+            for node_id in match.group(1).split(','):
+                ensure_node(node_id)
+                graph.nodes[node_id] = graph.nodes[node_id]._replace(css_class=match.group(2))
+            continue
+
+        match = patterns.MERMAID_NODE.match(line)
+        if match:
+            node_id = match.group(1)
+            label = next((group for group in match.groups()[1:] if group is not None), None)
+            ensure_node(node_id)
+            if label is not None:
+                label = patterns.MERMAID_LINE_BREAK.sub('\n', label)
+                graph.nodes[node_id] = graph.nodes[node_id]._replace(label=label)
+            continue
+
+        raise ValueError(f"Line {line_number}: unsupported Mermaid syntax: {line}")
+
+    if graph is None:
+        raise ValueError("No Mermaid graph found")
+    return graph
+
+
+# Splitting oversized graphs
+
+def _diagrams_text(numbers: List[int]) -> str:
+    return f"diagram {numbers[0]}" if len(numbers) == 1 else f"diagrams {numbers[0]}-{numbers[-1]}"
+
+
+def _link_label(title: str, node_count: int, numbers: List[int]) -> str:
+    return f"{title}\n{node_count} nodes - see {_diagrams_text(numbers)}"
+
+
+def _merge_edges(edges, node_map: Dict[str, str]) -> List[Edge]:
+    """Re-point edges through node_map; edges now joining the same two nodes become one, labelled only if they all agreed"""
+    merged: Dict[tuple, Edge] = {}
+    for edge in edges:
+        edge = edge._replace(source=node_map.get(edge.source, edge.source),
+                             target=node_map.get(edge.target, edge.target))
+        if edge.source == edge.target:
+            continue
+        key = (edge.source, edge.target, edge.dashed)
+        if key in merged and merged[key].label != edge.label:
+            merged[key] = merged[key]._replace(label=None)
+        merged.setdefault(key, edge)
+    return list(merged.values())
+
+
+def _group_title(subgraphs: List[Subgraph]) -> str:
+    return subgraphs[0].title if len(subgraphs) == 1 else f"{subgraphs[0].title} - {subgraphs[-1].title}"
+
+
+def split_graph(graph: ArchitectureGraph, node_budget: int) -> List[Tuple[str, ArchitectureGraph]]:
+    """
+    Split a graph with more than node_budget nodes into linked diagrams
+
+    The largest subgraphs are collapsed, one at a time, into a single link
+    node in the overview until it fits the budget. When that is not enough
+    (many small subgraphs, e.g. one per site), consecutive collapsed
+    subgraphs share one link node, so the overview holds as many link nodes
+    as there is room for. Edges into a collapsed subgraph end at its link
+    node, merged into one per node pair (keeping the label only if they all
+    share it).
+
+    Each link node's subgraphs become diagrams of their own, in parts whose
+    nodes plus stub nodes (the nodes they connect to elsewhere, naming
+    their diagram) fit node_budget. A part that would have too many stubs
+    gets one stub per diagram group instead of one per node.
+
+    Every returned diagram has at most node_budget nodes, provided
+    node_budget is at least 3 and the nodes outside any subgraph take at
+    most half of it (the generator puts every node in a subgraph).
+
+    Returns:
+        [(title, graph)], the overview first and numbered 1 (the graph
+        itself, unchanged, when it already fits)
+    """
+    if len(graph.nodes) <= node_budget:
+        return [("Overview", graph)]
+
+    subgraphs = list(graph.subgraphs.values())
+    loose = len(graph.nodes) - sum(len(subgraph.nodes) for subgraph in subgraphs)
+    neighbours: Dict[str, set] = {node_id: set() for node_id in graph.nodes}
+    for edge in graph.edges:
+        if edge.source != edge.target:
+            neighbours[edge.source].add(edge.target)
+            neighbours[edge.target].add(edge.source)
+
+    # Largest subgraphs first until the overview fits (one link node per collapsed subgraph)
+    collapsed = []
+    node_count = len(graph.nodes)
+    for subgraph in sorted(subgraphs, key=lambda sub: -len(sub.nodes)):
+        if node_count <= node_budget:
+            break
+        if len(subgraph.nodes) > 1:
+            collapsed.append(subgraph.title)
+            node_count -= len(subgraph.nodes) - 1
+    link_count = len(collapsed)
+    # At most node_budget - 2 link nodes, so a node with a stub for every other diagram group still fits a part
+    if node_count > node_budget or link_count > node_budget - 2:
+        # Too many link nodes: collapse subgraphs (the least connected first among equal
+        # sizes, so shared hubs stay in the overview) until half the budget is left for
+        # link nodes, each standing for a run of consecutive collapsed subgraphs
+        def crossing(sub):
+            members = set(sub.nodes)
+            return len({other for node_id in sub.nodes for other in neighbours[node_id]} - members)
+        collapsed = []
+        expanded = len(graph.nodes) - loose
+        last_key = None
+        for subgraph in sorted(subgraphs, key=lambda sub: (-len(sub.nodes), crossing(sub))):
+            key = (len(subgraph.nodes), crossing(subgraph))
+            # Siblings alike (same size and connections, e.g. the sites) are collapsed together
+            if loose + expanded <= node_budget // 2 and key != last_key:
+                break
+            if subgraph.nodes:
+                collapsed.append(subgraph.title)
+                expanded -= len(subgraph.nodes)
+                last_key = key
+        link_count = max(1, min(len(collapsed), node_budget - loose - expanded, node_budget - 2))
+
+    if not collapsed:
+        # Nothing to collapse: every node is outside the subgraphs
+        return [("Overview", graph)]
+
+    # Consecutive collapsed subgraphs (drawing order) in link_count groups
+    collapsed = set(collapsed)
+    in_order = [subgraph for subgraph in subgraphs if subgraph.title in collapsed]
+    groups = [in_order[len(in_order) * i // link_count:len(in_order) * (i + 1) // link_count]
+              for i in range(link_count)]
+    unit = {node_id: 0 for node_id in graph.nodes}
+    for index, group in enumerate(groups, 1):
+        unit.update((node_id, index) for subgraph in group for node_id in subgraph.nodes)
+
+    def part_size(members, outside):
+        # Stubs: one per outside node, or one per outside diagram group when that is fewer
+        return len(members) + min(len(outside), len({unit[node_id] for node_id in outside}))
+
+    # Parts: each group's nodes in order, a new part whenever nodes + stubs would exceed the budget
+    home = {node_id: 1 for node_id in graph.nodes}
+    numbers_of = {0: [1]}
+    parts = []
+    for index, group in enumerate(groups, 1):
+        chunks = []
+        members, outside = [], set()
+        for node_id in (node_id for subgraph in group for node_id in subgraph.nodes):
+            grown = (outside | neighbours[node_id]) - set(members) - {node_id}
+            if members and part_size(members + [node_id], grown) > node_budget:
+                chunks.append(members)
+                members, outside = [], set()
+                grown = neighbours[node_id] - {node_id}
+            members.append(node_id)
+            outside = grown
+        chunks.append(members)
+        numbers = list(range(len(parts) + 2, len(parts) + 2 + len(chunks)))
+        numbers_of[index] = numbers
+        title = _group_title(group)
+        for number, chunk in zip(numbers, chunks):
+            part_title = title if len(chunks) == 1 else f"{title} ({number - numbers[0] + 1}/{len(chunks)})"
+            parts.append((part_title, group, chunk))
+            home.update((node_id, number) for node_id in chunk)
+
+    # Overview: a collapsed group keeps one box, holding only its link node
+    overview = ArchitectureGraph(graph.direction)
+    overview.class_defs.update(graph.class_defs)
+    link_of = {}
+    group_of = {subgraph.title: index for index, group in enumerate(groups, 1) for subgraph in group}
+    for subgraph in subgraphs:
+        if subgraph.title not in group_of:
+            overview.add_subgraph(subgraph.title, subgraph.direction)
+            for node_id in subgraph.nodes:
+                node = graph.nodes[node_id]
+                overview.add_node(node.id, node.label, node.style, node.css_class, subgraph.title)
+            continue
+        index = group_of[subgraph.title]
+        group = groups[index - 1]
+        if subgraph is not group[0]:
+            continue
+        link_id = f"Link_{index}"
+        title = _group_title(group)
+        overview.add_subgraph(title, subgraph.direction)
+        node_count = sum(len(member.nodes) for member in group)
+        overview.add_node(link_id, _link_label(title, node_count, numbers_of[index]), LINK_STYLE, subgraph=title)
+        link_of.update((node_id, link_id) for member in group for node_id in member.nodes)
+    for node in graph.nodes.values():
+        if node.id not in overview.nodes and node.id not in link_of:
+            overview.add_node(node.id, node.label, node.style, node.css_class)
+    overview.edges.extend(_merge_edges(graph.edges, link_of))
+
+    diagrams = [("Overview", overview)]
+    order = {node_id: position for position, node_id in enumerate(graph.nodes)}
+    for title, group, chunk in parts:
+        part = ArchitectureGraph(graph.direction)
+        part.class_defs.update(graph.class_defs)
+        members = set(chunk)
+        boxes = [subgraph for subgraph in group if members.intersection(subgraph.nodes)]
+        for subgraph in boxes:
+            box = title if len(boxes) == 1 else subgraph.title
+            part.add_subgraph(box, subgraph.direction)
+            for node_id in subgraph.nodes:
+                if node_id in members:
+                    node = graph.nodes[node_id]
+                    part.add_node(node.id, node.label, node.style, node.css_class, box)
+        edges = [edge for edge in graph.edges if edge.source in members or edge.target in members]
+        outside = {node_id for edge in edges for node_id in (edge.source, edge.target) if node_id not in members}
+        stub_of = {}
+        if len(chunk) + len(outside) > node_budget:
+            for node_id in outside:
+                stub_of[node_id] = f"Stub_{unit[node_id]}"
+        for node_id in sorted(outside, key=order.get):
+            stub_id = stub_of.get(node_id, node_id)
+            if stub_id in part.nodes:
+                continue
+            if stub_id == node_id:
+                first_line = graph.nodes[node_id].label.split('\n', 1)[0]
+                label = f"{first_line}\n(diagram {home[node_id]})"
+            elif unit[node_id] == 0:
+                label = "Overview\n(diagram 1)"
+            else:
+                label = f"{_group_title(groups[unit[node_id] - 1])}\n({_diagrams_text(numbers_of[unit[node_id]])})"
+            part.add_node(stub_id, label, STUB_STYLE)
+        part.edges.extend(_merge_edges(edges, stub_of))
+        diagrams.append((title, part))
+    return diagrams
+
+
+SERIALIZERS = {
+    "mermaid": to_mermaid,
+    "dot": to_dot,
+    "json": to_json,
+}
+
+# Output file name suffix per format (after the proposal stem)
+FILE_SUFFIXES = {
+    "mermaid": "_architecture.mmd",
+    "dot": "_architecture.dot",
+    "json": "_architecture_graph.json",
+}
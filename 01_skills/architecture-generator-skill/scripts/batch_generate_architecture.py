@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Batch-generate architecture diagrams for many proposal templates
+Runs ProposalParser + ArchitectureGenerator across a process pool and writes
+an aggregate JSON manifest with per-file timings and failures
+
+Usage:
+    python3 batch_generate_architecture.py <dir|glob|file> [...] [--output-dir DIR] [--workers N]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent))
+# Shared utilities live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+from generate_architecture import generate_architecture_from_proposal
+from artifact_cache import write_if_changed
+
+# Files that live next to proposals but are never inputs: outputs of this and other
+# skills, and the reasoning / checklist files of a proposal bundle
+GENERATED_SUFFIXES = ('_architecture_diagram.md', '_slide_content.md', '_reasoning.md', '_checklist.md')
+
+
+def collect_proposals(inputs, pattern='*_template.md'):
+    """Expand directories, glob patterns and file paths into a sorted list of proposal files"""
+    proposals = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = path.glob(pattern)
+        elif path.exists():
+            candidates = [path]
+        else:
+            candidates = (Path(p) for p in glob.glob(item, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file() and not candidate.name.endswith(GENERATED_SUFFIXES):
+                proposals.add(candidate.resolve())
+    return sorted(proposals)
+
+
+def _process_proposal(proposal_file, output_dir, use_cache):
+    """Worker: generate architecture for one proposal, capturing its console output"""
+    started = time.perf_counter()
+    log = io.StringIO()
+    entry = {"proposal": str(proposal_file)}
+    try:
+        with contextlib.redirect_stdout(log):
+            result = generate_architecture_from_proposal(proposal_file, output_dir, use_cache)
+        if result:
+            entry.update({
+                "status": "ok",
+                "cached": result["cached"],
+                "json_file": str(result["json_file"]),
+                "mermaid_file": str(result["mermaid_file"]),
+                "deployment_method": result["project_info"]["deployment_method"],
+                "num_cameras": result["project_info"]["num_cameras"],
+                "num_ai_modules": len(result["project_info"]["ai_modules"]),
+            })
+        else:
+            # generate_architecture_from_proposal prints the reason before returning None
+            warnings = [line.strip() for line in log.getvalue().splitlines()
+                        if line.startswith(('⚠️', 'Error'))]
+            entry.update({"status": "failed", "error": warnings[-1] if warnings else "No output generated"})
+    except (Exception, SystemExit) as e:  # ProposalParser exits on unreadable files
+        entry.update({
+            "status": "failed",
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        })
+    entry["seconds"] = round(time.perf_counter() - started, 4)
+    return entry
+
+
+def batch_generate(proposals, output_dir=None, workers=None, use_cache=True, manifest_file=None):
+    """
+    Generate architecture diagrams for all proposals in a process pool
+
+    Args:
+        proposals: List of proposal markdown files
+        output_dir: Output directory for all results (default: next to each proposal)
+        workers: Process pool size (default: CPU count)
+        use_cache: Reuse cached artifacts for unchanged proposals
+        manifest_file: Manifest path (default: <output_dir or cwd>/architecture_manifest.json)
+
+    Returns:
+        Manifest dict
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(proposals)))
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_process_proposal, p, output_dir, use_cache) for p in proposals]
+        for i, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            results.append(entry)
+            status = "✅" if entry["status"] == "ok" else "❌"
+            detail = " (cached)" if entry.get("cached") else ""
+            if entry["status"] != "ok":
+                detail = f" - {entry['error']}"
+            print(f"{status} [{i}/{len(proposals)}] {Path(entry['proposal']).name} {entry['seconds']:.2f}s{detail}")
+
+    results.sort(key=lambda entry: entry["proposal"])
+    failed = [entry for entry in results if entry["status"] != "ok"]
+    manifest = {
+        "generated_at": datetime.now().isoformat(timespec='seconds'),
+        "workers": workers,
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "cached": sum(1 for entry in results if entry.get("cached")),
+        "elapsed_seconds": round(time.perf_counter() - started, 4),
+        "results": results,
+    }
+
+    if manifest_file is None:
+        manifest_file = Path(output_dir or '.') / 'architecture_manifest.json'
+    write_if_changed(manifest_file, json.dumps(manifest, indent=2, ensure_ascii=False))
+    manifest["manifest_file"] = str(manifest_file)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Batch-generate architecture diagrams from proposal templates'
+    )
+    parser.add_argument('inputs', nargs='+', help='Proposal files, directories or glob patterns')
+    parser.add_argument('--output-dir', '-o', help='Output directory (default: next to each proposal)')
+    parser.add_argument('--workers', '-w', type=int, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--pattern', default='*_template.md',
+                        help='File pattern used inside directories (default: *_template.md)')
+    parser.add_argument('--manifest', help='Manifest file path (default: <output_dir>/architecture_manifest.json)')
+    parser.add_argument('--no-cache', action='store_true', help='Regenerate even if a proposal is unchanged')
+
+    args = parser.parse_args()
+
+    proposals = collect_proposals(args.inputs, args.pattern)
+    if not proposals:
+        print("❌ No proposal files found")
+        sys.exit(1)
+
+    print(f"📄 Generating architecture for {len(proposals)} proposal(s)...\n")
+    manifest = batch_generate(proposals, args.output_dir, args.workers, not args.no_cache, args.manifest)
+
+    print(f"\n{'='*50}")
+    print(f"Succeeded: {manifest['succeeded']}/{manifest['total']} ({manifest['cached']} cached)")
+    print(f"Failed: {manifest['failed']}")
+    print(f"Elapsed: {manifest['elapsed_seconds']:.2f}s with {manifest['workers']} worker(s)")
+    print(f"📁 Manifest: {manifest['manifest_file']}")
+
+    sys.exit(1 if manifest['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
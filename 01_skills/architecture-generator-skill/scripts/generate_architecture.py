@@ -10,18 +10,44 @@ from pathlib import Path
 
 # Add parent directory to path to import modules
 sys.path.insert(0, str(Path(__file__).parent))
+# Shared utilities live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
 
+import architecture_graph
+import capacity_planner
+import parse_proposal
+import generate_mermaid
+import render_diagram
+import keyword_scanner
+import patterns
+import proposal_document
 from parse_proposal import ProposalParser
-from generate_mermaid import ArchitectureGenerator
+from generate_mermaid import NODE_BUDGET, ArchitectureGenerator
+from architecture_graph import FILE_SUFFIXES, SERIALIZERS, split_graph
+from artifact_cache import ArtifactCache, code_fingerprint, write_if_changed
 
+# Bump when the project_info / diagram format changes to invalidate cached artifacts
+GENERATOR_VERSION = "1.2"
 
-def generate_architecture_from_proposal(proposal_file, output_dir=None):
+
+def generate_architecture_from_proposal(proposal_file, output_dir=None, use_cache=True, formats=(),
+                                        aggregate='auto', node_budget=NODE_BUDGET, sizing=True):
     """
     Main function to generate architecture from proposal template
     
     Args:
         proposal_file: Path to proposal markdown file
         output_dir: Output directory (default: same as proposal file)
+        use_cache: Reuse cached artifacts when the proposal is unchanged (default: True)
+        formats: Extra standalone diagram files to write: source formats (see
+            architecture_graph.SERIALIZERS) from the same graph as the Mermaid diagram,
+            and svg/png images rendered offline by render_diagram.py
+        aggregate: Group modules by category and collapse camera groups: True, False,
+            or 'auto' when the diagram exceeds node_budget (see ArchitectureGenerator)
+        node_budget: Most nodes per Mermaid diagram; larger ones are split into an
+            overview plus linked sub-diagrams in the same document
+        sizing: Label the inference nodes with the edge servers / GPU instances
+            capacity_planner.py sizes for the project, and print the capacity plan
     """
     proposal_file = Path(proposal_file)
     
@@ -29,20 +55,36 @@ def generate_architecture_from_proposal(proposal_file, output_dir=None):
         print(f"Error: Proposal file not found: {proposal_file}")
         return None
     
-    print(f"📄 Parsing proposal: {proposal_file.name}")
-    
-    # Parse proposal
-    parser = ProposalParser(proposal_file)
-    project_info = parser.parse()
-    
-    # Validate required fields
-    if not project_info.get("num_cameras"):
-        print("⚠️  Warning: Camera number not found. Please check the proposal.")
-        return None
+    # Cache key: proposal content (+ module cost table) + generator version (+ parser/generator source)
+    cache = ArtifactCache() if use_cache else None
+    cache_key = None
+    cached = None
+    if cache:
+        version = f"{GENERATOR_VERSION}-{aggregate}-{node_budget}-{sizing}-{code_fingerprint(parse_proposal, generate_mermaid, architecture_graph, proposal_document, patterns, keyword_scanner, capacity_planner)}"
+        input_files = [proposal_file] + (capacity_planner.cost_files() if sizing else [])
+        cache_key = cache.key_for(input_files, "architecture", version)
+        cached = cache.get(cache_key)
     
-    if not project_info.get("ai_modules"):
-        print("⚠️  Warning: AI modules not found. Please check the proposal.")
-        return None
+    if cached:
+        print(f"♻️  Proposal unchanged, using cached architecture: {proposal_file.name}")
+        project_info = json.loads(cached["project_info.json"])["project_info"]
+        project_info_json = cached["project_info.json"]
+        mermaid_doc = cached["architecture_diagram.md"]
+    else:
+        print(f"📄 Parsing proposal: {proposal_file.name}")
+        
+        # Parse proposal
+        parser = ProposalParser(proposal_file)
+        project_info = parser.parse()
+        
+        # Validate required fields
+        if not project_info.get("num_cameras"):
+            print("⚠️  Warning: Camera number not found. Please check the proposal.")
+            return None
+        
+        if not project_info.get("ai_modules"):
+            print("⚠️  Warning: AI modules not found. Please check the proposal.")
+            return None
     
     # Print extracted information
     print("\n" + "="*80)
@@ -59,65 +101,163 @@ def generate_architecture_from_proposal(proposal_file, output_dir=None):
         output_dir.mkdir(parents=True, exist_ok=True)
     
     json_file = output_dir / f"{proposal_file.stem}_project_info.json"
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump({"project_info": project_info}, f, indent=2, ensure_ascii=False)
+    if not cached:
+        project_info_json = json.dumps({"project_info": project_info}, indent=2, ensure_ascii=False)
+    write_if_changed(json_file, project_info_json)
     print(f"✅ Saved project info to: {json_file}")
     
+    capacity = None
+    if sizing:
+        try:
+            capacity = capacity_planner.plan(project_info)
+        except ValueError as e:
+            print(f"⚠️  Warning: capacity not planned: {e}")
+    
     # Generate Mermaid diagram
-    print("\n🎨 Generating Mermaid architecture diagram...")
-    generator = ArchitectureGenerator(project_info)
-    mermaid_code = generator.generate()
+    generator = ArchitectureGenerator(project_info, aggregate, node_budget, capacity)
+    graph = None
+    if not cached:
+        print("\n🎨 Generating Mermaid architecture diagram...")
+        graph = generator.build()
+        diagrams = split_graph(graph, node_budget)
+        mermaid_code = SERIALIZERS["mermaid"](diagrams[0][1])
+        if generator.aggregated:
+            print("🗂️  Large deployment: aggregated diagram (modules grouped by category, one node per site / camera cluster)")
+        if len(diagrams) > 1:
+            print(f"🗂️  Over {node_budget} nodes: split into an overview and {len(diagrams) - 1} linked sub-diagram(s)")
+        
+        sites = project_info.get('sites')
+        mermaid_doc = (
+            f"# System Architecture: {project_info['project_name']}\n\n"
+            f"**Client:** {project_info.get('client_name', 'N/A')}\n\n"
+            f"**Deployment Method:** {project_info['deployment_method'].upper()}\n\n"
+            + (f"**Sites:** {len(sites)}\n\n" if sites else "")
+            + f"**Cameras:** {project_info['num_cameras']}\n\n"
+            f"**AI Modules:** {len(project_info['ai_modules'])}\n\n"
+            "---\n\n"
+            "## Architecture Diagram\n\n"
+            "```mermaid\n"
+            f"{mermaid_code}"
+            "\n```\n"
+        )
+        # Sub-diagrams follow the overview; readers of the first block (slides, renderer) see the overview
+        for number, (title, sub_graph) in enumerate(diagrams[1:], 2):
+            mermaid_doc += (
+                f"\n## Diagram {number}: {title}\n\n"
+                "```mermaid\n"
+                f"{SERIALIZERS['mermaid'](sub_graph)}"
+                "\n```\n"
+            )
+        
+        if cache:
+            cache.put(cache_key, {
+                "project_info.json": project_info_json,
+                "architecture_diagram.md": mermaid_doc,
+            })
     
     # Save Mermaid diagram
     mermaid_file = output_dir / f"{proposal_file.stem}_architecture_diagram.md"
-    with open(mermaid_file, 'w', encoding='utf-8') as f:
-        f.write(f"# System Architecture: {project_info['project_name']}\n\n")
-        f.write(f"**Client:** {project_info.get('client_name', 'N/A')}\n\n")
-        f.write(f"**Deployment Method:** {project_info['deployment_method'].upper()}\n\n")
-        f.write(f"**Cameras:** {project_info['num_cameras']}\n\n")
-        f.write(f"**AI Modules:** {len(project_info['ai_modules'])}\n\n")
-        f.write("---\n\n")
-        f.write("## Architecture Diagram\n\n")
-        f.write("```mermaid\n")
-        f.write(mermaid_code)
-        f.write("\n```\n")
+    write_if_changed(mermaid_file, mermaid_doc)
     
     print(f"✅ Saved architecture diagram to: {mermaid_file}")
     
+    # Other formats render the same graph (rebuilt from project_info on a cache hit); source
+    # formats hold the whole graph unsplit, images show the overview diagram
+    graph_files = {}
+    for fmt in formats:
+        if fmt in render_diagram.FORMATS:
+            image_file = output_dir / f"{proposal_file.stem}_architecture.{fmt}"
+            try:
+                rendered = render_diagram.render_file(mermaid_file, image_file, fmt, use_cache)
+            except (ValueError, RuntimeError, OSError) as e:
+                print(f"⚠️  Warning: {fmt} image not rendered: {e}")
+                continue
+            graph_files[fmt] = image_file
+            print(f"✅ Saved {fmt} image to: {image_file}{' (cached)' if rendered['cached'] else ''}")
+            continue
+        if graph is None:
+            graph = generator.build()
+        graph_files[fmt] = output_dir / f"{proposal_file.stem}{FILE_SUFFIXES[fmt]}"
+        write_if_changed(graph_files[fmt], SERIALIZERS[fmt](graph))
+        print(f"✅ Saved {fmt} diagram to: {graph_files[fmt]}")
+    
     # Print summary
     print("\n" + "="*80)
     print("GENERATION SUMMARY")
     print("="*80)
     print(f"Project: {project_info['project_name']}")
     print(f"Deployment: {project_info['deployment_method'].upper()}")
+    if project_info.get('sites'):
+        print(f"Sites: {len(project_info['sites'])}")
     print(f"Cameras: {project_info['num_cameras']}")
     print(f"AI Modules: {len(project_info['ai_modules'])}")
     print(f"Alert Methods: {', '.join(project_info['alert_methods'])}")
+    if capacity:
+        print(f"Hardware: {capacity['servers']} x {capacity['hardware']} "
+              f"({capacity['gpu_load']:g} GPU load, {capacity['bandwidth_mbps']:g} Mbps, {capacity['storage_tb']:g} TB)")
+        for warning in capacity['warnings']:
+            print(f"⚠️  {warning}")
     print("="*80)
     print(f"\n📁 Output files:")
     print(f"   - JSON: {json_file}")
     print(f"   - Diagram: {mermaid_file}")
+    for fmt, path in graph_files.items():
+        print(f"   - {fmt}: {path}")
     print(f"\n💡 View diagram at: https://mermaid.live")
     print("   Or open the .md file in VS Code with Mermaid extension")
+    print(f"   Or render it offline: python3 render_diagram.py {mermaid_file}")
     print("="*80 + "\n")
     
     return {
         "json_file": json_file,
         "mermaid_file": mermaid_file,
-        "project_info": project_info
+        "graph_files": graph_files,
+        "project_info": project_info,
+        "capacity": capacity,
+        "cached": bool(cached)
     }
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 generate_architecture.py <proposal_file.md> [output_dir]")
+def main():
+    use_cache = '--no-cache' not in sys.argv
+    aggregate = True if '--aggregate' in sys.argv else False if '--no-aggregate' in sys.argv else 'auto'
+    sizing = '--no-sizing' not in sys.argv
+    formats = []
+    node_budget = NODE_BUDGET
+    for arg in sys.argv[1:]:
+        if arg.startswith('--format='):
+            formats += [fmt for fmt in arg.split('=', 1)[1].split(',') if fmt]
+        elif arg.startswith('--max-nodes='):
+            value = arg.split('=', 1)[1]
+            if not value.isdigit() or int(value) < 3:
+                print(f"❌ --max-nodes needs a number of at least 3, got: {value}")
+                sys.exit(1)
+            node_budget = int(value)
+    args = [arg for arg in sys.argv[1:] if arg not in ('--no-cache', '--aggregate', '--no-aggregate', '--no-sizing')
+            and not arg.startswith(('--format=', '--max-nodes='))]
+    
+    if len(args) < 1:
+        print("Usage: python3 generate_architecture.py <proposal_file.md> [output_dir] [--no-cache] "
+              f"[--format={','.join(list(SERIALIZERS) + list(render_diagram.FORMATS))}] "
+              f"[--aggregate|--no-aggregate] [--max-nodes=N (default {NODE_BUDGET})] [--no-sizing]")
         print("\nExample:")
         print("  python3 generate_architecture.py Cedo_template.md")
         print("  python3 generate_architecture.py Medical_Lab_KSA_template.md ./output")
+        print("  python3 generate_architecture.py Cedo_template.md ./output --format=dot,json,svg")
+        print("  python3 generate_architecture.py Campus_template.md ./output --aggregate --max-nodes=30")
         sys.exit(1)
     
-    proposal_file = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    available = list(SERIALIZERS) + list(render_diagram.FORMATS)
+    unknown = [fmt for fmt in formats if fmt not in available]
+    if unknown:
+        print(f"❌ Unknown format(s): {', '.join(unknown)} (available: {', '.join(available)})")
+        sys.exit(1)
     
-    generate_architecture_from_proposal(proposal_file, output_dir)
+    proposal_file = args[0]
+    output_dir = args[1] if len(args) > 1 else None
+    
+    generate_architecture_from_proposal(proposal_file, output_dir, use_cache, formats, aggregate, node_budget, sizing)
+
 
+if __name__ == "__main__":
+    main()
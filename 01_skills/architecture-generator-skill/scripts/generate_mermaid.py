@@ -3,41 +3,85 @@
 Generate Mermaid Architecture Diagrams matching KB examples
 Clean, client-friendly format showing essential flow only
 Compact mode: AI modules embedded inline, simplified labels
+Each topology populates an ArchitectureGraph (architecture_graph.py), which
+renders to Mermaid, Graphviz DOT or JSON
+Aggregated mode: one node per module category and one per camera cluster, for
+deployments whose diagram would exceed the node budget
+Multi-site (project_info "sites"): one subgraph per site around shared central
+or cloud components
 """
 
-import re
+import sys
+from pathlib import Path
+
+# Shared utilities live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+import patterns
+from architecture_graph import SERIALIZERS, ArchitectureGraph, NodeStyle
+from capacity_planner import units_label
+from keyword_scanner import categorize
+
+# Node styles shared by the three topologies
+TRAINING_STYLE = NodeStyle('#e1f5ff', '#01579b')
+INFERENCE_STYLE = NodeStyle('#81d4fa', '#0277bd')
+DASHBOARD_STYLE = NodeStyle('#fff4e1', '#e65100')
+ALERT_STYLE = NodeStyle('#f3e5f5', '#7b1fa2')
+MANAGER_STYLE = NodeStyle('#e3f2fd', '#1976d2')
+CONNECTIVITY_STYLE = NodeStyle('#e8f5e9', '#2e7d32')
+CAMERA_STYLE = NodeStyle('#ffffff', '#424242')
+AI_MODULE_CLASS = 'aiModuleStyle'
+AI_MODULE_STYLE = NodeStyle('#f5f5f5', '#616161')
+
+# Most nodes per diagram (module lines listed inside a node count too); 'auto'
+# aggregation kicks in above it, architecture_graph.split_graph() splits what still exceeds it
+NODE_BUDGET = 40
 
 
 class ArchitectureGenerator:
-    """Generate Mermaid architecture diagrams matching KB examples"""
+    """Build architecture graphs matching KB examples and render them (Mermaid by default)"""
     
-    def __init__(self, project_info):
+    def __init__(self, project_info, aggregate='auto', node_budget=NODE_BUDGET, capacity=None):
+        """
+        Args:
+            project_info: Parsed proposal (parse_proposal.py); optional 'camera_groups'
+                [{"name": ..., "cameras": N}] draws one camera node per group, optional
+                'sites' (see ProposalParser.extract_sites) one subgraph per site
+            aggregate: True groups modules by category and collapses camera groups,
+                False never does, 'auto' only when the diagram exceeds node_budget
+            node_budget: Most nodes per diagram (see NODE_BUDGET)
+            capacity: capacity_planner.plan() of the project; labels the inference
+                nodes with the edge servers / GPU instances it requires
+        """
         self.info = project_info
-    
-    def _get_ai_modules_styles(self, ai_modules):
-        """Generate style statements for all AI modules"""
-        if not ai_modules:
-            return ''
-        styles = []
-        for i in range(len(ai_modules)):
-            styles.append(f'    class Mod_{i+1} aiModuleStyle')
-        return '\n'.join(styles)
+        self.aggregate = aggregate
+        self.node_budget = node_budget
+        self.capacity = capacity
+        self.aggregated = aggregate is True
     
     def _format_ai_modules_inline(self, ai_modules, max_length=50):
-        """Format AI modules as inline list for compact display"""
+        """Format AI modules as inline list (one per line) for compact display"""
         if not ai_modules:
             return ""
-        # Shorten module names if needed, then join with line breaks
+        # Shorten module names if needed, then one per line
         short_modules = []
         for module in ai_modules:
             # Remove common suffixes in parentheses for compactness
-            short_name = re.sub(r'\s*\([^)]*\)\s*$', '', module.strip())
+            short_name = patterns.TRAILING_PARENTHETICAL.sub('', module.strip())
             # Truncate if too long
             if len(short_name) > max_length:
                 short_name = short_name[:max_length-3] + "..."
             short_modules.append(short_name)
-        return "<br/>".join(short_modules)
-        
+        return "\n".join(short_modules)
+    
+    def _module_categories(self, ai_modules):
+        """Module names per category (patterns.MODULE_CATEGORIES order, "Other" last, empty ones dropped)"""
+        groups = {category: [] for category, _ in patterns.MODULE_CATEGORIES}
+        groups[patterns.OTHER_MODULE_CATEGORY] = []
+        for module in ai_modules:
+            groups[categorize(module, patterns.MODULE_CATEGORIES, patterns.OTHER_MODULE_CATEGORY)].append(module)
+        return {category: modules for category, modules in groups.items() if modules}
+    
     def _should_show_nvr(self):
         """Determine if NVR should be shown based on deployment method and requirements"""
         # Only show NVR if explicitly mentioned or for on-premise deployments
@@ -48,309 +92,344 @@ class ArchitectureGenerator:
             # For on-premise, show NVR by default (but mark as optional)
             return True
     
-    def generate_on_prem(self):
-        """Generate On-Premise Architecture Diagram matching KB examples"""
+    # Building blocks shared by the topologies
+    
+    def _new_graph(self):
+        graph = ArchitectureGraph('TB')
+        graph.class_defs[AI_MODULE_CLASS] = AI_MODULE_STYLE
+        return graph
+    
+    def _add_cameras(self, graph, subgraph, target):
+        """Cameras (one node per camera group unless aggregated) and the optional NVR, streaming to target"""
         num_cameras = self.info.get('num_cameras', 8)
-        ai_modules = self.info.get('ai_modules', [])
-        show_nvr = self._should_show_nvr()
-        list_ai_modules = self.info.get('list_ai_modules', True)
-        compact_mode = self.info.get('compact_mode', True)
-        
-        # Camera - match KB format
-        camera_group = f'Cameras["Up to {num_cameras} Cameras<br/>IP-based Camera"]'
-        
-        # NVR (optional) - match KB format: "Network Video Recorder (NVR)*"
-        nvr_node = ''
-        nvr_connection = ''
-        if show_nvr:
-            nvr_node = 'NVR["Network Video Recorder<br/>(NVR)*"]'
-            nvr_connection = 'Cameras -->|RTSP Links| NVR\n    NVR -->|RTSP Links| AI_Inference'
+        camera_groups = self.info.get('camera_groups') or []
+        if camera_groups and not self.aggregated:
+            camera_ids = []
+            for i, group in enumerate(camera_groups, 1):
+                graph.add_node(f'Cameras_{i}', f"{group['name']}\n{group['cameras']} Cameras", CAMERA_STYLE,
+                               subgraph=subgraph)
+                camera_ids.append(f'Cameras_{i}')
         else:
-            nvr_connection = 'Cameras -->|RTSP Links| AI_Inference'
+            label = f"Up to {num_cameras} Cameras\nIP-based Camera"
+            if camera_groups:
+                label += f"\n({len(camera_groups)} camera groups)"
+            graph.add_node('Cameras', label, CAMERA_STYLE, subgraph=subgraph)
+            camera_ids = ['Cameras']
         
-        # AI System - clearly label as Training + Inference (both on-premise)
-        ai_training = 'AI_Training["AI Training<br/>(On-Premise)"]'
+        if self._should_show_nvr():
+            # Match KB format: "Network Video Recorder (NVR)*"
+            graph.add_node('NVR', "Network Video Recorder\n(NVR)*", subgraph=subgraph)
+            return [(camera_id, 'NVR', 'RTSP Links') for camera_id in camera_ids] + [('NVR', target, 'RTSP Links')]
+        return [(camera_id, target, 'RTSP Links') for camera_id in camera_ids]
+    
+    def _add_inference(self, graph, subgraph, node_id, label, compact_label, style=INFERENCE_STYLE, sized=False):
+        """
+        Inference node holding the AI modules
         
-        # AI Modules: embed inline if compact_mode, otherwise separate subgraph
-        if compact_mode and ai_modules:
-            ai_modules_text = self._format_ai_modules_inline(ai_modules)
-            ai_inference = f'AI_Inference["AI Inference<br/>(On-Premise Processing)<br/>{ai_modules_text}"]'
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            ai_modules_styles = ''
-        else:
-            ai_inference = 'AI_Inference["AI Inference<br/>(On-Premise Processing)"]'
-            # AI Modules - list all with full names, arranged horizontally (optional)
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            if list_ai_modules and ai_modules:
-                module_list = []
-                for i, module in enumerate(ai_modules, 1):
-                    module_name = module.strip()
-                    node_id = f'Mod_{i}'
-                    module_list.append(f'{node_id}["{module_name}"]')
-                    ai_modules_connections += f'    AI_Inference --> {node_id}\n'
-                
-                ai_modules_nodes = '\n        '.join(module_list)
-                ai_modules_subgraph = f'''    subgraph "AI Modules"
-        direction LR
-        {ai_modules_nodes}
-    end
-    '''
-            ai_modules_styles = self._get_ai_modules_styles(ai_modules) if list_ai_modules and ai_modules else ''
+        Compact mode lists the modules inside the node; otherwise they get an
+        "AI Modules" subgraph of their own (when list_ai_modules is set).
+        Aggregated, both show one entry per module category with its count.
+        A sized node also shows the hardware the capacity plan requires.
         
-        # Dashboard - simplified, compact format
-        dashboard = 'Dashboard["Local Dashboard"]'
+        Returns:
+            Edges from the inference node to the module nodes
+        """
+        if sized and self.capacity:
+            sizing = f"\n{units_label(self.capacity['servers'], self.capacity['unit'])}"
+            label += sizing
+            compact_label += sizing
+        ai_modules = self.info.get('ai_modules', [])
+        categories = self._module_categories(ai_modules) if self.aggregated else {}
+        # Grouping only when it shortens the list
+        if len(categories) == len(ai_modules):
+            categories = {}
+        if self.info.get('compact_mode', True) and ai_modules:
+            if categories:
+                module_list = "\n".join(f"{category} ({len(modules)})"
+                                        for category, modules in categories.items())
+            else:
+                module_list = self._format_ai_modules_inline(ai_modules)
+            graph.add_node(node_id, f"{compact_label}\n{module_list}", style, subgraph=subgraph)
+            return []
         
-        # Alert system - simplified, compact format
+        graph.add_node(node_id, label, style, subgraph=subgraph)
+        if not (self.info.get('list_ai_modules', True) and ai_modules):
+            return []
+        # AI Modules - list all with full names, arranged horizontally
+        graph.add_subgraph("AI Modules", direction='LR')
+        module_edges = []
+        if categories:
+            for i, (category, modules) in enumerate(categories.items(), 1):
+                count = f"{len(modules)} module{'s' if len(modules) != 1 else ''}"
+                graph.add_node(f'ModGroup_{i}', f"{category}\n({count})", css_class=AI_MODULE_CLASS,
+                               subgraph="AI Modules")
+                module_edges.append((node_id, f'ModGroup_{i}', None))
+            return module_edges
+        for i, module in enumerate(ai_modules, 1):
+            graph.add_node(f'Mod_{i}', module.strip(), css_class=AI_MODULE_CLASS, subgraph="AI Modules")
+            module_edges.append((node_id, f'Mod_{i}', None))
+        return module_edges
+    
+    def _alert_label(self):
         alerts = self.info.get('alert_methods', ['Email', 'Dashboard'])
         alert_list = ' & '.join(alerts) if alerts else 'Email & Dashboard'
-        alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
-        
-        template = f"""graph TB
-    subgraph "On-Premise Infrastructure"
-        {camera_group}
-        {nvr_node}
-        {ai_training}
-        {ai_inference}
-        {dashboard}
-        {alert_system}
-    end
+        return f"Alert/Notification\n({alert_list})"
     
-{ai_modules_subgraph}    {nvr_connection}
-    AI_Training -->|Trained Models| AI_Inference
-    AI_Inference -->|Detection Results| Dashboard
-    AI_Inference -->|Alerts| Alert
-{ai_modules_connections}    style AI_Training fill:#e1f5ff,stroke:#01579b,stroke-width:2px,color:#000000
-    style AI_Inference fill:#81d4fa,stroke:#0277bd,stroke-width:2px,color:#000000
-    style Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-    classDef aiModuleStyle fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000
-{ai_modules_styles}
-"""
-        return template
+    # Topologies
     
-    def generate_cloud(self):
-        """Generate Cloud Architecture Diagram matching KB examples - compact format"""
-        num_cameras = self.info.get('num_cameras', 8)
-        ai_modules = self.info.get('ai_modules', [])
-        show_nvr = self._should_show_nvr()
-        list_ai_modules = self.info.get('list_ai_modules', True)
-        compact_mode = self.info.get('compact_mode', True)  # Default to compact mode
+    def build_on_prem(self):
+        """On-Premise Architecture graph matching KB examples"""
+        graph = self._new_graph()
+        site = graph.add_subgraph("On-Premise Infrastructure").title
         
-        # On-site components - match KB format
-        camera_group = f'Cameras["Up to {num_cameras} Cameras<br/>IP-based Camera"]'
+        stream_edges = self._add_cameras(graph, site, 'AI_Inference')
+        # AI System - clearly label as Training + Inference (both on-premise)
+        graph.add_node('AI_Training', "AI Training\n(On-Premise)", TRAINING_STYLE, subgraph=site)
+        module_edges = self._add_inference(graph, site, 'AI_Inference', "AI Inference\n(On-Premise Processing)",
+                                           "AI Inference\n(On-Premise Processing)", sized=True)
+        graph.add_node('Dashboard', "Local Dashboard", DASHBOARD_STYLE, subgraph=site)
+        graph.add_node('Alert', self._alert_label(), ALERT_STYLE, subgraph=site)
         
-        # Internet connection - only show type if specified
-        internet_type = self.info.get('internet_type')
-        if internet_type:
-            internet = f'Internet["Internet Connection<br/>({internet_type})<br/>(Provided by Client)"]'
-        else:
-            internet = 'Internet["Internet Connection<br/>(Provided by Client)"]'
+        for edge in stream_edges + [
+            ('AI_Training', 'AI_Inference', 'Trained Models'),
+            ('AI_Inference', 'Dashboard', 'Detection Results'),
+            ('AI_Inference', 'Alert', 'Alerts'),
+        ] + module_edges:
+            graph.add_edge(*edge)
+        return graph
+    
+    def _add_cloud_services(self, graph):
+        """
+        Cloud training and inference (holding the AI modules) plus the output services
         
-        # NVR (optional) - match KB format: "Network Video Recorder (NVR)*"
-        nvr_node = ''
-        nvr_connection = ''
-        if show_nvr:
-            nvr_node = 'NVR["Network Video Recorder<br/>(NVR)*"]'
-            nvr_connection = 'Cameras -->|RTSP Links| NVR\n    NVR -->|RTSP Links| Internet'
-        else:
-            nvr_connection = 'Cameras -->|RTSP Links| Internet'
+        Returns:
+            (edges between them, edges to the module nodes)
+        """
+        cloud = graph.add_subgraph("Cloud Infrastructure").title
+        outputs = graph.add_subgraph("Output Services").title
         
-        # Cloud components - compact format
-        cloud_training = 'Cloud_Training["AI Training<br/>(Cloud)"]'
+        graph.add_node('Cloud_Training', "AI Training\n(Cloud)", TRAINING_STYLE, subgraph=cloud)
+        # Match KB format: "On-cloud in AWS" / "viAct's CMP" with modules inside
+        module_edges = self._add_inference(graph, cloud, 'Cloud_Inference',
+                                           "On-cloud in AWS\n(viAct's CMP - Cloud Processing)",
+                                           "On-cloud in AWS\n(viAct's CMP)", INFERENCE_STYLE._replace(stroke_width=3),
+                                           sized=True)
         
-        # AI Modules: embed inline in Cloud Inference node if compact_mode, otherwise separate subgraph
-        # Match KB format: "On-cloud in AWS" or "viAct's CMP" with modules inside
-        if compact_mode and ai_modules:
-            ai_modules_text = self._format_ai_modules_inline(ai_modules)
-            cloud_inference = f'Cloud_Inference["On-cloud in AWS<br/>(viAct\'s CMP)<br/>{ai_modules_text}"]'
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            ai_modules_styles = ''
-        else:
-            cloud_inference = 'Cloud_Inference["On-cloud in AWS<br/>(viAct\'s CMP - Cloud Processing)"]'
-            # AI Modules - list all with full names, arranged horizontally (optional)
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            if list_ai_modules and ai_modules:
-                module_list = []
-                for i, module in enumerate(ai_modules, 1):
-                    module_name = module.strip()
-                    node_id = f'Mod_{i}'
-                    module_list.append(f'{node_id}["{module_name}"]')
-                    ai_modules_connections += f'    Cloud_Inference --> {node_id}\n'
-                
-                ai_modules_nodes = '\n        '.join(module_list)
-                ai_modules_subgraph = f'''    subgraph "AI Modules"
-        direction LR
-        {ai_modules_nodes}
-    end
-    '''
-            ai_modules_styles = self._get_ai_modules_styles(ai_modules) if list_ai_modules and ai_modules else ''
+        # Output Services - Dashboard, Alert and HSE Manager in one box (client-accessible outputs)
+        graph.add_node('Dashboard', "Centralized Dashboard", DASHBOARD_STYLE, subgraph=outputs)
+        graph.add_node('Alert', self._alert_label(), ALERT_STYLE, subgraph=outputs)
+        graph.add_node('HSE_Manager', "HSE Manager", MANAGER_STYLE, subgraph=outputs)
         
-        # Output Services - grouped together in separate subgraph (emphasizing client-accessible outputs)
-        # Match KB structure: Dashboard, Alert, and HSE Manager in one box
-        dashboard = 'Dashboard["Centralized Dashboard"]'
+        service_edges = [
+            ('Cloud_Training', 'Cloud_Inference', 'Trained Models'),
+            ('Cloud_Inference', 'Dashboard', 'Detection Results'),
+            ('Cloud_Inference', 'Alert', 'Alerts'),
+            ('Dashboard', 'HSE_Manager', 'Information & Alerts'),
+            ('Alert', 'HSE_Manager', 'Notifications'),
+        ]
+        return service_edges, module_edges
+    
+    def build_cloud(self):
+        """Cloud Architecture graph matching KB examples - compact format"""
+        graph = self._new_graph()
+        site = graph.add_subgraph("On-Site Infrastructure").title
         
-        # Alert system - match KB format
-        alerts = self.info.get('alert_methods', ['Email', 'Dashboard'])
-        alert_list = ' & '.join(alerts) if alerts else 'Email & Dashboard'
-        alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
+        stream_edges = self._add_cameras(graph, site, 'Internet')
+        # Internet connection - only show type if specified
+        internet_type = self.info.get('internet_type')
+        internet_label = f"Internet Connection\n({internet_type})\n" if internet_type else "Internet Connection\n"
+        graph.add_node('Internet', internet_label + "(Provided by Client)", CONNECTIVITY_STYLE, subgraph=site)
         
-        # HSE Manager - add as per KB examples
-        hse_manager = 'HSE_Manager["HSE Manager"]'
+        service_edges, module_edges = self._add_cloud_services(graph)
+        for edge in stream_edges + [('Internet', 'Cloud_Inference', 'RTSP Links')] + service_edges + module_edges:
+            graph.add_edge(*edge)
+        return graph
+    
+    def build_hybrid(self):
+        """Hybrid Architecture graph matching KB examples"""
+        graph = self._new_graph()
+        site = graph.add_subgraph("On-Premise Infrastructure").title
+        cloud = graph.add_subgraph("Cloud Infrastructure").title
         
-        template = f"""graph TB
-    subgraph "On-Site Infrastructure"
-        {camera_group}
-        {nvr_node}
-        {internet}
-    end
+        stream_edges = self._add_cameras(graph, site, 'AI_Inference')
+        # On-premise AI - Inference only (Training is on cloud)
+        module_edges = self._add_inference(graph, site, 'AI_Inference', "AI Inference\n(On-Premise Processing)",
+                                           "AI Inference\n(On-Premise Processing)", sized=True)
+        graph.add_node('Local_Dashboard', "Local Dashboard", DASHBOARD_STYLE, subgraph=site)
+        internet_type = self.info.get('internet_type')
+        internet_label = f"Internet Connection\n({internet_type})" if internet_type else "Internet Connection"
+        graph.add_node('Internet', internet_label, CONNECTIVITY_STYLE, subgraph=site)
+        
+        graph.add_node('Cloud_Training', "AI Training\n(Cloud - viAct's Cloud)", CONNECTIVITY_STYLE, subgraph=cloud)
+        graph.add_node('Online_Dashboard', "Online Dashboard", DASHBOARD_STYLE, subgraph=cloud)
+        # Alert system - can be on-premise or cloud, default to cloud for hybrid
+        graph.add_node('Alert', self._alert_label(), ALERT_STYLE, subgraph=cloud)
+        
+        for edge in stream_edges + [
+            ('AI_Inference', 'Local_Dashboard', 'Detection Results'),
+            ('AI_Inference', 'Alert', 'Alerts'),
+            ('Internet', 'Cloud_Training', 'Model Updates'),
+            ('Cloud_Training', 'AI_Inference', 'Updated Models', True),  # dashed: periodic model push
+            ('AI_Inference', 'Online_Dashboard', 'API'),
+        ] + module_edges:
+            graph.add_edge(*edge)
+        return graph
     
-    subgraph "Cloud Infrastructure"
-        {cloud_training}
-        {cloud_inference}
-    end
+    # Multi-site topologies: per-site subgraphs around shared components
     
-    subgraph "Output Services"
-        {dashboard}
-        {alert_system}
-        {hse_manager}
-    end
+    def _site_label(self, site, modules, edge_servers, bandwidth=False, index=None):
+        """
+        Extra label lines of a site: the size of its own module selection, its edge servers, its uplink
+        
+        With a capacity plan, a site without declared edge servers shows the required
+        count, and one declaring fewer than required shows both.
+        """
+        lines = []
+        if modules and site.get('ai_modules'):
+            lines.append(units_label(len(site['ai_modules']), "AI Module"))
+        if edge_servers:
+            declared = site.get('edge_servers')
+            required = self.capacity['sites'][index - 1]['servers'] if self.capacity and index else None
+            if declared or required:
+                line = units_label(declared or required, "Edge Server")
+                if declared and required and declared < required:
+                    line += f" ({required} required)"
+                lines.append(line)
+        if bandwidth and site.get('bandwidth_mbps'):
+            lines.append(f"{site['bandwidth_mbps']:g} Mbps Uplink")
+        return ''.join(f"\n{line}" for line in lines)
     
-{ai_modules_subgraph}    {nvr_connection}
-    Internet -->|RTSP Links| Cloud_Inference
-    Cloud_Training -->|Trained Models| Cloud_Inference
-    Cloud_Inference -->|Detection Results| Dashboard
-    Cloud_Inference -->|Alerts| Alert
-    Dashboard -->|Information & Alerts| HSE_Manager
-    Alert -->|Notifications| HSE_Manager
-{ai_modules_connections}    style Cloud_Training fill:#e1f5ff,stroke:#01579b,stroke-width:2px,color:#000000
-    style Cloud_Inference fill:#81d4fa,stroke:#0277bd,stroke-width:3px,color:#000000
-    style Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-    style HSE_Manager fill:#e3f2fd,stroke:#1976d2,stroke-width:2px,color:#000000
-    style Internet fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-    classDef aiModuleStyle fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000
-{ai_modules_styles}
-"""
-        return template
+    def _uplink_label(self, label, site):
+        """Edge label from a site to the shared components, with its bandwidth (in the site node when aggregated)"""
+        bandwidth = site.get('bandwidth_mbps')
+        return f"{label} ({bandwidth:g} Mbps)" if bandwidth and not self.aggregated else label
     
-    def generate_hybrid(self):
-        """Generate Hybrid Architecture Diagram matching KB examples"""
-        num_cameras = self.info.get('num_cameras', 8)
-        ai_modules = self.info.get('ai_modules', [])
-        show_nvr = self._should_show_nvr()
-        list_ai_modules = self.info.get('list_ai_modules', True)
-        compact_mode = self.info.get('compact_mode', True)
+    def _add_sites(self, graph, edge_inference):
+        """
+        Every site's cameras (and NVR), then its edge inference or its internet connection
         
-        # On-site components
-        camera_group = f'Cameras["Up to {num_cameras} Cameras<br/>IP-based Camera"]'
+        Aggregated, each site is a single node in one "Sites" subgraph.
         
-        # Internet connection - only show type if specified
-        internet_type = self.info.get('internet_type')
-        if internet_type:
-            internet = f'Internet["Internet Connection<br/>({internet_type})"]'
-        else:
-            internet = 'Internet["Internet Connection"]'
-        
-        # NVR (optional)
-        nvr_node = ''
-        nvr_connection = ''
-        if show_nvr:
-            nvr_node = 'NVR["Network Video Recorder<br/>(NVR)*"]'
-            nvr_connection = 'Cameras -->|RTSP Links| NVR\n    NVR -->|RTSP Links| AI_Inference'
-        else:
-            nvr_connection = 'Cameras -->|RTSP Links| AI_Inference'
-        
-        # On-premise AI - clearly label as Inference only (Training is on cloud)
-        # AI Modules: embed inline if compact_mode
-        if compact_mode and ai_modules:
-            ai_modules_text = self._format_ai_modules_inline(ai_modules)
-            ai_inference = f'AI_Inference["AI Inference<br/>(On-Premise Processing)<br/>{ai_modules_text}"]'
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            ai_modules_styles = ''
-        else:
-            ai_inference = 'AI_Inference["AI Inference<br/>(On-Premise Processing)"]'
-            # AI Modules - list all with full names, arranged horizontally (optional)
-            ai_modules_subgraph = ''
-            ai_modules_connections = ''
-            if list_ai_modules and ai_modules:
-                module_list = []
-                for i, module in enumerate(ai_modules, 1):
-                    module_name = module.strip()
-                    node_id = f'Mod_{i}'
-                    module_list.append(f'{node_id}["{module_name}"]')
-                    ai_modules_connections += f'    AI_Inference --> {node_id}\n'
-                
-                ai_modules_nodes = '\n        '.join(module_list)
-                ai_modules_subgraph = f'''    subgraph "AI Modules"
-        direction LR
-        {ai_modules_nodes}
-    end
-    '''
-            ai_modules_styles = self._get_ai_modules_styles(ai_modules) if list_ai_modules and ai_modules else ''
+        Returns:
+            (edges within the sites, [(site, id of the node the site uplinks from)])
+        """
+        sites = self.info['sites']
+        if self.aggregated:
+            graph.add_subgraph("Sites")
+            uplinks = []
+            for i, site in enumerate(sites, 1):
+                label = (f"{site['name']}\n{site['cameras']} Cameras"
+                         f"{self._site_label(site, True, edge_inference, True, i)}")
+                graph.add_node(f'Site_{i}', label, CAMERA_STYLE, subgraph="Sites")
+                uplinks.append((site, f'Site_{i}'))
+            return [], uplinks
         
-        local_dashboard = 'Local_Dashboard["Local Dashboard"]'
+        edges = []
+        uplinks = []
+        for i, site in enumerate(sites, 1):
+            title = site['name'] if site['name'] not in graph.subgraphs else f"{site['name']} ({i})"
+            graph.add_subgraph(title)
+            source = f'Cameras_{i}'
+            graph.add_node(source, f"Up to {site['cameras']} Cameras\nIP-based Camera{self._site_label(site, True, False)}",
+                           CAMERA_STYLE, subgraph=title)
+            if self._should_show_nvr():
+                graph.add_node(f'NVR_{i}', "Network Video Recorder\n(NVR)*", subgraph=title)
+                edges.append((source, f'NVR_{i}', 'RTSP Links'))
+                source = f'NVR_{i}'
+            if edge_inference:
+                label = f"AI Inference\n(On-Premise Processing){self._site_label(site, False, True, index=i)}"
+                graph.add_node(f'Edge_{i}', label, INFERENCE_STYLE, subgraph=title)
+                edges.append((source, f'Edge_{i}', 'RTSP Links'))
+                source = f'Edge_{i}'
+            else:
+                graph.add_node(f'Internet_{i}', "Internet Connection\n(Provided by Client)", CONNECTIVITY_STYLE,
+                               subgraph=title)
+                edges.append((source, f'Internet_{i}', 'RTSP Links'))
+                source = f'Internet_{i}'
+            uplinks.append((site, source))
+        return edges, uplinks
+    
+    def build_sites_on_prem(self):
+        """On-Premise, multi-site: edge inference per site, training / dashboard / alerts at a central site"""
+        graph = self._new_graph()
+        stream_edges, uplinks = self._add_sites(graph, edge_inference=True)
+        central = graph.add_subgraph("Central Infrastructure (On-Premise)").title
+        # Models are trained centrally and pushed to every site, so the module list sits with training
+        module_edges = self._add_inference(graph, central, 'AI_Training', "AI Training\n(On-Premise)",
+                                           "AI Training\n(On-Premise)", TRAINING_STYLE)
+        graph.add_node('Dashboard', "Central Dashboard", DASHBOARD_STYLE, subgraph=central)
+        graph.add_node('Alert', self._alert_label(), ALERT_STYLE, subgraph=central)
         
-        # Cloud components - clearly label Training and Online Dashboard
-        cloud_training = 'Cloud_Training["AI Training<br/>(Cloud - viAct\'s Cloud)"]'
-        online_dashboard = 'Online_Dashboard["Online Dashboard"]'
+        for edge in (stream_edges
+                     + [(source, 'Dashboard', self._uplink_label('Detection Results', site)) for site, source in uplinks]
+                     + [(source, 'Alert', 'Alerts') for _, source in uplinks]
+                     + [('AI_Training', source, 'Trained Models', True) for _, source in uplinks]
+                     + module_edges):
+            graph.add_edge(*edge)
+        return graph
+    
+    def build_sites_cloud(self):
+        """Cloud, multi-site: every site streams to the shared cloud inference and output services"""
+        graph = self._new_graph()
+        stream_edges, uplinks = self._add_sites(graph, edge_inference=False)
+        service_edges, module_edges = self._add_cloud_services(graph)
         
-        # Alert system - can be on-premise or cloud, default to cloud for hybrid
-        alerts = self.info.get('alert_methods', ['Email', 'Dashboard'])
-        alert_list = ' & '.join(alerts) if alerts else 'Email & Dashboard'
-        alert_system = f'Alert["Alert/Notification<br/>({alert_list})"]'
+        for edge in (stream_edges
+                     + [(source, 'Cloud_Inference', self._uplink_label('RTSP Links', site)) for site, source in uplinks]
+                     + service_edges + module_edges):
+            graph.add_edge(*edge)
+        return graph
+    
+    def build_sites_hybrid(self):
+        """Hybrid, multi-site: edge inference per site, training / dashboard / alerts shared in the cloud"""
+        graph = self._new_graph()
+        stream_edges, uplinks = self._add_sites(graph, edge_inference=True)
+        cloud = graph.add_subgraph("Cloud Infrastructure").title
+        module_edges = self._add_inference(graph, cloud, 'Cloud_Training', "AI Training\n(Cloud - viAct's Cloud)",
+                                           "AI Training\n(Cloud - viAct's Cloud)", CONNECTIVITY_STYLE)
+        graph.add_node('Online_Dashboard', "Online Dashboard", DASHBOARD_STYLE, subgraph=cloud)
+        graph.add_node('Alert', self._alert_label(), ALERT_STYLE, subgraph=cloud)
         
-        template = f"""graph TB
-    subgraph "On-Premise Infrastructure"
-        {camera_group}
-        {nvr_node}
-        {ai_inference}
-        {local_dashboard}
-        {internet}
-    end
+        for edge in (stream_edges
+                     + [(source, 'Online_Dashboard', self._uplink_label('API', site)) for site, source in uplinks]
+                     + [(source, 'Alert', 'Alerts') for _, source in uplinks]
+                     + [('Cloud_Training', source, 'Updated Models', True) for _, source in uplinks]
+                     + module_edges):
+            graph.add_edge(*edge)
+        return graph
     
-    subgraph "Cloud Infrastructure"
-        {cloud_training}
-        {online_dashboard}
-        {alert_system}
-    end
+    def _diagram_size(self, graph):
+        """Nodes plus module lines listed inside the inference node (compact mode)"""
+        size = len(graph.nodes)
+        if self.info.get('compact_mode', True) and not self.aggregated:
+            size += len(self.info.get('ai_modules', []))
+        return size
     
-{ai_modules_subgraph}    {nvr_connection}
-    AI_Inference -->|Detection Results| Local_Dashboard
-    AI_Inference -->|Alerts| Alert
-    Internet -->|Model Updates| Cloud_Training
-    Cloud_Training -.->|Updated Models| AI_Inference
-    AI_Inference -->|API| Online_Dashboard
-{ai_modules_connections}    style AI_Inference fill:#81d4fa,stroke:#0277bd,stroke-width:2px,color:#000000
-    style Local_Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Cloud_Training fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000
-    style Online_Dashboard fill:#fff4e1,stroke:#e65100,stroke-width:2px,color:#000000
-    style Alert fill:#f3e5f5,stroke:#7b1fa2,stroke-width:2px,color:#000000
-    style Cameras fill:#ffffff,stroke:#424242,stroke-width:2px,color:#000000
-    style Internet fill:#e8f5e9,stroke:#2e7d32,stroke-width:2px,color:#000000
-    classDef aiModuleStyle fill:#f5f5f5,stroke:#616161,stroke-width:2px,color:#000000
-{ai_modules_styles}
-"""
-        return template
+    def build(self):
+        """Build the graph for the deployment method (aggregated when over the node budget in 'auto' mode)"""
+        self.aggregated = self.aggregate is True
+        graph = self._build_topology()
+        if self.aggregate == 'auto' and self._diagram_size(graph) > self.node_budget:
+            self.aggregated = True
+            graph = self._build_topology()
+        return graph
     
-    def generate(self):
-        """Generate architecture based on deployment method"""
+    def _build_topology(self):
         method = self.info.get('deployment_method', 'on-prem').lower()
+        multi_site = bool(self.info.get('sites'))
         
         if method == 'on-prem' or method == 'on-premise':
-            return self.generate_on_prem()
+            return self.build_sites_on_prem() if multi_site else self.build_on_prem()
         elif method == 'cloud':
-            return self.generate_cloud()
+            return self.build_sites_cloud() if multi_site else self.build_cloud()
         elif method == 'hybrid':
-            return self.generate_hybrid()
+            return self.build_sites_hybrid() if multi_site else self.build_hybrid()
         else:
             raise ValueError(f"Unknown deployment method: {method}")
+    
+    def generate(self, fmt='mermaid'):
+        """Generate the architecture diagram source in the given format (see architecture_graph.SERIALIZERS)"""
+        return SERIALIZERS[fmt](self.build())
 
 
 if __name__ == "__main__":
@@ -3,25 +3,38 @@
 Parse proposal template (from proposal-template-generation-skill) and extract architecture information
 """
 
-import re
 import json
 import sys
 from pathlib import Path
 
+# Shared document model, regex registry and keyword scanner live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+import patterns
+from keyword_scanner import KeywordScanner
+from proposal_document import load_document
+
+# Compiled once: alert, deployment and NVR keywords found in a single sweep per document
+DETECTION_SCANNER = KeywordScanner(patterns.DETECTION_KEYWORDS)
+
+# Bandwidth units relative to Mbps (a bare number is taken as Mbps)
+BANDWIDTH_UNITS = {'g': 1000, 'm': 1, 'k': 0.001}
+
 
 class ProposalParser:
     """Parse proposal markdown template and extract architecture information"""
     
     def __init__(self, markdown_file):
         self.file_path = Path(markdown_file)
-        self.content = self._read_file()
+        self.document = self._load_document()
+        self.content = self.document.content
+        self.keyword_hits = DETECTION_SCANNER.scan(self.content)
         self.project_info = {}
         
-    def _read_file(self):
-        """Read markdown file content"""
+    def _load_document(self):
+        """Load the parsed markdown document"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return load_document(self.file_path)
         except Exception as e:
             print(f"Error reading file: {e}")
             sys.exit(1)
@@ -29,51 +42,45 @@ class ProposalParser:
     def extract_project_name(self):
         """Extract project name from proposal title"""
         # Look for "Proposal Title:" or title in markdown
-        pattern = r'\*\*Proposal Title:\*\*\s*(.+?)(?:\n|$)'
-        match = re.search(pattern, self.content, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+        title = self.document.field("Proposal Title")
+        if title:
+            return title
         
         # Fallback: extract from first heading
-        pattern = r'^#\s+(.+?)$'
-        match = re.search(pattern, self.content, re.MULTILINE)
-        if match:
-            return match.group(1).strip()
+        if self.document.title:
+            return self.document.title
         
         return self.file_path.stem
     
     def extract_client_name(self):
         """Extract client name"""
-        pattern = r'\*\*Client Name:\*\*\s*(.+?)(?:\n|$)'
-        match = re.search(pattern, self.content, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+        client_name = self.document.field("Client Name")
+        if client_name:
+            return client_name
         
         # Try "Project Owner"
-        pattern = r'\*\*Project Owner:\*\*\s*(.+?)(?:\n|$)'
-        match = re.search(pattern, self.content, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+        project_owner = self.document.field("Project Owner")
+        if project_owner:
+            return project_owner
         
         return "Client"
     
     def extract_camera_number(self):
         """Extract number of cameras"""
-        patterns = [
-            r'\*\*Camera Number:\*\*\s*(\d+)\s*cameras?',
-            r'(\d+)\s*cameras?\s*(?:\(|at|total)',
-            r'Camera.*?(\d+)\s*cameras?',
-        ]
+        camera_field = self.document.field("Camera Number", "")
+        match = patterns.CAMERA_COUNT_VALUE.match(camera_field)
+        if match:
+            return int(match.group(1))
         
-        for pattern in patterns:
-            match = re.search(pattern, self.content, re.IGNORECASE)
+        for pattern in patterns.CAMERA_COUNT_PATTERNS:
+            match = pattern.search(self.content)
             if match:
                 return int(match.group(1))
         
         # Try to find number in "Camera Number:" section
         section = self._extract_section("Camera Number")
         if section:
-            match = re.search(r'(\d+)', section)
+            match = patterns.FIRST_NUMBER.search(section)
             if match:
                 return int(match.group(1))
         
@@ -84,23 +91,18 @@ class ProposalParser:
         modules = []
         
         # First, try to find in PROJECT REQUIREMENT STATEMENT section
-        section = self._extract_section("PROJECT REQUIREMENT STATEMENT")
-        if section:
+        section_range = self.document.section_range("PROJECT REQUIREMENT STATEMENT")
+        ai_modules_field = self.document.fields.get("ai modules")
+        if section_range and ai_modules_field and section_range[0] <= ai_modules_field["start"] < section_range[1]:
             # Look for "AI Modules:" followed by numbered list
-            pattern = r'\*\*AI Modules:\*\*.*?\n((?:\d+\.\s*[^\n]+\n?)+)'
-            match = re.search(pattern, section, re.IGNORECASE | re.DOTALL)
-            if match:
-                module_list = match.group(1)
-                # Extract each numbered item
-                pattern = r'^\d+\.\s*(.+?)$'
-                matches = re.findall(pattern, module_list, re.MULTILINE)
-                if matches:
-                    for m in matches:
-                        module_name = m.strip()
-                        # Filter out non-module items
-                        if len(module_name) < 100 and not any(keyword in module_name.lower() for keyword in 
-                            ['data flow', 'capture video', 'processes video', 'alert data', 'delivered via']):
-                            modules.append(module_name)
+            module_list = self.document.numbered_list_after(ai_modules_field["end"])
+            if module_list and module_list["end"] <= section_range[1]:
+                for m in module_list["items"]:
+                    module_name = m.strip()
+                    # Filter out non-module items
+                    if len(module_name) < 100 and not any(keyword in module_name.lower() for keyword in 
+                        ['data flow', 'capture video', 'processes video', 'alert data', 'delivered via']):
+                        modules.append(module_name)
         
         # If still no modules, try finding standalone "AI Modules:" section
         if not modules:
@@ -108,7 +110,7 @@ class ProposalParser:
             if section:
                 lines = section.split('\n')
                 for line in lines:
-                    match = re.match(r'^\d+\.\s*(.+?)$', line.strip())
+                    match = patterns.NUMBERED_ITEM.match(line.strip())
                     if match:
                         module_name = match.group(1).strip()
                         if len(module_name) < 100:
@@ -118,35 +120,26 @@ class ProposalParser:
         
         # Fallback: search entire document for numbered list after "AI Modules:"
         if not modules:
-            pattern = r'AI Modules:.*?\n((?:\d+\.\s*[^\n]{0,100}\n?)+)'
-            match = re.search(pattern, self.content, re.IGNORECASE | re.DOTALL)
-            if match:
-                module_list = match.group(1)
-                pattern = r'^\d+\.\s*(.+?)$'
-                matches = re.findall(pattern, module_list, re.MULTILINE)
-                if matches:
-                    modules = [m.strip() for m in matches if len(m.strip()) < 100]
+            marker = patterns.AI_MODULES_MARKER.search(self.content)
+            module_list = self.document.numbered_list_after(marker.end()) if marker else None
+            if module_list:
+                modules = [m.strip() for m in module_list["items"] if len(m.strip()) < 100]
         
         return modules
     
     def extract_deployment_method(self):
         """Extract deployment method (Cloud/On-premise/Hybrid)"""
         # Look for "Deployment Method:" section
-        section = self._extract_section("SYSTEM ARCHITECTURE")
+        section = self._section_bounds("SYSTEM ARCHITECTURE")
         if section:
             # Check for deployment method keywords
-            if re.search(r'\bCloud-based\b|\bCloud\b|\bOn-cloud\b', section, re.IGNORECASE):
-                return "cloud"
-            elif re.search(r'\bOn-premise\b|\bOn-prem\b|\bOn premise\b', section, re.IGNORECASE):
-                return "on-prem"
-            elif re.search(r'\bHybrid\b', section, re.IGNORECASE):
-                return "hybrid"
+            for method, keywords in patterns.DEPLOYMENT_SECTION_KEYWORDS.items():
+                if self.keyword_hits.contains_any(keywords, *section):
+                    return method
         
         # Check in "Deployment Method:" field
-        pattern = r'\*\*Deployment Method:\*\*\s*(.+?)(?:\n|$)'
-        match = re.search(pattern, self.content, re.IGNORECASE)
-        if match:
-            method = match.group(1).lower()
+        method = self.document.field("Deployment Method", "").lower()
+        if method:
             if 'cloud' in method:
                 return "cloud"
             elif 'on-prem' in method or 'on premise' in method:
@@ -155,10 +148,9 @@ class ProposalParser:
                 return "hybrid"
         
         # Default based on other indicators
-        if re.search(r'\bcloud\b', self.content, re.IGNORECASE):
-            return "cloud"
-        elif re.search(r'\bon-prem\b|\bon premise\b', self.content, re.IGNORECASE):
-            return "on-prem"
+        for method, keywords in patterns.DEPLOYMENT_DOCUMENT_KEYWORDS.items():
+            if self.keyword_hits.contains_any(keywords):
+                return method
         
         return "on-prem"  # Default
     
@@ -167,45 +159,33 @@ class ProposalParser:
         alerts = []
         
         # Look for alert section
-        section = self._extract_section("Alerts & Notifications")
+        section = self._section_bounds("Alerts & Notifications")
         if not section:
-            section = self._extract_section("Alert")
+            section = self._section_bounds("Alert")
         
         if section:
             # Check for common alert types
-            if re.search(r'\bEmail\b', section, re.IGNORECASE):
-                alerts.append("Email")
-            if re.search(r'\bTelegram\b', section, re.IGNORECASE):
-                alerts.append("Telegram")
-            if re.search(r'\bDashboard\b', section, re.IGNORECASE):
-                alerts.append("Dashboard")
-            if re.search(r'\bMobile\b', section, re.IGNORECASE):
-                alerts.append("Mobile")
-            if re.search(r'\bSMS\b', section, re.IGNORECASE):
-                alerts.append("SMS")
-            if re.search(r'\bWhatsApp\b', section, re.IGNORECASE):
-                alerts.append("WhatsApp")
+            for name, keyword in patterns.ALERT_SECTION_KEYWORDS:
+                if self.keyword_hits.contains(keyword, *section):
+                    alerts.append(name)
         
         # Fallback: search in entire document
         if not alerts:
-            if re.search(r'\bemail\b', self.content, re.IGNORECASE):
-                alerts.append("Email")
-            if re.search(r'\btelegram\b', self.content, re.IGNORECASE):
-                alerts.append("Telegram")
-            if re.search(r'\bdashboard\b', self.content, re.IGNORECASE):
-                alerts.append("Dashboard")
+            for name, keyword in patterns.ALERT_DOCUMENT_KEYWORDS:
+                if self.keyword_hits.contains(keyword):
+                    alerts.append(name)
         
         return alerts if alerts else ["Email", "Dashboard"]  # Default
     
     def extract_nvr_requirement(self):
         """Extract NVR requirement - check if NVR is mentioned or needed"""
         # Check if NVR is explicitly mentioned
-        if re.search(r'\bNVR\b|\bNetwork Video Recorder\b', self.content, re.IGNORECASE):
+        if self.keyword_hits.contains_any(patterns.NVR_KEYWORDS):
             # Check if it's marked as optional
-            nvr_section = self._extract_section("SYSTEM ARCHITECTURE")
+            nvr_section = self._section_bounds("SYSTEM ARCHITECTURE")
             if nvr_section:
                 # If marked as optional or not required, return False
-                if re.search(r'NVR.*optional|optional.*NVR|NVR.*\*', nvr_section, re.IGNORECASE):
+                if self._nvr_marked_optional(*nvr_section):
                     return False
                 # If explicitly mentioned without "optional", assume needed
                 return True
@@ -227,15 +207,14 @@ class ProposalParser:
         }
         
         # Check for internet connection
-        if re.search(r'internet connection.*?(?:required|confirmed|yes|stable)', self.content, re.IGNORECASE):
+        if patterns.INTERNET_CONFIRMED.search(self.content):
             network["internet_connection"] = True
             # Extract internet type - look for specific patterns
             # Pattern 1: "4G/5G/WiFi" or similar combinations
-            pattern1 = r'(?:internet|connection|network).*?(?:4G|5G|WiFi|Wi-Fi|Ethernet|Fiber|Satellite)'
-            match1 = re.search(pattern1, self.content, re.IGNORECASE)
+            match1 = patterns.INTERNET_TYPE_CONTEXT.search(self.content)
             if match1:
                 # Extract the type
-                type_match = re.search(r'(4G|5G|WiFi|Wi-Fi|Ethernet|Fiber|Satellite|Broadband)', self.content, re.IGNORECASE)
+                type_match = patterns.INTERNET_TYPE.search(self.content)
                 if type_match:
                     network["internet_type"] = type_match.group(1)
             
@@ -244,19 +223,93 @@ class ProposalParser:
             if not network["internet_type"]:
                 network_section = self._extract_section("SYSTEM REQUIREMENTS")
                 if network_section:
-                    type_match = re.search(r'(4G|5G|WiFi|Wi-Fi|Ethernet|Fiber|Satellite|Broadband)', network_section, re.IGNORECASE)
+                    type_match = patterns.INTERNET_TYPE.search(network_section)
                     if type_match:
                         network["internet_type"] = type_match.group(1)
         
         return network
     
+    def extract_modules_per_camera(self):
+        """AI modules per camera ("3-4 modules per camera" -> 4, the upper bound, so hardware is not under-sized)"""
+        match = patterns.MODULES_PER_CAMERA_VALUE.search(self.document.field("Number of AI Module per Camera", ""))
+        if not match:
+            return None
+        return int(match.group(2) or match.group(1))
+    
+    def extract_camera_stream(self):
+        """(resolution, fps) of the camera streams, e.g. ("1080p", 25), or None"""
+        section = self._extract_section("SYSTEM REQUIREMENTS")
+        match = patterns.CAMERA_STREAM_FORMAT.search(section or self.content)
+        if not match:
+            return None
+        return match.group(1).lower(), int(match.group(2))
+    
+    def extract_sites(self):
+        """
+        Extract per-site rows from site tables (multi-site deployments)
+        
+        Any table with a site and a camera column (patterns.SITE_TABLE_COLUMNS)
+        contributes one site per row; rows without a camera count (template
+        placeholders) are skipped.
+        
+        Returns:
+            [{"name", "cameras", "ai_modules", "edge_servers", "bandwidth_mbps"}];
+            ai_modules is empty when the site runs every project module,
+            edge_servers / bandwidth_mbps are None when not given
+        """
+        aliases = {alias: key for key, names in patterns.SITE_TABLE_COLUMNS.items() for alias in names}
+        sites = []
+        for table in self.document.tables:
+            headers = [patterns.BOLD_MARKER.sub('', header).strip().lower() for header in table["headers"]]
+            columns = {aliases[header]: index for index, header in enumerate(headers) if header in aliases}
+            if "name" not in columns or "cameras" not in columns:
+                continue
+            
+            for cells in table["rows"]:
+                values = {key: patterns.BOLD_MARKER.sub('', cells[index]).strip() if index < len(cells) else ''
+                          for key, index in columns.items()}
+                cameras = patterns.FIRST_NUMBER.search(values["cameras"].replace(',', ''))
+                if not values["name"] or not cameras:
+                    continue
+                
+                modules = values.get("ai_modules", '')
+                edge_servers = patterns.FIRST_NUMBER.search(values.get("edge_servers", ''))
+                bandwidth = patterns.BANDWIDTH_VALUE.search(values.get("bandwidth_mbps", ''))
+                sites.append({
+                    "name": values["name"],
+                    "cameras": int(cameras.group(1)),
+                    "ai_modules": [] if modules.lower() in patterns.SITE_ALL_MODULES
+                    else [module for module in patterns.SITE_MODULE_SEPARATOR.split(modules) if module],
+                    "edge_servers": int(edge_servers.group(1)) if edge_servers else None,
+                    "bandwidth_mbps": (float(bandwidth.group(1)) * BANDWIDTH_UNITS[(bandwidth.group(2) or 'm').lower()]
+                                       if bandwidth else None),
+                })
+        return sites
+    
+    def _nvr_marked_optional(self, start, end):
+        """True if a line in [start, end) has NVR with "optional" before or after it, or an asterisk after it"""
+        for pos in self.keyword_hits.find_all("nvr", start, end, whole_word=False):
+            nvr_end = pos + len("nvr")
+            line_start = max(start, self.content.rfind('\n', 0, pos) + 1)
+            line_end = self.content.find('\n', pos)
+            if line_end == -1 or line_end > end:
+                line_end = end
+            if '*' in self.content[nvr_end:line_end]:
+                return True
+            for opt in self.keyword_hits.find_all(patterns.OPTIONAL_KEYWORD, line_start, line_end, whole_word=False):
+                if opt >= nvr_end or opt + len(patterns.OPTIONAL_KEYWORD) <= pos:
+                    return True
+        return False
+    
     def _extract_section(self, section_name):
         """Extract a specific section from markdown"""
-        # Look for section heading
-        pattern = rf'##+\s*{re.escape(section_name)}.*?\n(.*?)(?=##|\Z)'
-        match = re.search(pattern, self.content, re.IGNORECASE | re.DOTALL)
-        if match:
-            return match.group(1)
+        return self.document.section(section_name)
+    
+    def _section_bounds(self, section_name):
+        """(start, end) offsets of a non-empty section, or None"""
+        section_range = self.document.section_range(section_name)
+        if section_range and section_range[0] < section_range[1]:
+            return section_range
         return None
     
     def parse(self):
@@ -277,6 +330,30 @@ class ProposalParser:
         network = self.extract_network_info()
         self.project_info.update(network)
         
+        # Capacity planner inputs, when the proposal states them
+        modules_per_camera = self.extract_modules_per_camera()
+        if modules_per_camera:
+            self.project_info["modules_per_camera"] = modules_per_camera
+        camera_stream = self.extract_camera_stream()
+        if camera_stream:
+            self.project_info["camera_resolution"], self.project_info["camera_fps"] = camera_stream
+        
+        # Multi-site deployments: the site rows give the camera total (sizing uses them too),
+        # and modules fall back to theirs
+        sites = self.extract_sites()
+        if sites:
+            self.project_info["sites"] = sites
+            stated = self.project_info["num_cameras"]
+            site_cameras = sum(site["cameras"] for site in sites)
+            if site_cameras:
+                if stated and stated != site_cameras:
+                    print(f"⚠️  Warning: {stated} cameras stated, but the {len(sites)} site(s) add up to "
+                          f"{site_cameras}; using the site total", file=sys.stderr)
+                self.project_info["num_cameras"] = site_cameras
+            if not self.project_info["ai_modules"]:
+                site_modules = (module for site in sites for module in site["ai_modules"])
+                self.project_info["ai_modules"] = list(dict.fromkeys(site_modules))
+        
         return self.project_info
 
 
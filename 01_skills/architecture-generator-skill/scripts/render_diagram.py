@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Render architecture diagrams to SVG/PNG offline
+Reads the Mermaid diagram written by generate_architecture.py (the
+*_architecture_diagram.md file or bare Mermaid source), lays it out and
+draws it locally - no browser, no network, no Mermaid CLI.
+
+Layout: nodes are ranked top to bottom by the longest path of edges leading
+to them; each subgraph is a column of its own, so cluster boxes never
+overlap, and a rank's nodes line up across columns. Edges are straight
+arrows with their label at the midpoint.
+
+SVG is drawn in pure Python. PNG converts that SVG with cairosvg or the
+rsvg-convert tool, whichever is installed. Renders are cached by diagram
+content (PROPOSAL_CACHE_DIR, like the other generated artifacts).
+
+Usage:
+    python3 render_diagram.py <diagram.md|diagram.mmd> [-o OUTPUT] [--format svg|png] [--no-cache]
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent))
+# Shared utilities live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+import architecture_graph
+import patterns
+from architecture_graph import DEFAULT_STYLE, ArchitectureGraph, from_mermaid
+from artifact_cache import ArtifactCache, code_fingerprint
+from safe_write import write_atomic
+
+try:
+    import cairosvg
+except ImportError:  # PNG falls back to rsvg-convert
+    cairosvg = None
+
+# Bump when the drawing changes to invalidate cached renders
+RENDERER_VERSION = "1.0"
+FORMATS = ('svg', 'png')
+
+FONT_SIZE = 13
+LINE_HEIGHT = 17
+NODE_PADDING_X = 14
+NODE_PADDING_Y = 10
+NODE_MIN_WIDTH = 110
+NODE_GAP = 28
+RANK_GAP = 64
+CLUSTER_PADDING = 16
+CLUSTER_TITLE_HEIGHT = 22
+COLUMN_GAP = 36
+MARGIN = 24
+EDGE_COLOR = '#333333'
+CLUSTER_FILL = '#fafafa'
+CLUSTER_STROKE = '#9e9e9e'
+
+
+def text_width(text: str) -> float:
+    """Approximate rendered width of text in the diagram font (no font metrics offline)"""
+    width = 0.0
+    for char in text:
+        if unicodedata.east_asian_width(char) in ('W', 'F'):
+            width += FONT_SIZE
+        elif char in 'il.,:;|!\'`()[] ':
+            width += FONT_SIZE * 0.32
+        elif char.isupper() or char in 'mwMW@%&':
+            width += FONT_SIZE * 0.68
+        else:
+            width += FONT_SIZE * 0.54
+    return width
+
+
+def _ranks(graph: ArchitectureGraph) -> Dict[str, int]:
+    """Longest-path rank of every node (edges closing a cycle are ignored)"""
+    successors: Dict[str, List[str]] = {node_id: [] for node_id in graph.nodes}
+    for edge in graph.edges:
+        successors[edge.source].append(edge.target)
+
+    # Depth-first search in node order; edges back into the current path close a cycle
+    order, state = [], {}
+    forward: Dict[str, List[str]] = {node_id: [] for node_id in graph.nodes}
+    for root in graph.nodes:
+        if root in state:
+            continue
+        state[root] = 'open'
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node_id, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                state[node_id] = 'done'
+                order.append(node_id)
+                stack.pop()
+            elif state.get(child) != 'open':
+                forward[node_id].append(child)
+                if child not in state:
+                    state[child] = 'open'
+                    stack.append((child, iter(successors[child])))
+
+    ranks = dict.fromkeys(graph.nodes, 0)
+    for node_id in reversed(order):  # topological order of the forward edges
+        for child in forward[node_id]:
+            ranks[child] = max(ranks[child], ranks[node_id] + 1)
+    return ranks
+
+
+def layout(graph: ArchitectureGraph) -> Dict[str, Any]:
+    """
+    Place nodes, cluster boxes and edges
+
+    Returns:
+        Dict with width, height, nodes (id -> (x, y, w, h)), clusters
+        ((title, x, y, w, h)) and edges ((edge, points))
+    """
+    sizes = {}
+    for node in graph.nodes.values():
+        lines = node.label.split('\n')
+        width = max(NODE_MIN_WIDTH, round(max(text_width(line) for line in lines)) + 2 * NODE_PADDING_X)
+        sizes[node.id] = (width, len(lines) * LINE_HEIGHT + 2 * NODE_PADDING_Y)
+    ranks = _ranks(graph)
+
+    # Columns: one per subgraph, then the nodes outside any subgraph
+    grouped = {node_id for subgraph in graph.subgraphs.values() for node_id in subgraph.nodes}
+    columns = [(subgraph.title, subgraph.nodes) for subgraph in graph.subgraphs.values() if subgraph.nodes]
+    loose = [node_id for node_id in graph.nodes if node_id not in grouped]
+    if loose:
+        columns.append((None, loose))
+
+    rank_count = max(ranks.values(), default=-1) + 1
+    rank_heights = [0] * rank_count
+    for node_id, (_, height) in sizes.items():
+        rank_heights[ranks[node_id]] = max(rank_heights[ranks[node_id]], height)
+    rank_tops, y = [], MARGIN + CLUSTER_TITLE_HEIGHT + CLUSTER_PADDING
+    for height in rank_heights:
+        rank_tops.append(y)
+        y += height + RANK_GAP
+
+    positions: Dict[str, Tuple[int, int, int, int]] = {}
+    clusters = []
+    x = MARGIN
+    for title, node_ids in columns:
+        rows: Dict[int, List[str]] = {}
+        for node_id in node_ids:
+            rows.setdefault(ranks[node_id], []).append(node_id)
+        row_widths = {rank: sum(sizes[node_id][0] for node_id in row) + NODE_GAP * (len(row) - 1)
+                      for rank, row in rows.items()}
+        padding = CLUSTER_PADDING if title is not None else 0
+        inner_width = max(row_widths.values())
+
+        for rank, row in rows.items():
+            node_x = x + padding + (inner_width - row_widths[rank]) // 2
+            for node_id in row:
+                width, height = sizes[node_id]
+                node_y = rank_tops[rank] + (rank_heights[rank] - height) // 2
+                positions[node_id] = (node_x, node_y, width, height)
+                node_x += width + NODE_GAP
+
+        if title is not None:
+            top = min(positions[node_id][1] for node_id in node_ids) - CLUSTER_PADDING - CLUSTER_TITLE_HEIGHT
+            bottom = max(positions[node_id][1] + positions[node_id][3] for node_id in node_ids) + CLUSTER_PADDING
+            clusters.append((title, x, top, inner_width + 2 * padding, bottom - top))
+        x += inner_width + 2 * padding + COLUMN_GAP
+
+    edges = []
+    for edge in graph.edges:
+        sx, sy, sw, sh = positions[edge.source]
+        tx, ty, tw, th = positions[edge.target]
+        if ranks[edge.target] > ranks[edge.source]:
+            points = ((sx + sw // 2, sy + sh), (tx + tw // 2, ty))
+        elif ranks[edge.target] < ranks[edge.source]:
+            points = ((sx + sw // 2, sy), (tx + tw // 2, ty + th))
+        elif tx >= sx:
+            points = ((sx + sw, sy + sh // 2), (tx, ty + th // 2))
+        else:
+            points = ((sx, sy + sh // 2), (tx + tw, ty + th // 2))
+        edges.append((edge, points))
+
+    width = max(x - COLUMN_GAP + MARGIN, 2 * MARGIN)
+    height = max(y - RANK_GAP + CLUSTER_PADDING + MARGIN, 2 * MARGIN)
+    return {"width": width, "height": height, "nodes": positions, "clusters": clusters, "edges": edges}
+
+
+def _text(x: float, y: float, lines: List[str], color: str, extra: str = '') -> str:
+    """Centered multi-line <text> whose first baseline is at y"""
+    spans = ''.join(f'<tspan x="{x}" dy="{0 if index == 0 else LINE_HEIGHT}">{escape(line)}</tspan>'
+                    for index, line in enumerate(lines))
+    return f'<text x="{x}" y="{y}" text-anchor="middle" fill="{color}"{extra}>{spans}</text>'
+
+
+def to_svg(graph: ArchitectureGraph) -> str:
+    """Standalone SVG drawing of the graph"""
+    placed = layout(graph)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{placed["width"]}" height="{placed["height"]}" '
+        f'viewBox="0 0 {placed["width"]} {placed["height"]}" '
+        f'font-family="Helvetica, Arial, sans-serif" font-size="{FONT_SIZE}">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+        f'orient="auto-start-reverse"><path d="M 0 0 L 10 5 L 0 10 z" fill="{EDGE_COLOR}"/></marker></defs>',
+        f'<rect width="{placed["width"]}" height="{placed["height"]}" fill="#ffffff"/>',
+    ]
+
+    for title, x, y, width, height in placed["clusters"]:
+        parts.append(f'<rect x="{x}" y="{y}" width="{width}" height="{height}" rx="6" '
+                     f'fill="{CLUSTER_FILL}" stroke="{CLUSTER_STROKE}"/>')
+        parts.append(_text(x + width / 2, y + CLUSTER_TITLE_HEIGHT - 4, [title], '#212121', ' font-weight="bold"'))
+
+    for edge, ((x1, y1), (x2, y2)) in placed["edges"]:
+        dash = ' stroke-dasharray="6 4"' if edge.dashed else ''
+        parts.append(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="{EDGE_COLOR}" stroke-width="1.5"'
+                     f'{dash} marker-end="url(#arrow)"/>')
+
+    for node_id, (x, y, width, height) in placed["nodes"].items():
+        node = graph.nodes[node_id]
+        style = graph.node_style(node) or DEFAULT_STYLE
+        lines = node.label.split('\n')
+        parts.append(f'<rect x="{x}" y="{y}" width="{width}" height="{height}" rx="5" fill="{style.fill}" '
+                     f'stroke="{style.stroke}" stroke-width="{style.stroke_width}"/>')
+        parts.append(_text(x + width / 2, y + NODE_PADDING_Y + FONT_SIZE, lines, style.color))
+
+    # Edge labels last so they sit on top of lines and boxes
+    for edge, ((x1, y1), (x2, y2)) in placed["edges"]:
+        if not edge.label:
+            continue
+        mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
+        width = round(text_width(edge.label)) + 8
+        parts.append(f'<rect x="{mid_x - width / 2}" y="{mid_y - LINE_HEIGHT / 2}" width="{width}" '
+                     f'height="{LINE_HEIGHT}" fill="#ffffff" opacity="0.9"/>')
+        parts.append(_text(mid_x, mid_y + FONT_SIZE / 2 - 2, [edge.label], EDGE_COLOR, ' font-size="11"'))
+
+    parts.append('</svg>')
+    return '\n'.join(parts) + '\n'
+
+
+def png_backend():
+    """Name of the available SVG -> PNG converter, or None"""
+    if cairosvg is not None:
+        return 'cairosvg'
+    if shutil.which('rsvg-convert'):
+        return 'rsvg-convert'
+    return None
+
+
+def svg_to_png(svg: str) -> bytes:
+    """Convert SVG text to PNG bytes with the installed converter"""
+    backend = png_backend()
+    if backend == 'cairosvg':
+        return cairosvg.svg2png(bytestring=svg.encode('utf-8'))
+    if backend == 'rsvg-convert':
+        return subprocess.run(['rsvg-convert', '--format', 'png'], input=svg.encode('utf-8'),
+                              stdout=subprocess.PIPE, check=True).stdout
+    raise RuntimeError("PNG output needs cairosvg (pip install cairosvg) or rsvg-convert; SVG works without either")
+
+
+def load_graph(diagram_file) -> ArchitectureGraph:
+    """Graph from a diagram file: the ```mermaid block of a markdown file, or bare Mermaid source"""
+    content = Path(diagram_file).read_text(encoding='utf-8')
+    match = patterns.MERMAID_BLOCK.search(content) or patterns.MERMAID_BLOCK_LOOSE.search(content)
+    return from_mermaid(match.group(1) if match else content)
+
+
+def render_file(diagram_file, output_file=None, fmt=None, use_cache=True) -> Dict[str, Any]:
+    """
+    Render a diagram file to SVG or PNG
+
+    Args:
+        diagram_file: Mermaid diagram (markdown with a ```mermaid block, or .mmd)
+        output_file: Output path (default: diagram path with the format's suffix)
+        fmt: 'svg' or 'png' (default: from output_file's suffix, else svg)
+        use_cache: Reuse a cached render of identical diagram content (default: True)
+
+    Returns:
+        Dict with output_file, format and cached
+    """
+    diagram_file = Path(diagram_file)
+    fmt = fmt or (Path(output_file).suffix.lstrip('.').lower() if output_file else 'svg')
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt} (available: {', '.join(FORMATS)})")
+    output_file = Path(output_file) if output_file else diagram_file.with_suffix(f'.{fmt}')
+    artifact = f'diagram.{fmt}'
+
+    cache = ArtifactCache() if use_cache else None
+    cached = None
+    if cache:
+        backend = png_backend() if fmt == 'png' else 'svg'
+        version = f"{RENDERER_VERSION}-{backend}-{code_fingerprint(sys.modules[__name__], architecture_graph, patterns)}"
+        cache_key = cache.key_for([diagram_file], f"render-{fmt}", version)
+        cached = cache.get(cache_key)
+
+    if cached:
+        data = cached[artifact]
+    else:
+        svg = to_svg(load_graph(diagram_file))
+        data = svg if fmt == 'svg' else svg_to_png(svg)
+        if cache:
+            cache.put(cache_key, {artifact: data})
+
+    write_atomic(output_file, data)
+    return {"output_file": output_file, "format": fmt, "cached": bool(cached)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render an architecture diagram to SVG/PNG offline')
+    parser.add_argument('diagram_file', help='*_architecture_diagram.md (or a .mmd Mermaid file)')
+    parser.add_argument('--output', '-o', help='Output file (default: next to the diagram)')
+    parser.add_argument('--format', '-f', choices=FORMATS, help='Output format (default: from --output, else svg)')
+    parser.add_argument('--no-cache', action='store_true', help='Render even if a cached render exists')
+    args = parser.parse_args()
+
+    if not Path(args.diagram_file).exists():
+        print(f"❌ Diagram file not found: {args.diagram_file}")
+        sys.exit(1)
+
+    try:
+        result = render_file(args.diagram_file, args.output, args.format, use_cache=not args.no_cache)
+    except (ValueError, RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    state = "cached render reused" if result["cached"] else "rendered"
+    print(f"🖼️  Saved {result['format'].upper()} diagram to: {result['output_file']} ({state})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Verify architecture_graph.split_graph keeps every diagram within the node budget
+
+Builds single-site and multi-site architectures of every deployment method
+(aggregated and not, compact and not), splits them at several budgets and
+checks that each returned diagram has at most node_budget nodes and that
+every node of the full graph is drawn in exactly one diagram.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'scripts'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared' / 'tests'))
+
+from architecture_graph import STUB_STYLE, split_graph
+from fixtures import project_info
+from generate_mermaid import ArchitectureGenerator
+
+BUDGETS = [3, 5, 10, 20, 40]
+
+
+def check(graph, node_budget: int) -> list:
+    """Errors of one split (empty when it holds)"""
+    errors = []
+    diagrams = split_graph(graph, node_budget)
+    drawn = {}
+    for number, (title, part) in enumerate(diagrams, 1):
+        if len(part.nodes) > node_budget:
+            errors.append(f"diagram {number} ({title}): {len(part.nodes)} nodes > {node_budget}")
+        for node in part.nodes.values():
+            if node.id in graph.nodes and node.style != STUB_STYLE:
+                drawn[node.id] = drawn.get(node.id, 0) + 1
+    missing = [node_id for node_id in graph.nodes if node_id not in drawn]
+    repeated = [node_id for node_id, count in drawn.items() if count > 1]
+    if missing:
+        errors.append(f"{len(missing)} node(s) in no diagram, e.g. {missing[0]}")
+    if repeated:
+        errors.append(f"{len(repeated)} node(s) in several diagrams, e.g. {repeated[0]}")
+    return errors
+
+
+def main():
+    failures = 0
+    cases = 0
+    for method in ('on-prem', 'cloud', 'hybrid'):
+        for sites, modules in ((0, 12), (0, 300), (60, 8), (200, 300)):
+            for aggregate in ('auto', False):
+                for compact in (True, False):
+                    info = project_info(method, 5000, [f'Module {i} Detection' for i in range(modules)],
+                                        [(f'Site {i}', 25) for i in range(sites)], compact)
+                    for node_budget in BUDGETS:
+                        graph = ArchitectureGenerator(info, aggregate, node_budget).build()
+                        cases += 1
+                        for error in check(graph, node_budget):
+                            failures += 1
+                            print(f"❌ {method}, {sites} sites, {modules} modules, aggregate={aggregate}, "
+                                  f"compact={compact}, budget {node_budget}: {error}")
+
+    if failures:
+        print(f"\n❌ {failures} error(s) in {cases} splits")
+        sys.exit(1)
+    print(f"✅ {cases} splits, every diagram within its node budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Batch-apply presale checklists to many proposal templates
+Parses each checklist once, updates the checklist/template pairs across a
+process pool and writes a combined JSON report of replaced, kept-estimate
+and not-found placeholder IDs per template
+
+Usage:
+    python3 batch_update_templates.py --manifest pairs.json [--output-dir DIR] [--workers N]
+    python3 batch_update_templates.py --checklist CHECKLIST.md <dir|glob|template> [...] [--output-dir DIR]
+
+Manifest format (paths relative to the manifest file; "output" is optional):
+    [{"checklist": "checklist.md", "template": "variant_a_template.md", "output": "out/variant_a.md"}, ...]
+
+Without --output-dir or a manifest "output", templates are updated in-place (with backup).
+Templates with no placeholders left (already processed) are reported as
+"unchanged", not as failures, and still copied to their output path; a
+template whose placeholders are all missing from its checklist fails.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent))
+# Shared utilities live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+from update_template_from_checklist import NO_CHANGES, apply_checklist, load_checklist
+from proposal_document import load_document
+from safe_write import write_atomic
+
+
+def load_manifest(manifest_file):
+    """Read checklist/template pairs from a JSON manifest (a list, or {"pairs": [...]})"""
+    manifest_path = Path(manifest_file)
+    entries = json.loads(manifest_path.read_text(encoding='utf-8'))
+    if isinstance(entries, dict):
+        entries = entries.get('pairs', [])
+
+    base_dir = manifest_path.resolve().parent
+    pairs = []
+    for i, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict) or 'checklist' not in entry or 'template' not in entry:
+            raise ValueError(f"Manifest entry {i} needs 'checklist' and 'template'")
+        pairs.append({
+            key: str((base_dir / entry[key]).resolve())
+            for key in ('checklist', 'template', 'output') if entry.get(key)
+        })
+    return pairs
+
+
+def collect_templates(inputs, pattern='*_template.md', exclude=()):
+    """
+    Expand directories, glob patterns and file paths into a sorted list of template files
+
+    Directories only contribute files matching pattern, so the reasoning,
+    checklist and note files of a proposal bundle next to the template are left out.
+    """
+    exclude = {Path(path).resolve() for path in exclude}
+    templates = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = path.glob(pattern)
+        elif path.exists():
+            candidates = [path]
+        else:
+            candidates = (Path(p) for p in glob.glob(item, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file() and candidate.resolve() not in exclude:
+                templates.add(candidate.resolve())
+    return sorted(templates)
+
+
+def assign_outputs(pairs, output_dir):
+    """Fill in output paths under output_dir; refuses to let two pairs write the same file"""
+    if output_dir:
+        for pair in pairs:
+            pair.setdefault('output', str(Path(output_dir).resolve() / Path(pair['template']).name))
+
+    seen = {}
+    for pair in pairs:
+        target = pair.get('output') or pair['template']
+        if target in seen:
+            raise ValueError(f"Both {seen[target]} and {pair['checklist']} would write {target}; "
+                             f"set 'output' in the manifest")
+        seen[target] = pair['checklist']
+    return pairs
+
+
+def _apply_pair(placeholders, template_file, output_file):
+    """Worker: apply one parsed checklist to one template, capturing its console output"""
+    started = time.perf_counter()
+    entry = {}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            success, result = apply_checklist(placeholders, template_file, output_file)
+        if success:
+            entry.update({
+                "status": "ok",
+                "replaced": [item['id'] for item in result['replaced']],
+                "kept_estimate": [item['id'] for item in result['kept_estimate']],
+                "not_found": result['not_found'],
+            })
+        elif result == NO_CHANGES:
+            document = load_document(template_file)
+            leftover = sorted(document.placeholder_ids())
+            if leftover:
+                entry.update({
+                    "status": "failed",
+                    "error": f"{len(leftover)} placeholder(s) in the template but not in the checklist",
+                    "not_in_checklist": leftover,
+                })
+            else:
+                # Already processed: the output directory still gets its copy
+                if output_file:
+                    write_atomic(output_file, document.content)
+                entry.update({"status": "unchanged", "reason": "no placeholders / already processed"})
+        else:
+            entry.update({"status": "failed", "error": result})
+    except Exception as e:
+        entry.update({
+            "status": "failed",
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        })
+    entry["seconds"] = round(time.perf_counter() - started, 4)
+    return entry
+
+
+def batch_update(pairs, workers=None, report_file=None):
+    """
+    Apply checklists to templates in a process pool
+
+    Args:
+        pairs: List of {"checklist", "template", optional "output"} dicts
+        workers: Process pool size (default: CPU count)
+        report_file: Report path (default: ./checklist_update_report.json)
+
+    Returns:
+        Report dict
+    """
+    started = time.perf_counter()
+    results = []
+
+    # Parse every distinct checklist once, in this process
+    checklists = {}
+    for pair in pairs:
+        if pair['checklist'] not in checklists:
+            checklists[pair['checklist']] = load_checklist(pair['checklist'])
+
+    jobs = []
+    for pair in pairs:
+        entry = {"checklist": pair['checklist'], "template": pair['template'], "output": pair.get('output')}
+        success, placeholders = checklists[pair['checklist']]
+        if success:
+            if entry['output']:
+                Path(entry['output']).parent.mkdir(parents=True, exist_ok=True)
+            jobs.append((entry, placeholders))
+        else:
+            results.append({**entry, "status": "failed", "error": placeholders, "seconds": 0.0})
+            print(f"❌ {Path(entry['template']).name} - {placeholders}")
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_apply_pair, placeholders, entry['template'], entry['output']): entry
+                for entry, placeholders in jobs
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                entry = {**futures[future], **future.result()}
+                results.append(entry)
+                if entry["status"] == "ok":
+                    print(f"✅ [{i}/{len(jobs)}] {Path(entry['template']).name} {entry['seconds']:.2f}s - "
+                          f"{len(entry['replaced'])} replaced, {len(entry['kept_estimate'])} kept, "
+                          f"{len(entry['not_found'])} not found")
+                elif entry["status"] == "unchanged":
+                    print(f"♻️  [{i}/{len(jobs)}] {Path(entry['template']).name} - {entry['reason']}")
+                else:
+                    leftover = entry.get("not_in_checklist")
+                    detail = f": {', '.join(leftover[:5])}{' ...' if len(leftover) > 5 else ''}" if leftover else ''
+                    print(f"❌ [{i}/{len(jobs)}] {Path(entry['template']).name} - {entry['error']}{detail}")
+
+    results.sort(key=lambda entry: (entry["template"], entry["checklist"]))
+    failed = [entry for entry in results if entry["status"] == "failed"]
+    unchanged = [entry for entry in results if entry["status"] == "unchanged"]
+    report = {
+        "generated_at": datetime.now().isoformat(timespec='seconds'),
+        "workers": workers,
+        "checklists": len(checklists),
+        "total": len(results),
+        "succeeded": len(results) - len(failed) - len(unchanged),
+        "unchanged": len(unchanged),
+        "failed": len(failed),
+        "elapsed_seconds": round(time.perf_counter() - started, 4),
+        "results": results,
+    }
+
+    if report_file is None:
+        report_file = Path('checklist_update_report.json')
+    write_atomic(report_file, json.dumps(report, indent=2, ensure_ascii=False))
+    report["report_file"] = str(report_file)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Apply presale checklists to many proposal templates'
+    )
+    parser.add_argument('templates', nargs='*', help='Template files, directories or glob patterns (with --checklist)')
+    parser.add_argument('--manifest', '-m', help='JSON manifest of checklist/template pairs')
+    parser.add_argument('--checklist', '-c', help='Checklist applied to every template given on the command line')
+    parser.add_argument('--output-dir', '-o', help='Write updated templates here (default: update in-place with backup)')
+    parser.add_argument('--workers', '-w', type=int, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--pattern', default='*_template.md',
+                        help='File pattern used inside directories (default: *_template.md)')
+    parser.add_argument('--report', help='Report file path (default: <output_dir or cwd>/checklist_update_report.json)')
+
+    args = parser.parse_args()
+
+    if bool(args.manifest) == bool(args.checklist):
+        parser.error('give either --manifest or --checklist with templates')
+
+    try:
+        if args.manifest:
+            pairs = load_manifest(args.manifest)
+        else:
+            templates = collect_templates(args.templates, args.pattern, exclude=[args.checklist])
+            checklist = str(Path(args.checklist).resolve())
+            pairs = [{"checklist": checklist, "template": str(template)} for template in templates]
+        pairs = assign_outputs(pairs, args.output_dir)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if not pairs:
+        print("❌ No checklist/template pairs found")
+        sys.exit(1)
+
+    if args.output_dir:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    report_file = args.report or Path(args.output_dir or '.') / 'checklist_update_report.json'
+
+    print(f"📋 Applying {len({pair['checklist'] for pair in pairs})} checklist(s) to {len(pairs)} template(s)...\n")
+    report = batch_update(pairs, args.workers, report_file)
+
+    print(f"\n{'='*50}")
+    print(f"Succeeded: {report['succeeded']}/{report['total']}")
+    print(f"Unchanged: {report['unchanged']} (no placeholders / already processed)")
+    print(f"Failed: {report['failed']}")
+    print(f"Elapsed: {report['elapsed_seconds']:.2f}s with {report['workers']} worker(s)")
+    print(f"📁 Report: {report['report_file']}")
+
+    sys.exit(1 if report['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,67 +11,33 @@ This script:
 Usage:
     python update_template_from_checklist.py <checklist_file> <template_file> [--output <output_file>]
     
-    If --output is not specified, template file will be updated in-place (with backup).
+    If --output is not specified, template file will be updated in-place (with backup in
+    .proposal_backups/, see 01_skills/shared/backup_store.py).
 """
 
-import re
 import sys
 from pathlib import Path
-from datetime import datetime
+
+# Shared document model and regex registry live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+import patterns
+from backup_store import BackupStore
+from proposal_document import as_document, load_document
+from safe_write import write_atomic
+from proposal_document import parse_checklist_table as parse_checklist_document
 
 def parse_checklist_table(checklist_content):
     """Parse checklist table and extract placeholder IDs with their answers."""
-    # Find the table section
-    table_start = checklist_content.find('| ID |')
-    if table_start == -1:
-        return None, "Checklist table not found"
-    
-    # Extract table lines
-    lines = checklist_content[table_start:].split('\n')
-    table_lines = []
-    for line in lines:
-        line = line.strip()
-        if line.startswith('|') and not line.startswith('|---'):
-            table_lines.append(line)
-    
-    if len(table_lines) < 2:  # Header + at least one data row
-        return None, "Checklist table has no data rows"
-    
-    # Parse header to find column indices
-    header = table_lines[0]
-    columns = [col.strip() for col in header.split('|')[1:-1]]  # Remove empty first/last
-    
-    try:
-        id_col = columns.index('ID')
-        answer_col = columns.index("presale's Answer")
-    except ValueError as e:
-        return None, f"Required columns not found: {e}"
-    
-    # Parse data rows
-    placeholders = {}
-    for row in table_lines[1:]:  # Skip header
-        cells = [cell.strip() for cell in row.split('|')[1:-1]]  # Remove empty first/last
-        if len(cells) > max(id_col, answer_col):
-            placeholder_id = cells[id_col].strip()
-            answer = cells[answer_col].strip()
-            
-            # Remove brackets if present (e.g., [NETWORK_001] -> NETWORK_001)
-            placeholder_id = re.sub(r'[\[\]]', '', placeholder_id)
-            
-            if placeholder_id:
-                placeholders[placeholder_id] = answer
-    
-    return placeholders, None
+    return parse_checklist_document(as_document(checklist_content))
 
-def update_template_from_checklist(checklist_file, template_file, output_file=None):
-    """Update template file based on checklist answers."""
-    # Read checklist
+def load_checklist(checklist_file):
+    """Read and parse a checklist file; returns (True, placeholders) or (False, error message)."""
     checklist_path = Path(checklist_file)
     if not checklist_path.exists():
         return False, f"Checklist file not found: {checklist_file}"
     
-    checklist_content = checklist_path.read_text(encoding='utf-8')
-    placeholders, parse_error = parse_checklist_table(checklist_content)
+    placeholders, parse_error = parse_checklist_table(load_document(checklist_path))
     
     if parse_error:
         return False, f"Failed to parse checklist: {parse_error}"
@@ -79,12 +45,29 @@ def update_template_from_checklist(checklist_file, template_file, output_file=No
     if not placeholders:
         return False, "No placeholders found in checklist"
     
+    return True, placeholders
+
+def update_template_from_checklist(checklist_file, template_file, output_file=None):
+    """Update template file based on checklist answers."""
+    # Read checklist
+    success, result = load_checklist(checklist_file)
+    if not success:
+        return False, result
+    
+    return apply_checklist(result, template_file, output_file)
+
+# apply_checklist() result when the template has none of the checklist's placeholders left
+NO_CHANGES = "No changes made to template (no placeholders found or already processed)"
+
+
+def apply_checklist(placeholders, template_file, output_file=None):
+    """Update template file from already-parsed checklist answers (placeholder ID -> answer)."""
     # Read template
     template_path = Path(template_file)
     if not template_path.exists():
         return False, f"Template file not found: {template_file}"
     
-    template_content = template_path.read_text(encoding='utf-8')
+    template_content = load_document(template_path).content
     original_content = template_content
     
     # Track updates
@@ -93,57 +76,68 @@ def update_template_from_checklist(checklist_file, template_file, output_file=No
         'replaced': [],       # Presale answer provided - replaced
         'not_found': []      # Placeholder in checklist but not in template
     }
+    found = {placeholder_id: [] for placeholder_id in placeholders}
     
-    # Process each placeholder from checklist
-    for placeholder_id, presale_answer in placeholders.items():
-        # Pattern: (estimated value/text) [PLACEHOLDER_ID]
-        # Match the placeholder ID with brackets
-        pattern = rf'([^\[]+?)\s+\[{re.escape(placeholder_id)}\]'
+    def replace_placeholder(match):
+        """Apply the presale answer to one '(estimated value) [PLACEHOLDER_ID]' match"""
+        placeholder_id = match.group('id')
+        if placeholder_id not in placeholders:
+            return match.group(0)
         
-        matches = list(re.finditer(pattern, template_content))
+        # Keep indentation / list marker in front of the estimate, or the text up to
+        # the last markdown link and the whitespace after it
+        value = match.group('value')
+        links = list(patterns.MARKDOWN_LINK.finditer(value))
+        if links:
+            rest = value[links[-1].end():]
+            prefix = value[:len(value) - len(rest.lstrip())]
+        else:
+            prefix = patterns.LIST_MARKER_PREFIX.match(value).group()
+        estimated_value = value[len(prefix):].strip()
+        presale_answer = placeholders[placeholder_id]
         
+        if not presale_answer or not presale_answer.strip():
+            # Empty presale answer → keep estimated value, remove placeholder ID
+            replacement = estimated_value
+            found[placeholder_id].append(('kept_estimate', {
+                'id': placeholder_id,
+                'value': estimated_value
+            }))
+        else:
+            # Presale answer provided → replace with presale answer
+            replacement = presale_answer.strip()
+            found[placeholder_id].append(('replaced', {
+                'id': placeholder_id,
+                'old': estimated_value,
+                'new': presale_answer.strip()
+            }))
+        return prefix + replacement
+    
+    # One pass over the template for all placeholders
+    template_content = patterns.PLACEHOLDER_WITH_VALUE.sub(replace_placeholder, template_content)
+    
+    # Report in checklist order
+    for placeholder_id, matches in found.items():
         if not matches:
             # Placeholder not found in template (may be intentional)
             updates['not_found'].append(placeholder_id)
-            continue
-        
-        for match in matches:
-            estimated_value = match.group(1).strip()
-            full_match = match.group(0)
-            
-            if not presale_answer or not presale_answer.strip():
-                # Empty presale answer → keep estimated value, remove placeholder ID
-                replacement = estimated_value
-                updates['kept_estimate'].append({
-                    'id': placeholder_id,
-                    'value': estimated_value
-                })
-            else:
-                # Presale answer provided → replace with presale answer
-                replacement = presale_answer.strip()
-                updates['replaced'].append({
-                    'id': placeholder_id,
-                    'old': estimated_value,
-                    'new': presale_answer.strip()
-                })
-            
-            # Replace in template content
-            template_content = template_content.replace(full_match, replacement, 1)
+        for kind, entry in matches:
+            updates[kind].append(entry)
     
     # Check if any changes were made
     if template_content == original_content:
-        return False, "No changes made to template (no placeholders found or already processed)"
+        return False, NO_CHANGES
     
     # Write output
     if output_file:
-        output_path = Path(output_file)
-        output_path.write_text(template_content, encoding='utf-8')
+        write_atomic(output_file, template_content)
     else:
-        # Create backup before updating in-place
-        backup_path = template_path.with_suffix(f'.backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.md')
-        backup_path.write_text(original_content, encoding='utf-8')
-        template_path.write_text(template_content, encoding='utf-8')
-        print(f"📦 Backup created: {backup_path.name}")
+        # Back up before updating in-place (identical versions are stored once)
+        backup = BackupStore.for_file(template_path).backup(template_path, original_content)
+        write_atomic(template_path, template_content)
+        state = "created" if backup["new"] else "unchanged since last backup"
+        print(f"📦 Backup {state}: {backup['object'][:12]} "
+              f"(restore: python3 01_skills/shared/backup_store.py restore {template_path.name})")
     
     return True, updates
 
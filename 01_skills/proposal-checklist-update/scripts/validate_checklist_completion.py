@@ -11,59 +11,53 @@ Usage:
     python validate_checklist_completion.py <checklist_file> [template_file]
 """
 
-import re
 import sys
 from pathlib import Path
 
+# Shared document model lives in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+from proposal_document import as_document, load_document
+from proposal_document import parse_checklist_table as parse_checklist_document
+from template_validator import Rule, TemplateValidator
+
+class ChecklistCoverageRule(Rule):
+    """Compare the template's placeholders with the IDs answered in the checklist"""
+
+    def __init__(self, checklist_ids):
+        self.checklist_ids = set(checklist_ids)
+
+    def begin(self, document):
+        super().begin(document)
+        self.template_placeholders = set()
+
+    def on_placeholder(self, token):
+        self.template_placeholders.add(token.value)
+
+    def finish(self):
+        template_placeholders = self.template_placeholders
+        
+        # Find placeholders in template but not in checklist
+        missing_in_checklist = template_placeholders - self.checklist_ids
+        if missing_in_checklist:
+            self.warnings.append(f"⚠️  Found {len(missing_in_checklist)} placeholder(s) in template but not in checklist:")
+            for pid in list(missing_in_checklist)[:10]:
+                self.warnings.append(f"   - {pid}")
+            if len(missing_in_checklist) > 10:
+                self.warnings.append(f"   ... and {len(missing_in_checklist) - 10} more")
+        
+        # Find placeholders in checklist but not in template (may be intentional)
+        extra_in_checklist = self.checklist_ids - template_placeholders
+        if extra_in_checklist:
+            self.warnings.append(f"⚠️  Found {len(extra_in_checklist)} placeholder(s) in checklist but not in template (may be intentional)")
+
 def extract_placeholders_from_template(template_content):
     """Extract all placeholder IDs from template file."""
-    placeholder_pattern = r'\[([A-Z_]+\d+)\]'
-    placeholders = set(re.findall(placeholder_pattern, template_content))
-    return placeholders
+    return as_document(template_content).placeholder_ids()
 
 def parse_checklist_table(checklist_content):
     """Parse checklist table and extract placeholder IDs with their answers."""
-    # Find the table section
-    table_start = checklist_content.find('| ID |')
-    if table_start == -1:
-        return None, "Checklist table not found"
-    
-    # Extract table lines
-    lines = checklist_content[table_start:].split('\n')
-    table_lines = []
-    for line in lines:
-        line = line.strip()
-        if line.startswith('|') and not line.startswith('|---'):
-            table_lines.append(line)
-    
-    if len(table_lines) < 2:  # Header + at least one data row
-        return None, "Checklist table has no data rows"
-    
-    # Parse header to find column indices
-    header = table_lines[0]
-    columns = [col.strip() for col in header.split('|')[1:-1]]  # Remove empty first/last
-    
-    try:
-        id_col = columns.index('ID')
-        answer_col = columns.index("presale's Answer")
-    except ValueError as e:
-        return None, f"Required columns not found: {e}"
-    
-    # Parse data rows
-    placeholders = {}
-    for row in table_lines[1:]:  # Skip header
-        cells = [cell.strip() for cell in row.split('|')[1:-1]]  # Remove empty first/last
-        if len(cells) > max(id_col, answer_col):
-            placeholder_id = cells[id_col].strip()
-            answer = cells[answer_col].strip()
-            
-            # Remove brackets if present (e.g., [NETWORK_001] -> NETWORK_001)
-            placeholder_id = re.sub(r'[\[\]]', '', placeholder_id)
-            
-            if placeholder_id:
-                placeholders[placeholder_id] = answer
-    
-    return placeholders, None
+    return parse_checklist_document(as_document(checklist_content))
 
 def validate_checklist_completion(checklist_file, template_file=None):
     """Validate that checklist is complete."""
@@ -75,10 +69,10 @@ def validate_checklist_completion(checklist_file, template_file=None):
         errors.append(f"❌ Checklist file not found: {checklist_file}")
         return errors, warnings
     
-    checklist_content = checklist_path.read_text(encoding='utf-8')
+    checklist_document = load_document(checklist_path)
     
     # Parse checklist table
-    placeholders, parse_error = parse_checklist_table(checklist_content)
+    placeholders, parse_error = parse_checklist_table(checklist_document)
     if parse_error:
         errors.append(f"❌ Failed to parse checklist: {parse_error}")
         return errors, warnings
@@ -104,22 +98,9 @@ def validate_checklist_completion(checklist_file, template_file=None):
     if template_file:
         template_path = Path(template_file)
         if template_path.exists():
-            template_content = template_path.read_text(encoding='utf-8')
-            template_placeholders = extract_placeholders_from_template(template_content)
-            
-            # Find placeholders in template but not in checklist
-            missing_in_checklist = template_placeholders - set(placeholders.keys())
-            if missing_in_checklist:
-                warnings.append(f"⚠️  Found {len(missing_in_checklist)} placeholder(s) in template but not in checklist:")
-                for pid in list(missing_in_checklist)[:10]:
-                    warnings.append(f"   - {pid}")
-                if len(missing_in_checklist) > 10:
-                    warnings.append(f"   ... and {len(missing_in_checklist) - 10} more")
-            
-            # Find placeholders in checklist but not in template (may be intentional)
-            extra_in_checklist = set(placeholders.keys()) - template_placeholders
-            if extra_in_checklist:
-                warnings.append(f"⚠️  Found {len(extra_in_checklist)} placeholder(s) in checklist but not in template (may be intentional)")
+            # Placeholders in the template, collected in one pass
+            coverage = TemplateValidator([ChecklistCoverageRule(placeholders.keys())])
+            warnings.extend(coverage.validate(load_document(template_path))[1])
     
     return errors, warnings
 
@@ -9,16 +9,49 @@ Usage:
     python validate_no_placeholders.py <template_file>
 """
 
-import re
 import sys
 from pathlib import Path
 
+# Shared document model lives in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+from proposal_document import as_document, load_document
+from template_validator import Rule, TemplateValidator
+
+class RemainingPlaceholdersRule(Rule):
+    """After the checklist has been applied, every placeholder left in the template is an error"""
+
+    def begin(self, document):
+        super().begin(document)
+        # Line numbers where each placeholder appears
+        self.placeholder_lines = {}
+
+    def on_placeholder(self, token):
+        self.placeholder_lines.setdefault(token.value, set()).add(self.document.line_number(token.start))
+
+    def finish(self):
+        placeholders = self.placeholder_lines
+        if placeholders:
+            self.errors.append(f"❌ Found {len(placeholders)} placeholder(s) still remaining in template:")
+            for pid in sorted(placeholders)[:20]:  # Show first 20
+                line_numbers = sorted(placeholders[pid])
+                self.errors.append(f"   - [{pid}] (lines: {', '.join(map(str, line_numbers[:5]))})")
+            if len(placeholders) > 20:
+                self.errors.append(f"   ... and {len(placeholders) - 20} more")
+            
+            self.errors.append("\n⚠️  ACTION REQUIRED:")
+            self.errors.append("   1. Presale team must review checklist and provide answers")
+            self.errors.append("   2. Update template file by replacing placeholders with confirmed values")
+            self.errors.append("   3. Run this validation again to confirm all placeholders are removed")
+        else:
+            self.warnings.append("✅ No placeholders found in template - ready for next step!")
+
+NO_PLACEHOLDERS_VALIDATOR = TemplateValidator([RemainingPlaceholdersRule])
+
 def find_placeholders(content):
     """Find all placeholders in template content."""
     # Pattern: [Estimated Value] [PLACEHOLDER_ID]
-    placeholder_pattern = r'\[([A-Z_]+\d+)\]'
-    placeholders = re.findall(placeholder_pattern, content)
-    return set(placeholders)
+    return as_document(content).placeholder_ids()
 
 def validate_no_placeholders(template_file):
     """Validate that template has no placeholders."""
@@ -30,33 +63,8 @@ def validate_no_placeholders(template_file):
         errors.append(f"❌ Template file not found: {template_file}")
         return errors, warnings
     
-    template_content = template_path.read_text(encoding='utf-8')
-    
-    # Find all placeholders
-    placeholders = find_placeholders(template_content)
-    
-    if placeholders:
-        errors.append(f"❌ Found {len(placeholders)} placeholder(s) still remaining in template:")
-        for pid in sorted(placeholders)[:20]:  # Show first 20
-            # Find line numbers where placeholder appears
-            lines = template_content.split('\n')
-            line_numbers = []
-            for i, line in enumerate(lines, 1):
-                if f'[{pid}]' in line:
-                    line_numbers.append(i)
-            if line_numbers:
-                errors.append(f"   - [{pid}] (lines: {', '.join(map(str, line_numbers[:5]))})")
-        if len(placeholders) > 20:
-            errors.append(f"   ... and {len(placeholders) - 20} more")
-        
-        errors.append("\n⚠️  ACTION REQUIRED:")
-        errors.append("   1. Presale team must review checklist and provide answers")
-        errors.append("   2. Update template file by replacing placeholders with confirmed values")
-        errors.append("   3. Run this validation again to confirm all placeholders are removed")
-    else:
-        warnings.append("✅ No placeholders found in template - ready for next step!")
-    
-    return errors, warnings
+    # Find all placeholders in one pass over the template
+    return NO_PLACEHOLDERS_VALIDATOR.validate(load_document(template_path))
 
 def main():
     if len(sys.argv) < 2:
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Verify which text update_template_from_checklist treats as the estimate of a placeholder
+
+The estimate runs back from "[ID]" to the nearest boundary: line start (after
+indentation / a list marker), a "**Label:**", a table cell, or a complete
+markdown link. Covers the SKILL.md examples and each boundary, with an empty
+presale answer (estimate kept) and a filled one (estimate replaced).
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'scripts'))
+
+from update_template_from_checklist import apply_checklist
+
+# (description, template line, {ID: presale answer}, expected line, expected estimates kept)
+CASES = [
+    ("SKILL.md example 1: list item, answer empty",
+     "- **External bandwidth:** 20 Mbps [NETWORK_001]", {"NETWORK_001": ""},
+     "- **External bandwidth:** 20 Mbps", ["20 Mbps"]),
+    ("SKILL.md example 2: list item, answer given",
+     "- **External bandwidth:** 20 Mbps [NETWORK_001]", {"NETWORK_001": "50 Mbps"},
+     "- **External bandwidth:** 50 Mbps", []),
+    ("SKILL.md example 3: bold label on a plain line",
+     "**Project Duration:** Implementation within 3-4 weeks once project is awarded [TIMELINE_001]",
+     {"TIMELINE_001": ""},
+     "**Project Duration:** Implementation within 3-4 weeks once project is awarded",
+     ["Implementation within 3-4 weeks once project is awarded"]),
+    ("plain list item", "  - 20 Mbps [NETWORK_001]", {"NETWORK_001": "50 Mbps"}, "  - 50 Mbps", []),
+    ("label without bold", "Ratio: 5 * 2 [CALC_002]", {"CALC_002": "99"}, "Ratio: 99", []),
+    ("single '*' is part of the estimate", "Ratio 5 * 2 [CALC_001]", {"CALC_001": "99"}, "99", []),
+    ("table cell", "| Cameras | 20 [CAM_001] |", {"CAM_001": "30"}, "| Cameras | 30 |", []),
+    ("table cell, answer empty", "| Cameras | 20 [CAM_001] |", {"CAM_001": ""}, "| Cameras | 20 |", ["20"]),
+    ("link before the value", "See [docs](http://x) 4 hours [TIME_001]", {"TIME_001": "8 hours"},
+     "See [docs](http://x) 8 hours", []),
+    ("link inside a label", "- **Storage ([sizing](http://s)):** 2 TB [STORAGE_001]", {"STORAGE_001": "4 TB"},
+     "- **Storage ([sizing](http://s)):** 4 TB", []),
+    ("two placeholders on one line",
+     "**Timeline:** 4 weeks [T_1], see [plan](http://p) 2 weeks [T_2]", {"T_1": "6 weeks", "T_2": ""},
+     "**Timeline:** 6 weeks, see [plan](http://p) 2 weeks", ["2 weeks"]),
+]
+
+
+def check(description, line, answers, expected, kept) -> list:
+    """Errors of one case (empty when it holds)"""
+    with tempfile.TemporaryDirectory() as work:
+        template = Path(work) / 'case_template.md'
+        output = Path(work) / 'case_output.md'
+        template.write_text(line + '\n', encoding='utf-8')
+        success, result = apply_checklist(answers, template, output)
+        if not success:
+            return [f"{description}: {result}"]
+        actual = output.read_text(encoding='utf-8').rstrip('\n')
+
+    errors = []
+    if actual != expected:
+        errors.append(f"{description}:\n     got      {actual!r}\n     expected {expected!r}")
+    kept_values = [item['value'] for item in result['kept_estimate']]
+    if kept_values != kept:
+        errors.append(f"{description}: kept estimates {kept_values}, expected {kept}")
+    return errors
+
+
+def main():
+    errors = []
+    for case in CASES:
+        errors.extend(check(*case))
+
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        print(f"\n❌ {len(errors)} error(s) in {len(CASES)} cases")
+        sys.exit(1)
+    print(f"✅ {len(CASES)} placeholder estimates spanned as documented")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,59 +2,370 @@
 """
 Extract data from Deal Transfer Excel file.
 
+The workbook is opened once in read-only mode and only the Commercial (S1)
+and Technical (S2) sheets are read; their rows are streamed straight into
+the JSON output instead of being loaded into DataFrames first.
+
+The default backend parses the xlsx zip/XML directly (xlsx_reader.py,
+standard library only). openpyxl is used only with --backend openpyxl, and
+pandas only when DataFrames are requested via load_dataframes().
+
+Extracted sheets are cached column-wise in a sidecar file next to the
+workbook (.<name>.xlsx.dtcache), reused while the workbook's mtime and size
+are unchanged; --no-cache ignores the sidecar and rebuilds it.
+
 Usage:
-    python extract_deal_transfer.py <excel_file>
+    python extract_deal_transfer.py <excel_file> [--backend xml|openpyxl] [--no-cache]
 
 Output:
     JSON with S1 and S2 data
 """
 
-import pandas as pd
+import argparse
+import datetime
 import json
+import math
+import os
 import sys
+from contextlib import contextmanager
+from collections.abc import Iterator
 from pathlib import Path
 
-def extract_deal_transfer(excel_path):
-    """Extract S1 and S2 sheets from Deal Transfer."""
+# Add script directory to path to import xlsx_reader
+sys.path.insert(0, str(Path(__file__).parent))
+# Shared utilities live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+from xlsx_reader import XlsxReader
+from safe_write import write_atomic
+
+# Output key -> worksheet name
+SHEETS = {'S1': 'Commercial', 'S2': 'Technical'}
+
+# Empty cells are reported as NaN, as pandas.read_excel did
+EMPTY = float('nan')
+
+# Bump when the extracted values or the sidecar layout change to invalidate existing caches
+CACHE_VERSION = 2
+CACHE_SUFFIX = '.dtcache'
+
+
+def _is_empty(value):
+    return value is None or value == ''
+
+
+def _add_column(columns, value):
+    """Append the label for the next column: a blank becomes 'Unnamed: i', a repeat gets a '.n' suffix"""
+    name = base = f'Unnamed: {len(columns)}' if _is_empty(value) else value
+    count = 0
+    while name in columns:
+        count += 1
+        name = f'{base}.{count}'
+    columns.append(name)
+
+
+def _column_names(header):
+    """Column labels for a header row"""
+    columns = []
+    for value in header:
+        _add_column(columns, value)
+    return columns
+
+
+def _trim(row):
+    """Row values without trailing empty cells"""
+    end = len(row)
+    while end and _is_empty(row[end - 1]):
+        end -= 1
+    return row[:end]
+
+
+def _cell(value):
+    """Cell value as pandas.read_excel reports it: empty -> NaN, whole floats -> int"""
+    if _is_empty(value):
+        return EMPTY
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class OpenpyxlReader:
+    """openpyxl read-only workbook behind the XlsxReader interface"""
+
+    def __init__(self, path):
+        from openpyxl import load_workbook
+
+        self._workbook = load_workbook(path, read_only=True, data_only=True)
+        self.sheetnames = self._workbook.sheetnames
+
+    def close(self):
+        self._workbook.close()
+
+    def iter_rows(self, sheet_name):
+        if sheet_name not in self.sheetnames:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        worksheet = self._workbook[sheet_name]
+        # Ignore a stale <dimension> tag so the used range comes from the cells themselves
+        worksheet.reset_dimensions()
+        return worksheet.iter_rows(values_only=True)
+
+
+BACKENDS = {'xml': XlsxReader, 'openpyxl': OpenpyxlReader}
+
+
+def read_sheet(rows):
+    """
+    Read one sheet's row iterator as (columns, records)
+
+    The header row is read immediately; records is a generator that reads the
+    remaining rows on demand. Blank rows between data rows are kept (all values
+    empty), trailing blank rows are dropped. A row wider than the header adds
+    'Unnamed: i' columns, as pandas does: columns is extended in place while
+    the records are read, and rows read before it lack those keys.
+    """
+    rows = iter(rows)
+    columns = _column_names(_trim(next(rows, ())))
+
+    def records():
+        pending_blank = 0
+        for row in rows:
+            values = _trim(row)
+            if not values:
+                pending_blank += 1
+                continue
+            for _ in range(pending_blank):
+                yield dict.fromkeys(columns, EMPTY)
+            pending_blank = 0
+
+            while len(columns) < len(values):
+                _add_column(columns, None)
+            record = {columns[i]: _cell(value) for i, value in enumerate(values)}
+            for name in columns[len(values):]:
+                record[name] = EMPTY
+            yield record
+
+    return columns, records()
+
+
+def cache_path(excel_path):
+    """Sidecar cache file for a workbook: .<name>.dtcache in the same directory"""
+    excel_path = Path(excel_path)
+    return excel_path.with_name(f'.{excel_path.name}{CACHE_SUFFIX}')
+
+
+# Values JSON cannot hold are stored as {"$": type tag, "v": value}; a key a record lacks as {"$": "absent"}
+ABSENT = {'$': 'absent'}
+TEMPORAL_TYPES = [
+    ('datetime', datetime.datetime, datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    ('date', datetime.date, datetime.date.isoformat, datetime.date.fromisoformat),
+    ('time', datetime.time, datetime.time.isoformat, datetime.time.fromisoformat),
+    ('timedelta', datetime.timedelta, datetime.timedelta.total_seconds, lambda v: datetime.timedelta(seconds=v)),
+]
+DECODERS = {tag: decode for tag, _, _, decode in TEMPORAL_TYPES}
+
+
+def _encode(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    for tag, value_type, encode, _ in TEMPORAL_TYPES:
+        if isinstance(value, value_type):
+            return {'$': tag, 'v': encode(value)}
+    return value
+
+
+def _decode(value):
+    if value is None:
+        return EMPTY
+    if isinstance(value, dict):
+        return DECODERS[value['$']](value['v'])
+    return value
+
+
+def _to_columns(columns, records):
+    """One sheet in columnar layout: the record keys once, then one value list per key"""
+    fields = list(dict.fromkeys(key for record in records for key in record))
+    return {
+        'columns': [_encode(name) for name in columns],
+        'fields': [_encode(name) for name in fields],
+        'rows': len(records),
+        'values': [[_encode(record[field]) if field in record else ABSENT for record in records]
+                   for field in fields],
+    }
+
+
+def _from_columns(sheet):
+    """Inverse of _to_columns: (columns, records)"""
+    fields = [_decode(name) for name in sheet['fields']]
+    values = [[value if value == ABSENT else _decode(value) for value in column] for column in sheet['values']]
+    records = []
+    for i in range(sheet['rows']):
+        records.append({field: column[i] for field, column in zip(fields, values) if column[i] != ABSENT})
+    return [_decode(name) for name in sheet['columns']], records
+
+
+def _stat_key(stat):
+    return {'version': CACHE_VERSION, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def load_cached(excel_path, stat):
+    """Cached extraction result for the workbook, or None if missing or stale"""
     try:
-        xls = pd.ExcelFile(excel_path)
-        
-        # Read S1 and S2 sheets
-        s1 = pd.read_excel(excel_path, sheet_name='Commercial')
-        s2 = pd.read_excel(excel_path, sheet_name='Technical')
-        
-        # Convert to dict for easier access
-        result = {
-            'sheets': xls.sheet_names,
-            'S1': {
-                'columns': s1.columns.tolist(),
-                'data': s1.to_dict('records')
-            },
-            'S2': {
-                'columns': s2.columns.tolist(),
-                'data': s2.to_dict('records')
-            }
-        }
-        
+        cached = json.loads(cache_path(excel_path).read_text(encoding='utf-8'))
+        if cached['key'] != _stat_key(stat):
+            return None
+        result = {'sheets': cached['sheets']}
+        for key in SHEETS:
+            columns, records = _from_columns(cached[key])
+            result[key] = {'data': records, 'columns': columns}
         return result
-    except FileNotFoundError:
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_cached(excel_path, stat, result):
+    """Write the sidecar cache atomically; silently skipped if the directory is not writable"""
+    cached = {'key': _stat_key(stat), 'sheets': result['sheets']}
+    for key in SHEETS:
+        cached[key] = _to_columns(result[key]['columns'], result[key]['data'])
+
+    try:
+        write_atomic(cache_path(excel_path), json.dumps(cached, separators=(',', ':'), ensure_ascii=False))
+    except (OSError, TypeError, ValueError):
+        pass  # e.g. a read-only directory: the next run reads the workbook again
+
+
+def _collect(records, rows, done):
+    """Pass records through, keeping a copy; done is set once the sheet has been read to the end"""
+    for record in records:
+        rows.append(record)
+        yield record
+    done.append(True)
+
+
+@contextmanager
+def open_deal_transfer(excel_path, backend='xml', use_cache=True):
+    """
+    Open a Deal Transfer workbook once and yield its extraction result
+
+    The result has the same shape as extract_deal_transfer(), except that
+    S1/S2 'data' are generators reading rows from the open workbook; consume
+    them before the with-block ends. A fresh sidecar cache is served instead
+    when use_cache is set; otherwise, once both sheets have been read in full,
+    the rows are written to the sidecar cache.
+    """
+    stat = os.stat(excel_path)
+    if use_cache:
+        cached = load_cached(excel_path, stat)
+        if cached:
+            yield cached
+            return
+
+    workbook = BACKENDS[backend](excel_path)
+    collected = {}
+    done = []
+    try:
+        result = {'sheets': workbook.sheetnames}
+        for key, sheet_name in SHEETS.items():
+            if sheet_name not in workbook.sheetnames:
+                raise ValueError(f"Worksheet named '{sheet_name}' not found")
+            columns, records = read_sheet(workbook.iter_rows(sheet_name))
+            collected[key] = {'columns': columns, 'data': []}
+            # 'columns' after 'data': rows wider than the header extend it while they stream out
+            result[key] = {'data': _collect(records, collected[key]['data'], done), 'columns': columns}
+        yield result
+    finally:
+        workbook.close()
+
+    if len(done) == len(SHEETS):
+        save_cached(excel_path, stat, {'sheets': result['sheets'], **collected})
+
+
+def _error_result(excel_path, error):
+    if isinstance(error, FileNotFoundError):
         return {'error': f'File not found: {excel_path}'}
-    except ValueError as e:
-        return {'error': f'Sheet not found: {str(e)}'}
+    if isinstance(error, ValueError):
+        return {'error': f'Sheet not found: {str(error)}'}
+    return {'error': f'Error reading file: {str(error)}'}
+
+
+def extract_deal_transfer(excel_path, backend='xml', use_cache=True):
+    """Extract S1 and S2 sheets from Deal Transfer."""
+    try:
+        with open_deal_transfer(excel_path, backend, use_cache) as result:
+            for key in SHEETS:
+                result[key]['data'] = list(result[key]['data'])
+        return result
     except Exception as e:
-        return {'error': f'Error reading file: {str(e)}'}
+        return _error_result(excel_path, e)
 
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: extract_deal_transfer.py <excel_file>")
-        sys.exit(1)
-    
-    excel_file = sys.argv[1]
-    result = extract_deal_transfer(excel_file)
-    
-    if 'error' in result:
-        print(f"Error: {result['error']}", file=sys.stderr)
+
+def load_dataframes(excel_path, backend='xml', use_cache=True):
+    """
+    Extract S1 and S2 as pandas DataFrames (pandas is imported only here)
+
+    Returns:
+        {'S1': DataFrame, 'S2': DataFrame}; raises on unreadable files
+    """
+    import pandas as pd
+
+    with open_deal_transfer(excel_path, backend, use_cache) as result:
+        frames = {key: pd.DataFrame(list(result[key]['data']), columns=result[key]['columns'])
+                  for key in SHEETS}
+    return frames
+
+
+def _json_key(key):
+    """The string json.dumps uses for a dict key"""
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return str(key)
+
+
+def write_json(value, out, level=0):
+    """
+    Write value like json.dump(value, out, indent=2, default=str), but also accept
+    iterators (written item by item as they are produced) in place of lists
+    """
+    pad = '  ' * (level + 1)
+    if isinstance(value, dict):
+        items = iter(value.items())
+        open_char, close_char = '{', '}'
+    elif isinstance(value, (list, tuple, Iterator)):
+        items = iter(value)
+        open_char, close_char = '[', ']'
+    else:
+        out.write(json.dumps(value, default=str))
+        return
+
+    first = True
+    for item in items:
+        out.write(f'{open_char}\n{pad}' if first else f',\n{pad}')
+        first = False
+        if open_char == '{':
+            key, item = item
+            out.write(f'{json.dumps(_json_key(key))}: ')
+        write_json(item, out, level + 1)
+    out.write(f'{open_char}{close_char}' if first else f'\n{"  " * level}{close_char}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract S1 and S2 sheets from a Deal Transfer Excel file as JSON')
+    parser.add_argument('excel_file', help='Deal Transfer .xlsx file')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='xml',
+                        help='Workbook reader (default: xml, standard library only)')
+    parser.add_argument('--no-cache', action='store_true', help='Re-read the workbook even if its sidecar cache is fresh')
+    args = parser.parse_args()
+
+    try:
+        with open_deal_transfer(args.excel_file, args.backend, not args.no_cache) as result:
+            write_json(result, sys.stdout)
+            print()
+    except Exception as e:
+        print(f"Error: {_error_result(args.excel_file, e)['error']}", file=sys.stderr)
         sys.exit(1)
-    
-    print(json.dumps(result, indent=2, default=str))
 
+
+if __name__ == '__main__':
+    main()
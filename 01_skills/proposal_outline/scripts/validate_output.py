@@ -4,126 +4,216 @@ Validate generated proposal files.
 
 Usage:
     python validate_output.py <template_file> [reasoning_file] [checklist_file]
+    python validate_output.py --bundles <dir|glob|template> [...] [--workers N]
+
+With --bundles, every [Project_Name]_template.md found (directories are searched
+recursively) is validated together with its _reasoning.md / _checklist.md
+siblings across a process pool. Results stream to stdout as JSON lines, one per
+file plus a final summary line; the exit code is 1 if any file has errors or
+could not be validated.
 """
 
-import re
+import argparse
+import glob
+import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+# Shared document model and regex registry live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+import patterns
+from proposal_document import load_document
+from template_validator import Rule, TemplateValidator, template_validator
+
+class ReasoningReferencesRule(Rule):
+    """Reasoning files should cite S1/S2 and the template content they explain"""
+    triggers = ('s1', 's2', '**content in template**:')
+
+    def begin(self, document):
+        super().begin(document)
+        self.source_reference = False
+        self.template_reference = False
+
+    def on_trigger(self, token):
+        content = self.document.content
+        if token.value == '**content in template**:':
+            self.template_reference = self.template_reference or bool(
+                patterns.TEMPLATE_CONTENT_REFERENCE.match(content, token.start))
+        elif not self.source_reference:
+            self.source_reference = bool(patterns.SOURCE_REFERENCE.match(content, token.start))
+
+    def finish(self):
+        # Should contain source references
+        if not self.source_reference:
+            self.warnings.append("⚠️  Reasoning file should contain S1/S2 references")
+        # Should contain "Content in Template" sections
+        if not self.template_reference:
+            self.warnings.append("⚠️  Reasoning file should reference template content")
+
+class ChecklistFormatRule(Rule):
+    """Checklists need the ID/Section table and at least one placeholder ID"""
+
+    def begin(self, document):
+        super().begin(document)
+        self.has_placeholders = False
+
+    def on_placeholder(self, token):
+        self.has_placeholders = True
+
+    def finish(self):
+        content = self.document.content
+        # Should contain table with correct columns
+        if '| ID |' not in content or '| Section |' not in content:
+            self.errors.append("❌ Checklist missing required table columns")
+        # Should have placeholder IDs
+        if not self.has_placeholders:
+            self.warnings.append("⚠️  No placeholder IDs found in checklist")
+
+# Built once per process: template rules plus PROPOSAL_VALIDATOR_PLUGINS
+TEMPLATE_VALIDATOR = template_validator()
+REASONING_VALIDATOR = TemplateValidator([ReasoningReferencesRule])
+CHECKLIST_VALIDATOR = TemplateValidator([ChecklistFormatRule])
+
 def validate_template(content):
-    """Check template file format."""
-    errors = []
-    warnings = []
-    
-    # Check for source references (should not exist)
-    if re.search(r'S[12]\s*-\s*["\']', content):
-        errors.append("❌ Template contains source references (S1/S2)")
-    
-    # Check for reasoning text (more specific patterns to avoid false positives)
-    reasoning_patterns = [
-        r'Based on\s+S[12]',  # "Based on S1" or "Based on S2"
-        r'Logic:\s*[A-Z]',     # "Logic: ..."
-        r'Calculated as\s*\d',  # "Calculated as 123"
-        r'Extracted from\s+S[12]',  # "Extracted from S1"
-        r'Source:\s*S[12]',     # "Source: S1"
-        r'From\s+KB\s',         # "From KB ..."
-    ]
-    for pattern in reasoning_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            errors.append(f"❌ Template contains reasoning text (matched: {pattern})")
-            break
-    
-    # Check placeholder format
-    # Pattern: Any text (including numbers, spaces, operators) followed by [PLACEHOLDER_ID]
-    # Match only the placeholder part, not the whole line
-    placeholder_pattern = r'([^\[\]\n]+?)\s+\[([A-Z_]+\d+)\]'
-    placeholder_matches = re.findall(placeholder_pattern, content)
-    
-    if not placeholder_matches:
-        warnings.append("⚠️  No placeholders found (may be intentional if all values confirmed)")
-    else:
-        # Validate placeholder format - check each placeholder
-        for value_part, placeholder_id in placeholder_matches:
-            # Value part should not be empty
-            if not value_part.strip():
-                errors.append(f"❌ Empty value before placeholder: [{placeholder_id}]")
-            # Placeholder ID should match pattern
-            if not re.match(r'[A-Z_]+\d+', placeholder_id):
-                errors.append(f"❌ Invalid placeholder ID format: [{placeholder_id}]")
-        
-        # Check for placeholders with explanations after them (should be in parentheses or separate clause)
-        # This is acceptable: "30 Mbps [NETWORK_001] (for remote access)"
-        # But catch obvious errors like placeholders in wrong position
-    
-    # Check for empty sections
-    # Find all ## headings and check if any have no content before next ## heading
-    headings = list(re.finditer(r'^(##\s+.+?)$', content, re.MULTILINE))
-    empty_sections = []
-    for i, match in enumerate(headings):
-        start = match.end()
-        # Get content until next ## heading or EOF
-        if i + 1 < len(headings):
-            end = headings[i+1].start()
-            section_content = content[start:end]
-        else:
-            section_content = content[start:]
-        # Remove whitespace and horizontal rules (---)
-        cleaned = re.sub(r'^---+?\s*$', '', section_content, flags=re.MULTILINE).strip()
-        if not cleaned:
-            empty_sections.append(match.group(1))
-    
-    if empty_sections:
-        warnings.append(f"⚠️  Found {len(empty_sections)} empty section(s): {', '.join(empty_sections[:3])}")
-    
-    return errors, warnings
+    """Check template file format (source references, reasoning text, placeholders, empty sections)."""
+    return TEMPLATE_VALIDATOR.validate(content)
 
 def validate_reasoning(content):
     """Check reasoning file format."""
-    errors = []
-    warnings = []
-    
-    # Should contain source references
-    if not re.search(r'S[12]\s*-\s*["\']', content):
-        warnings.append("⚠️  Reasoning file should contain S1/S2 references")
-    
-    # Should contain "Content in Template" sections
-    if not re.search(r'\*\*Content in Template\*\*:', content):
-        warnings.append("⚠️  Reasoning file should reference template content")
-    
-    return errors, warnings
+    return REASONING_VALIDATOR.validate(content)
 
 def validate_checklist(content):
     """Check checklist file format."""
-    errors = []
-    warnings = []
+    return CHECKLIST_VALIDATOR.validate(content)
+
+# Bundle file names: [Project_Name]_template.md, _reasoning.md, _checklist.md
+BUNDLE_SUFFIXES = {"template": "_template.md", "reasoning": "_reasoning.md", "checklist": "_checklist.md"}
+VALIDATORS = {"template": validate_template, "reasoning": validate_reasoning, "checklist": validate_checklist}
+
+def collect_bundles(inputs):
+    """Expand directories (recursively), glob patterns and template paths into template/reasoning/checklist bundles"""
+    templates = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = path.rglob('*' + BUNDLE_SUFFIXES["template"])
+        elif path.exists():
+            # Named explicitly: a template even without the usual suffix
+            templates.add(path.resolve())
+            continue
+        else:
+            candidates = (Path(p) for p in glob.glob(item, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file() and candidate.name.endswith(BUNDLE_SUFFIXES["template"]):
+                templates.add(candidate.resolve())
+    
+    bundles = []
+    for template in sorted(templates):
+        name = template.name
+        prefix = name[:-len(BUNDLE_SUFFIXES["template"])] if name.endswith(BUNDLE_SUFFIXES["template"]) else template.stem
+        bundle = {"bundle": str(template.parent / prefix), "template": str(template)}
+        for kind in ("reasoning", "checklist"):
+            sibling = template.parent / (prefix + BUNDLE_SUFFIXES[kind])
+            if sibling.is_file():
+                bundle[kind] = str(sibling)
+        bundles.append(bundle)
+    return bundles
+
+def _validate_files(tasks):
+    """Worker: validate a chunk of (bundle, kind, file) tasks"""
+    records = []
+    for bundle, kind, file in tasks:
+        started = time.perf_counter()
+        record = {"bundle": bundle, "kind": kind, "file": file}
+        try:
+            errors, warnings = VALIDATORS[kind](load_document(file))
+            record.update({
+                "status": "error" if errors else "warning" if warnings else "ok",
+                "errors": errors,
+                "warnings": warnings,
+            })
+        except Exception as e:
+            record.update({"status": "failed", "errors": [f"❌ Could not validate: {type(e).__name__}: {e}"], "warnings": []})
+        record["seconds"] = round(time.perf_counter() - started, 4)
+        records.append(record)
+    return records
+
+def validate_bundles(bundles, workers=None, out=None):
+    """
+    Validate every file of every bundle across a process pool
     
-    # Should contain table with correct columns
-    if '| ID |' not in content or '| Section |' not in content:
-        errors.append("❌ Checklist missing required table columns")
+    Writes one JSON line per file to out (default: stdout) as results arrive,
+    then a summary line. Returns the summary dict.
+    """
+    out = out or sys.stdout
+    started = time.perf_counter()
+    tasks = [(bundle["bundle"], kind, bundle[kind]) for bundle in bundles for kind in VALIDATORS if kind in bundle]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    # Files validate in well under a millisecond, so hand them to workers in chunks
+    chunk_size = max(1, len(tasks) // (workers * 4))
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
     
-    # Should have placeholder IDs
-    placeholder_ids = re.findall(r'\[([A-Z_]+\d+)\]', content)
-    if not placeholder_ids:
-        warnings.append("⚠️  No placeholder IDs found in checklist")
+    counts = {"ok": 0, "warning": 0, "error": 0, "failed": 0}
+    failed_bundles = set()
+    if chunks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(_validate_files, chunk) for chunk in chunks]):
+                for record in future.result():
+                    counts[record["status"]] += 1
+                    if record["status"] in ("error", "failed"):
+                        failed_bundles.add(record["bundle"])
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
     
-    return errors, warnings
+    summary = {
+        "summary": True,
+        "bundles": len(bundles),
+        "files": len(tasks),
+        **counts,
+        "failed_bundles": sorted(failed_bundles),
+        "workers": workers,
+        "elapsed_seconds": round(time.perf_counter() - started, 4),
+    }
+    out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    out.flush()
+    return summary
 
 def main():
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description='Validate generated proposal files')
+    parser.add_argument('files', nargs='*', help='<template_file> [reasoning_file] [checklist_file]')
+    parser.add_argument('--bundles', nargs='+', metavar='PATH',
+                        help='Validate every bundle under these directories / globs / template files (JSON lines output)')
+    parser.add_argument('--workers', '-w', type=int, help='Number of worker processes with --bundles (default: CPU count)')
+    args = parser.parse_args()
+    
+    if args.bundles:
+        if args.files:
+            parser.error('give either files or --bundles')
+        bundles = collect_bundles(args.bundles)
+        if not bundles:
+            print("❌ No proposal bundles found", file=sys.stderr)
+            sys.exit(1)
+        summary = validate_bundles(bundles, args.workers)
+        sys.exit(1 if summary["error"] or summary["failed"] else 0)
+    
+    if not args.files:
         print("Usage: validate_output.py <template_file> [reasoning_file] [checklist_file]")
         sys.exit(1)
     
-    template_file = Path(sys.argv[1])
-    reasoning_file = Path(sys.argv[2]) if len(sys.argv) > 2 else None
-    checklist_file = Path(sys.argv[3]) if len(sys.argv) > 3 else None
+    template_file = Path(args.files[0])
+    reasoning_file = Path(args.files[1]) if len(args.files) > 1 else None
+    checklist_file = Path(args.files[2]) if len(args.files) > 2 else None
     
     all_errors = []
     all_warnings = []
     
     # Validate template
     if template_file.exists():
-        template_content = template_file.read_text()
-        errors, warnings = validate_template(template_content)
+        errors, warnings = validate_template(load_document(template_file))
         all_errors.extend(errors)
         all_warnings.extend(warnings)
         print(f"\n📄 Validating {template_file.name}:")
@@ -138,8 +228,7 @@ def main():
     
     # Validate reasoning
     if reasoning_file and reasoning_file.exists():
-        reasoning_content = reasoning_file.read_text()
-        errors, warnings = validate_reasoning(reasoning_content)
+        errors, warnings = validate_reasoning(load_document(reasoning_file).content)
         all_errors.extend(errors)
         all_warnings.extend(warnings)
         print(f"\n📄 Validating {reasoning_file.name}:")
@@ -152,8 +241,7 @@ def main():
     
     # Validate checklist
     if checklist_file and checklist_file.exists():
-        checklist_content = checklist_file.read_text()
-        errors, warnings = validate_checklist(checklist_content)
+        errors, warnings = validate_checklist(load_document(checklist_file))
         all_errors.extend(errors)
         all_warnings.extend(warnings)
         print(f"\n📄 Validating {checklist_file.name}:")
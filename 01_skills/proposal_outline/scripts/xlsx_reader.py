@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Lightweight streaming reader for .xlsx workbooks
+Reads cell values straight from the zip archive with xml.etree.iterparse
+(standard library only), one row at a time. Cell values follow openpyxl's
+data_only conventions: shared/inline strings, ints and floats, bools,
+cached formula results, and dates/times for date-formatted cells.
+
+Usage:
+    python3 xlsx_reader.py <file.xlsx> [sheet_name]
+"""
+
+import datetime
+import posixpath
+import re
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+OFFICE_DOCUMENT = '/officeDocument'
+
+WINDOWS_EPOCH = datetime.datetime(1899, 12, 30)
+MAC_EPOCH = datetime.datetime(1904, 1, 1)
+
+# Built-in number formats that display dates or times (ECMA-376 18.8.30)
+BUILTIN_DATE_FORMATS = {14, 15, 16, 17, 18, 19, 20, 21, 22, 27, 30, 36, 45, 46, 47, 50, 57}
+BUILTIN_TIMEDELTA_FORMATS = {46}
+
+# Same rules openpyxl uses to classify custom number formats
+FORMAT_LITERALS = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+DATE_FORMAT_CODE = re.compile(r'(?<![_\\])[dmhysDMHYS]')
+TIMEDELTA_FORMAT_CODE = re.compile(r'\[hh?\](:mm(:ss(\.0*)?)?)?|\[mm?\](:ss(\.0*)?)?|\[ss?\](\.0*)?')
+CELL_COLUMN = re.compile(r'[A-Za-z]+')
+
+
+def _local(tag):
+    """Tag name without its XML namespace"""
+    return tag.rpartition('}')[2]
+
+
+def _column_index(reference):
+    """Zero-based column index of a cell reference such as 'AB12'"""
+    index = 0
+    for char in CELL_COLUMN.match(reference).group().upper():
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+
+def _string_item(element):
+    """Text of a shared-string <si> or inline <is> element, rich-text runs joined, phonetic runs skipped"""
+    parts = []
+    for child in element:
+        name = _local(child.tag)
+        if name == 't':
+            parts.append(child.text or '')
+        elif name == 'r':
+            parts.extend(t.text or '' for t in child if _local(t.tag) == 't')
+    return ''.join(parts)
+
+
+def _number(text):
+    return float(text) if '.' in text or 'E' in text or 'e' in text else int(text)
+
+
+def _from_serial(value, epoch, timedelta=False):
+    """Excel serial date -> datetime (time for time-of-day values, timedelta for duration formats)"""
+    if timedelta:
+        return datetime.timedelta(milliseconds=round(value * 86400000))
+    day, fraction = divmod(value, 1)
+    diff = datetime.timedelta(milliseconds=round(fraction * 86400000))
+    if 0 <= value < 1 and diff.days == 0:
+        return (datetime.datetime.min + diff).time()
+    if 0 < value < 60 and epoch == WINDOWS_EPOCH:
+        day += 1  # Excel treats 1900 as a leap year
+    return epoch + datetime.timedelta(days=day) + diff
+
+
+class XlsxReader:
+    """Read-only, row-streaming access to the cell values of an .xlsx workbook"""
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        try:
+            self._read_workbook()
+        except Exception:
+            self._zip.close()
+            raise
+        self._shared_strings = None
+        self._date_styles = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    def _parse(self, part):
+        with self._zip.open(part) as f:
+            return ET.parse(f).getroot()
+
+    def _relationships(self, part):
+        """Relationship id -> target part name for one package part"""
+        folder, name = posixpath.split(part)
+        rels_part = posixpath.join(folder, '_rels', f'{name}.rels')
+        if rels_part not in self._zip.NameToInfo:
+            return {}
+        targets = {}
+        for rel in self._parse(rels_part):
+            target = rel.get('Target', '')
+            if rel.get('TargetMode') == 'External':
+                continue
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            targets[rel.get('Id')] = (rel.get('Type', ''), target)
+        return targets
+
+    def _read_workbook(self):
+        """Sheet names, sheet part names and the date epoch from xl/workbook.xml"""
+        self._workbook_part = next((target for rel_type, target in self._relationships('').values()
+                                    if rel_type.endswith(OFFICE_DOCUMENT)), 'xl/workbook.xml')
+        self._workbook_rels = self._relationships(self._workbook_part)
+        workbook = self._parse(self._workbook_part)
+
+        self._epoch = WINDOWS_EPOCH
+        self._sheet_parts = {}
+        for element in workbook.iter():
+            name = _local(element.tag)
+            if name == 'workbookPr' and element.get('date1904') in ('1', 'true'):
+                self._epoch = MAC_EPOCH
+            elif name == 'sheet':
+                rel = self._workbook_rels.get(element.get(f'{REL_NS}id'))
+                if rel:
+                    self._sheet_parts[element.get('name')] = rel[1]
+        self.sheetnames = list(self._sheet_parts)
+
+    def _related_part(self, rel_suffix):
+        return next((target for rel_type, target in self._workbook_rels.values()
+                     if rel_type.endswith(rel_suffix)), None)
+
+    @property
+    def shared_strings(self):
+        """Shared string table, loaded on first use"""
+        if self._shared_strings is None:
+            self._shared_strings = []
+            part = self._related_part('/sharedStrings')
+            if part in self._zip.NameToInfo:
+                with self._zip.open(part) as f:
+                    for _, element in ET.iterparse(f):
+                        if _local(element.tag) == 'si':
+                            self._shared_strings.append(_string_item(element))
+                            element.clear()
+        return self._shared_strings
+
+    @property
+    def date_styles(self):
+        """Style index -> True for duration formats, False for other date/time formats; loaded on first use"""
+        if self._date_styles is None:
+            self._date_styles = {}
+            part = self._related_part('/styles')
+            if part in self._zip.NameToInfo:
+                styles = self._parse(part)
+                custom_formats = {}
+                cell_formats = []
+                for element in styles:
+                    if _local(element.tag) == 'numFmts':
+                        custom_formats = {int(fmt.get('numFmtId')): fmt.get('formatCode', '') for fmt in element}
+                    elif _local(element.tag) == 'cellXfs':
+                        cell_formats = [int(xf.get('numFmtId', 0)) for xf in element]
+                for style, format_id in enumerate(cell_formats):
+                    if format_id in custom_formats:
+                        code = custom_formats[format_id].split(';')[0]
+                        if TIMEDELTA_FORMAT_CODE.search(code):
+                            self._date_styles[style] = True
+                        elif DATE_FORMAT_CODE.search(FORMAT_LITERALS.sub('', code)):
+                            self._date_styles[style] = False
+                    elif format_id in BUILTIN_DATE_FORMATS:
+                        self._date_styles[style] = format_id in BUILTIN_TIMEDELTA_FORMATS
+        return self._date_styles
+
+    def _cell_value(self, cell):
+        data_type = cell.get('t', 'n')
+        if data_type == 'inlineStr':
+            inline = next((child for child in cell if _local(child.tag) == 'is'), None)
+            return None if inline is None else _string_item(inline)
+
+        value = next((child.text for child in cell if _local(child.tag) == 'v'), None)
+        if not value:
+            return None
+        if data_type == 'n':
+            value = _number(value)
+            style = cell.get('s')
+            if style and int(style) in self.date_styles:
+                try:
+                    return _from_serial(value, self._epoch, self.date_styles[int(style)])
+                except (OverflowError, ValueError):
+                    return '#VALUE!'
+            return value
+        if data_type == 's':
+            return self.shared_strings[int(value)]
+        if data_type == 'b':
+            return bool(int(value))
+        if data_type == 'd':
+            return datetime.datetime.fromisoformat(value)
+        return value  # 'str' (formula result) and 'e' (error code such as '#N/A')
+
+    def iter_rows(self, sheet_name):
+        """
+        Yield each row of a sheet as a tuple of cell values (None for empty cells)
+
+        Rows are numbered from the first row of the sheet; rows missing from the
+        XML are yielded as empty tuples, and each row stops at its last stored cell.
+        """
+        if sheet_name not in self._sheet_parts:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+        with self._zip.open(self._sheet_parts[sheet_name]) as f:
+            row_number = 0
+            parent = None
+            for event, element in ET.iterparse(f, events=('start', 'end')):
+                name = _local(element.tag)
+                if event == 'start':
+                    if name == 'sheetData':
+                        parent = element
+                    continue
+                if name != 'row':
+                    continue
+
+                number = int(element.get('r', row_number + 1))
+                while row_number < number - 1:
+                    row_number += 1
+                    yield ()
+                row_number = number
+
+                values = []
+                for cell in element:
+                    if _local(cell.tag) != 'c':
+                        continue
+                    reference = cell.get('r')
+                    column = _column_index(reference) if reference else len(values)
+                    values.extend([None] * (column - len(values)))
+                    values.append(self._cell_value(cell))
+                yield tuple(values)
+
+                # Drop parsed rows so memory stays flat on large sheets
+                element.clear()
+                if parent is not None:
+                    parent.remove(element)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 xlsx_reader.py <file.xlsx> [sheet_name]")
+        sys.exit(1)
+
+    with XlsxReader(sys.argv[1]) as reader:
+        sheet = sys.argv[2] if len(sys.argv) > 2 else reader.sheetnames[0]
+        print(f"Sheets: {', '.join(reader.sheetnames)}")
+        for row in reader.iter_rows(sheet):
+            print(row)
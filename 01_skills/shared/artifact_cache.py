@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for parsed proposals and generated artifacts
+Entries are keyed by SHA-256 of the input files plus the generator version,
+and evicted least-recently-used once the cache exceeds its size budget
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from safe_write import write_atomic
+
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'proposal-skills'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+META_FILE = 'meta.json'
+
+
+def file_sha256(path) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_fingerprint(*modules) -> str:
+    """Short hash of the given modules' source, so code edits invalidate cached output"""
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+class ArtifactCache:
+    """Content-addressed artifact cache with LRU size eviction"""
+
+    def __init__(self, cache_dir=None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or os.environ.get('PROPOSAL_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes or int(os.environ.get('PROPOSAL_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+
+    def key_for(self, input_files: List, namespace: str, version: str) -> str:
+        """Cache key from the input files' content, the artifact namespace and generator version"""
+        digest = hashlib.sha256()
+        digest.update(f"{namespace}\0{version}\0".encode('utf-8'))
+        for input_file in input_files:
+            path = Path(input_file) if input_file else None
+            if path and path.exists():
+                digest.update(file_sha256(path).encode('ascii'))
+            else:
+                digest.update(b'-')
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[Dict[str, Union[str, bytes]]]:
+        """Return cached artifacts (name -> text, or bytes for binary artifacts) or None on a miss"""
+        entry_dir = self._entry_dir(key)
+        try:
+            meta = json.loads((entry_dir / META_FILE).read_text(encoding='utf-8'))
+            binary = set(meta.get("binary", ()))
+            artifacts = {
+                name: (entry_dir / name).read_bytes() if name in binary else (entry_dir / name).read_text(encoding='utf-8')
+                for name in meta["artifacts"]
+            }
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+        return artifacts
+
+    def put(self, key: str, artifacts: Dict[str, Union[str, bytes]]):
+        """Store artifacts (name -> text or bytes) under key, then evict old entries if over budget"""
+        entry_dir = self._entry_dir(key)
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+
+        # Build the entry in a temp dir and rename it into place so readers never see partial entries
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f'.{key[:8]}-', dir=entry_dir.parent))
+        try:
+            for name, data in artifacts.items():
+                if isinstance(data, bytes):
+                    (tmp_dir / name).write_bytes(data)
+                else:
+                    (tmp_dir / name).write_text(data, encoding='utf-8')
+            meta = {"artifacts": sorted(artifacts), "created": time.time()}
+            binary = sorted(name for name, data in artifacts.items() if isinstance(data, bytes))
+            if binary:
+                meta["binary"] = binary
+            (tmp_dir / META_FILE).write_text(json.dumps(meta), encoding='utf-8')
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """Remove least-recently-used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for entry_dir in self.cache_dir.glob('*/*'):
+            if entry_dir.name.startswith('.') or not entry_dir.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry_dir.iterdir())
+                entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+            except OSError:
+                continue
+            total += size
+
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove every cache entry"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def write_if_changed(path, text: str) -> bool:
+    """Atomically write text to path unless it already has exactly that content; returns True if written"""
+    return write_atomic(path, text)
+
+
+if __name__ == "__main__":
+    cache = ArtifactCache()
+    if len(sys.argv) > 1 and sys.argv[1] == 'clear':
+        cache.clear()
+        print(f"🧹 Cleared cache: {cache.cache_dir}")
+    else:
+        entries = [d for d in cache.cache_dir.glob('*/*') if d.is_dir() and not d.name.startswith('.')]
+        size = sum(f.stat().st_size for d in entries for f in d.iterdir())
+        print(f"Cache: {cache.cache_dir}")
+        print(f"Entries: {len(entries)}")
+        print(f"Size: {size / 1024:.1f} KB / {cache.max_bytes / 1024 / 1024:.0f} MB")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Deduplicating backup store for files updated in-place
+Backups are zlib-compressed objects named by the SHA-256 of their content,
+so identical versions are stored once. Each file has a small JSON-lines
+journal of its distinct versions (with line diff stats against the previous
+one); reruns that back up unchanged content only bump the latest entry.
+Old journal entries are dropped by count and age, and objects no journal
+references any more are evicted.
+
+Layout (next to the backed-up files):
+    .proposal_backups/objects/<sha[:2]>/<sha>
+    .proposal_backups/journals/<file name>.jsonl
+
+Usage:
+    python3 backup_store.py list <file>
+    python3 backup_store.py backup <file>
+    python3 backup_store.py restore <file> [N|HASH] [--output FILE]
+    python3 backup_store.py gc <directory>
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from safe_write import locked, write_atomic
+
+
+BACKUP_DIR_NAME = '.proposal_backups'
+DEFAULT_KEEP = 50
+DEFAULT_MAX_AGE_DAYS = 90
+# Objects younger than this are never evicted: a concurrent backup may not have journaled them yet
+GC_GRACE_SECONDS = 3600
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _diff_stats(old: str, new: str) -> Dict[str, int]:
+    """Lines added and removed going from old to new"""
+    added = removed = 0
+    matcher = difflib.SequenceMatcher(None, old.splitlines(), new.splitlines())
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            removed += i2 - i1
+            added += j2 - j1
+    return {"added": added, "removed": removed}
+
+
+class BackupStore:
+    """Content-addressed backup store with per-file journals, retention and restore"""
+
+    def __init__(self, root, keep: Optional[int] = None, max_age_days: Optional[float] = None):
+        self.root = Path(root)
+        self.keep = keep or int(os.environ.get('PROPOSAL_BACKUP_KEEP', DEFAULT_KEEP))
+        if max_age_days is None:
+            max_age_days = float(os.environ.get('PROPOSAL_BACKUP_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS))
+        self.max_age_days = max_age_days
+
+    @classmethod
+    def for_file(cls, path, **kwargs) -> 'BackupStore':
+        """The store that holds backups of files in path's directory"""
+        return cls(Path(path).resolve().parent / BACKUP_DIR_NAME, **kwargs)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / 'objects' / digest[:2] / digest
+
+    def _journal_path(self, path) -> Path:
+        return self.root / 'journals' / f'{Path(path).name}.jsonl'
+
+    def put_object(self, data: bytes) -> str:
+        """Store data once under its SHA-256; returns the digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            # Content-addressed, so a concurrent writer can only produce the same bytes
+            write_atomic(object_path, zlib.compress(data, 9), skip_unchanged=False, lock=False)
+        return digest
+
+    def get_object(self, digest: str) -> bytes:
+        return zlib.decompress(self._object_path(digest).read_bytes())
+
+    def history(self, path) -> List[Dict]:
+        """Journal entries for a file, oldest first"""
+        try:
+            lines = self._journal_path(path).read_text(encoding='utf-8').splitlines()
+        except OSError:
+            return []
+        return [json.loads(line) for line in lines if line.strip()]
+
+    def _write_history(self, path, entries: List[Dict]):
+        data = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+        # Callers hold the journal lock
+        write_atomic(self._journal_path(path), data, lock=False)
+
+    def backup(self, path, content: Optional[str] = None) -> Dict:
+        """
+        Record the current content of path (or the given content) as its latest backup
+
+        Returns:
+            The journal entry; entry["new"] is False when the content matched the latest backup
+        """
+        if content is None:
+            content = Path(path).read_text(encoding='utf-8')
+        data = content.encode('utf-8')
+        digest = self.put_object(data)
+        with locked(self._journal_path(path)):
+            return self._record(path, content, len(data), digest)
+
+    def _record(self, path, content: str, size: int, digest: str) -> Dict:
+        """Add digest to path's journal (caller holds the journal lock)"""
+        entries = self.history(path)
+        now = _now()
+
+        if entries and entries[-1]["object"] == digest:
+            latest = entries[-1]
+            latest["last_seen"] = now
+            latest["count"] = latest.get("count", 1) + 1
+            self._write_history(path, entries)
+            return {**latest, "new": False}
+
+        entry = {"object": digest, "time": now, "last_seen": now, "count": 1, "size": size}
+        if entries:
+            entry.update(_diff_stats(self.get_object(entries[-1]["object"]).decode('utf-8'), content))
+        else:
+            entry.update({"added": len(content.splitlines()), "removed": 0})
+        entries.append(entry)
+
+        pruned = self._apply_retention(entries)
+        self._write_history(path, entries)
+        if pruned:
+            self.gc()
+        return {**entry, "new": True}
+
+    def _apply_retention(self, entries: List[Dict]) -> bool:
+        """Drop entries beyond self.keep or older than self.max_age_days (never the latest); True if any dropped"""
+        before = len(entries)
+        if self.max_age_days:
+            cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat(timespec='seconds')
+            entries[:-1] = [entry for entry in entries[:-1] if entry["last_seen"] >= cutoff]
+        del entries[:max(0, len(entries) - self.keep)]
+        return len(entries) != before
+
+    def gc(self) -> int:
+        """Remove objects no journal references; returns the number removed"""
+        referenced = set()
+        for journal in (self.root / 'journals').glob('*.jsonl'):
+            for line in journal.read_text(encoding='utf-8').splitlines():
+                if line.strip():
+                    referenced.add(json.loads(line)["object"])
+
+        removed = 0
+        cutoff = time.time() - GC_GRACE_SECONDS
+        for object_path in (self.root / 'objects').glob('*/*'):
+            if object_path.name in referenced or object_path.name.startswith('.'):
+                continue
+            try:
+                if object_path.stat().st_mtime < cutoff:
+                    object_path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def resolve(self, path, ref: Optional[str] = None) -> Dict:
+        """Journal entry for ref: None/'1' = latest, 'N' = Nth newest, otherwise a hash prefix"""
+        entries = self.history(path)
+        if not entries:
+            raise LookupError(f"No backups of {Path(path).name}")
+        ref = ref or '1'
+        if ref.isdigit() and 1 <= int(ref) <= len(entries):
+            return entries[-int(ref)]
+        matches = [entry for entry in entries if entry["object"].startswith(ref)]
+        if not matches:
+            raise LookupError(f"No backup of {Path(path).name} matches {ref}")
+        return matches[-1]
+
+    def restore(self, path, ref: Optional[str] = None, output=None) -> Dict:
+        """
+        Write a backed-up version of path to output (default: path itself)
+
+        Restoring over the file first backs up its current content, so a restore can be undone.
+        """
+        entry = self.resolve(path, ref)
+        data = self.get_object(entry["object"])
+        target = Path(output or path)
+        if target.resolve() == Path(path).resolve() and target.exists():
+            self.backup(path)
+        write_atomic(target, data)
+        return entry
+
+
+def _print_history(store: BackupStore, path):
+    entries = store.history(path)
+    if not entries:
+        print(f"No backups of {Path(path).name} in {store.root}")
+        return
+    print(f"Backups of {Path(path).name} ({store.root}):")
+    for index, entry in enumerate(reversed(entries), 1):
+        repeats = f", seen {entry['count']}x until {entry['last_seen']}" if entry.get('count', 1) > 1 else ""
+        print(f"  {index:>3}  {entry['object'][:12]}  {entry['time']}  {entry['size']:>8} B  "
+              f"+{entry.get('added', 0)}/-{entry.get('removed', 0)} lines{repeats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicating backup store for files updated in-place')
+    commands = parser.add_subparsers(dest='command', required=True)
+    list_parser = commands.add_parser('list', help='Show the backups of a file, newest first')
+    list_parser.add_argument('file')
+    backup_parser = commands.add_parser('backup', help='Back up the current content of a file')
+    backup_parser.add_argument('file')
+    restore_parser = commands.add_parser('restore', help='Restore a backup (default: the latest)')
+    restore_parser.add_argument('file')
+    restore_parser.add_argument('ref', nargs='?', help='N-th newest backup (1 = latest) or object hash prefix')
+    restore_parser.add_argument('--output', '-o', help='Write the backup here instead of over the file')
+    gc_parser = commands.add_parser('gc', help='Remove objects no journal references')
+    gc_parser.add_argument('directory', help='Directory whose backups to clean up')
+    args = parser.parse_args()
+
+    if args.command == 'gc':
+        store = BackupStore(Path(args.directory).resolve() / BACKUP_DIR_NAME)
+        print(f"🧹 Removed {store.gc()} unreferenced object(s) from {store.root}")
+        return
+
+    store = BackupStore.for_file(args.file)
+    try:
+        if args.command == 'list':
+            _print_history(store, args.file)
+        elif args.command == 'backup':
+            entry = store.backup(args.file)
+            state = "stored" if entry["new"] else "unchanged, latest backup reused"
+            print(f"📦 Backup {entry['object'][:12]} ({state})")
+        else:
+            entry = store.restore(args.file, args.ref, args.output)
+            print(f"♻️  Restored {entry['object'][:12]} from {entry['time']} to {args.output or args.file}")
+    except (OSError, LookupError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the proposal extractors
+Times ProposalParser (architecture) and ProposalParser + SlideMapper (slides)
+on a synthetic proposal with many modules, plus raw-string re calls versus the
+precompiled registry in patterns.py
+
+Usage:
+    python3 bench_extractors.py [--modules N] [--repeat R] [--root REPO_ROOT] [--seed proposal.md]
+
+Point --root at another checkout (e.g. a git worktree of an older commit) to
+compare before/after numbers on the same synthetic input.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SEED = REPO_ROOT / 'test' / 'AVA_DT_template.md'
+MODULE_HEADING = '#### Module: '
+MODULE_LIST_MARKER = '**AI Modules:**\n'
+
+
+def build_synthetic_proposal(seed_text: str, num_modules: int) -> str:
+    """Scale a seed proposal to num_modules module descriptions (and AI Modules list entries)"""
+    first = seed_text.index(MODULE_HEADING)
+    block_end = seed_text.index(MODULE_HEADING, first + 1)
+    block = seed_text[first:block_end]
+    name = block[len(MODULE_HEADING):block.index('\n')]
+
+    blocks = [block.replace(name, f"{name} {i}", 1) for i in range(1, num_modules + 1)]
+    text = seed_text[:first] + ''.join(blocks) + seed_text[first:]
+
+    list_start = text.index(MODULE_LIST_MARKER) + len(MODULE_LIST_MARKER)
+    items = ''.join(f"{i}. {name} {i}\n" for i in range(1, num_modules + 1))
+    return text[:list_start] + items + text[list_start:]
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _forget_parsed_documents():
+    """Drop load_document()'s in-process cache so every run measures a full parse"""
+    proposal_document = sys.modules.get('proposal_document')
+    if proposal_document is not None and hasattr(proposal_document, '_document_cache'):
+        proposal_document._document_cache.clear()
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        _forget_parsed_documents()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_extractors(root: Path, proposal_file: Path, repeat: int):
+    """Best-of-repeat seconds for the architecture parser and the slide mapper"""
+    skills = root / '01_skills'
+    arch = _load_module('bench_parse_proposal', skills / 'architecture-generator-skill' / 'scripts' / 'parse_proposal.py')
+    slides = _load_module('bench_map_to_slides', skills / 'slide-content-mapper' / 'scripts' / 'map_to_slides.py')
+
+    def run_architecture():
+        arch.ProposalParser(str(proposal_file)).parse()
+
+    def run_slides():
+        proposal_data = slides.ProposalParser(str(proposal_file)).parse()
+        slides.SlideMapper(proposal_data).map()
+
+    return {
+        "parse_proposal": _best_of(run_architecture, repeat),
+        "map_to_slides": _best_of(run_slides, repeat),
+    }
+
+
+def bench_registry(content: str, repeat: int):
+    """Raw-string re.search per call versus the compiled registry, over every registry pattern"""
+    try:
+        import patterns
+    except ImportError:  # --root checkout without shared/patterns.py
+        return None
+
+    compiled = [value for value in vars(patterns).values() if isinstance(value, re.Pattern)]
+    compiled += patterns.REASONING_PATTERNS + patterns.CAMERA_COUNT_PATTERNS
+    lines = content.splitlines()
+
+    def run_raw():
+        for line in lines:
+            for pattern in compiled:
+                re.search(pattern.pattern, line, pattern.flags)
+
+    def run_compiled():
+        for line in lines:
+            for pattern in compiled:
+                pattern.search(line)
+
+    return {"raw re.search": _best_of(run_raw, repeat), "compiled": _best_of(run_compiled, repeat)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark proposal extractors on a synthetic proposal')
+    parser.add_argument('--modules', type=int, default=200, help='Number of synthetic modules (default: 200)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, best is reported (default: 5)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Repository root to benchmark (default: this checkout)')
+    parser.add_argument('--seed', default=str(DEFAULT_SEED), help='Seed proposal with "#### Module:" blocks')
+    args = parser.parse_args()
+
+    content = build_synthetic_proposal(Path(args.seed).read_text(encoding='utf-8'), args.modules)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        proposal_file = Path(tmp_dir) / 'synthetic_proposal.md'
+        proposal_file.write_text(content, encoding='utf-8')
+
+        print(f"📄 Synthetic proposal: {args.modules} modules, {len(content) / 1024:.0f} KB")
+        print(f"Root: {args.root}\n")
+        for name, seconds in bench_extractors(Path(args.root).resolve(), proposal_file, args.repeat).items():
+            print(f"  {name:<16} {seconds * 1000:9.2f} ms")
+
+    registry = bench_registry(content, 1)
+    if registry:
+        print(f"\nRegex registry ({len(content.splitlines())} lines x all patterns):")
+        for name, seconds in registry.items():
+            print(f"  {name:<16} {seconds * 1000:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Inference capacity planner
+Sizes the AI hardware a proposal implies: GPU load from cameras x AI modules
+per camera x analysed frame rate x resolution, priced with a per-module cost
+table, turned into edge servers (on-prem / hybrid) or cloud GPU instances,
+plus total camera stream bandwidth and event storage. Multi-site projects are
+sized per site (edge) or as one shared pool (cloud).
+
+Module cost = GPU milliseconds per analysed 1080p frame on the reference GPU.
+The cost table holds every module of proposal_outline/STANDARD_MODULES.md at
+the cost of its tier (patterns.MODULE_COST_TIERS); other (custom) modules are
+tiered by the same keywords. Cost scales linearly with pixel count, which
+over- rather than under-sizes detectors that downscale their input.
+
+PROPOSAL_MODULE_COSTS points at a JSON file overriding any part of the table
+({"modules": {name: gpu_ms}, "tiers": {...}, "hardware": {...},
+"resolutions": {...}}); `costs` prints the resolved table as a starting point.
+
+Usage:
+    python3 capacity_planner.py plan <project_info.json> [--fps 5] [--retention-days 90] [--json]
+    python3 capacity_planner.py costs
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import patterns
+from keyword_scanner import categorize
+from proposal_document import load_document, normalize_name
+
+STANDARD_MODULES_FILE = Path(__file__).resolve().parent.parent / 'proposal_outline' / 'STANDARD_MODULES.md'
+
+REFERENCE_GPU = "RTX 5080"
+# GPU ms per analysed 1080p frame on the reference GPU, per module tier
+TIER_COSTS = {"detection": 4.0, "tracking": 6.0, "pose": 9.0, "recognition": 12.0}
+DEFAULT_TIER = "detection"
+
+# Pixel count relative to 1080p, and camera stream bitrate (Mbps at 25 fps; 12 Mbps/camera per TEMPLATE.md)
+RESOLUTIONS = {
+    "720p": {"pixels": 0.44, "bitrate_mbps": 6},
+    "1080p": {"pixels": 1.0, "bitrate_mbps": 12},
+    "1440p": {"pixels": 1.78, "bitrate_mbps": 18},
+    "4k": {"pixels": 4.0, "bitrate_mbps": 32},
+}
+RESOLUTION_ALIASES = {"2160p": "4k", "uhd": "4k", "fhd": "1080p", "hd": "720p"}
+
+# gpu_capacity: throughput relative to the reference GPU; max_streams: decode limit per unit
+HARDWARE = {
+    "edge": {"name": "Edge Server", "gpu": REFERENCE_GPU, "gpus": 1, "gpu_capacity": 1.0, "max_streams": 32},
+    "cloud": {"name": "GPU Instance", "gpu": "NVIDIA A10G", "gpus": 1, "gpu_capacity": 0.8, "max_streams": 24},
+}
+
+ANALYSIS_FPS = 5
+CAMERA_FPS = 25
+DEFAULT_RESOLUTION = "1080p"
+# Share of GPU time planned for; the rest is headroom for alert bursts and retraining pushes
+TARGET_UTILIZATION = 0.7
+# Event evidence (snapshots + short clips) kept for the dashboard
+EVENTS_PER_MODULE_DAY = 20
+EVENT_CLIP_MB = 10
+RETENTION_DAYS = 90
+
+
+def cost_files() -> List[Path]:
+    """Files the cost table is built from (for cache keys and pipeline inputs)"""
+    files = [STANDARD_MODULES_FILE]
+    if os.environ.get('PROPOSAL_MODULE_COSTS'):
+        files.append(Path(os.environ['PROPOSAL_MODULE_COSTS']))
+    return files
+
+
+def load_cost_table(standard_modules=STANDARD_MODULES_FILE) -> Dict[str, Any]:
+    """
+    Module costs, tier costs, hardware profiles and resolutions, with PROPOSAL_MODULE_COSTS applied
+
+    Raises:
+        ValueError: the override file cannot be read or is not valid JSON
+    """
+    tiers = dict(TIER_COSTS)
+    hardware = {target: dict(profile) for target, profile in HARDWARE.items()}
+    resolutions = {name: dict(values) for name, values in RESOLUTIONS.items()}
+    overrides = {}
+    override_file = os.environ.get('PROPOSAL_MODULE_COSTS')
+    if override_file:
+        try:
+            overrides = json.loads(Path(override_file).read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"{override_file}: {e}")
+        tiers.update(overrides.get("tiers", {}))
+        for target, profile in overrides.get("hardware", {}).items():
+            hardware.setdefault(target, {}).update(profile)
+        for name, values in overrides.get("resolutions", {}).items():
+            resolutions.setdefault(name.lower(), {}).update(values)
+
+    modules = {}
+    if Path(standard_modules).exists():
+        table = load_document(standard_modules).find_table("AI Module")
+        column = table["headers"].index("AI Module") if table else 0
+        for cells in table["rows"] if table else []:
+            if len(cells) > column and cells[column]:
+                name = cells[column]
+                modules[name] = tiers[categorize(name, patterns.MODULE_COST_TIERS, DEFAULT_TIER)]
+    modules.update(overrides.get("modules", {}))
+    return {"modules": modules, "tiers": tiers, "hardware": hardware, "resolutions": resolutions}
+
+
+def module_costs(names, table: Dict[str, Any]) -> Dict[str, float]:
+    """GPU ms per 1080p frame per module name: its table entry (case-insensitive), else its tier's cost"""
+    lookup = {normalize_name(module): cost for module, cost in table["modules"].items()}
+    costs = {}
+    for name in names:
+        cost = lookup.get(normalize_name(patterns.TRAILING_PARENTHETICAL.sub('', name)))
+        if cost is None:
+            cost = table["tiers"][categorize(name, patterns.MODULE_COST_TIERS, DEFAULT_TIER)]
+        costs[name] = cost
+    return costs
+
+
+def _resolution(name: Optional[str], table: Dict[str, Any]) -> str:
+    name = (name or DEFAULT_RESOLUTION).lower()
+    name = RESOLUTION_ALIASES.get(name, name)
+    return name if name in table["resolutions"] else DEFAULT_RESOLUTION
+
+
+def _units(gpu_load: float, cameras: int, profile: Dict[str, Any]) -> int:
+    """Servers / instances for a GPU load (reference GPUs) and stream count"""
+    if cameras <= 0:
+        return 0
+    by_gpu = gpu_load / (profile["gpus"] * profile["gpu_capacity"] * TARGET_UTILIZATION)
+    by_streams = cameras / profile["max_streams"]
+    return max(1, math.ceil(round(by_gpu, 6)), math.ceil(by_streams))
+
+
+def plan(project_info: Dict[str, Any], fps: float = ANALYSIS_FPS, retention_days: int = RETENTION_DAYS,
+         table: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Size the inference hardware for a parsed proposal (parse_proposal.py project_info)
+
+    Modules per camera: project_info "modules_per_camera", else every module on
+    every camera; a site with its own module list runs at most those.
+
+    Returns:
+        Plan dict (target, hardware, cameras, gpu_load in reference GPUs, servers,
+        bandwidth_mbps, storage_tb, per-site rows, warnings), or None without cameras
+    """
+    cameras = project_info.get('num_cameras') or 0
+    sites = project_info.get('sites') or []
+    if sites:
+        cameras = sum(site['cameras'] for site in sites)
+    if not cameras:
+        return None
+
+    table = table or load_cost_table()
+    target = 'cloud' if project_info.get('deployment_method') == 'cloud' else 'edge'
+    profile = table["hardware"][target]
+    resolution = _resolution(project_info.get('camera_resolution'), table)
+    camera_fps = project_info.get('camera_fps') or CAMERA_FPS
+    fps = min(fps, camera_fps)
+    pixels = table["resolutions"][resolution]["pixels"]
+    bitrate = table["resolutions"][resolution]["bitrate_mbps"] * camera_fps / CAMERA_FPS
+    modules = project_info.get('ai_modules') or []
+    per_camera = project_info.get('modules_per_camera') or len(modules)
+    costs = module_costs(set(modules).union(*(site.get('ai_modules') or [] for site in sites)), table)
+
+    def size(site_cameras, site_modules):
+        site_modules = site_modules or modules
+        count = min(per_camera, len(site_modules)) if site_modules else per_camera
+        average_cost = (sum(costs[name] for name in site_modules) / len(site_modules)
+                        if site_modules else table["tiers"][DEFAULT_TIER])
+        return {
+            "cameras": site_cameras,
+            "modules_per_camera": count,
+            "gpu_load": site_cameras * count * average_cost * fps * pixels / 1000,
+            "bandwidth_mbps": site_cameras * bitrate,
+            "storage_tb": site_cameras * count * EVENTS_PER_MODULE_DAY * EVENT_CLIP_MB * retention_days / 1e6,
+        }
+
+    warnings = []
+    site_rows = []
+    for site in sites:
+        row = dict(size(site['cameras'], site.get('ai_modules')), name=site['name'])
+        row["servers"] = _units(row["gpu_load"], row["cameras"], profile) if target == 'edge' else None
+        declared = site.get('edge_servers')
+        if target == 'edge' and declared and declared < row["servers"]:
+            warnings.append(f"{site['name']}: {declared} edge server(s) planned, {row['servers']} required")
+        uplink = site.get('bandwidth_mbps')
+        if target == 'cloud' and uplink and uplink < row["bandwidth_mbps"]:
+            warnings.append(f"{site['name']}: {uplink:g} Mbps uplink below {row['bandwidth_mbps']:g} Mbps of streams")
+        site_rows.append(row)
+
+    total = size(cameras, None) if not sites else {
+        key: sum(row[key] for row in site_rows) for key in ("cameras", "gpu_load", "bandwidth_mbps", "storage_tb")}
+    if target == 'edge' and sites:
+        servers = sum(row["servers"] for row in site_rows)
+    else:
+        servers = _units(total["gpu_load"], total["cameras"], profile)
+
+    for row in site_rows:
+        row["gpu_load"] = round(row["gpu_load"], 2)
+        row["storage_tb"] = round(row["storage_tb"], 2)
+    return {
+        "target": target,
+        "hardware": f"{profile['name']} ({profile['gpus']}x {profile['gpu']})" if profile['gpus'] > 1
+        else f"{profile['name']} ({profile['gpu']})",
+        "unit": profile['name'],
+        "cameras": total["cameras"],
+        "modules_per_camera": per_camera,
+        "resolution": resolution,
+        "camera_fps": camera_fps,
+        "analysis_fps": fps,
+        "gpu_load": round(total["gpu_load"], 2),
+        "servers": servers,
+        "bandwidth_mbps": round(total["bandwidth_mbps"], 1),
+        "storage_tb": round(total["storage_tb"], 2),
+        "retention_days": retention_days,
+        "sites": site_rows,
+        "warnings": warnings,
+    }
+
+
+def units_label(count: int, unit: str) -> str:
+    """"3 Edge Servers" / "1 GPU Instance\""""
+    return f"{count} {unit}{'s' if count != 1 else ''}"
+
+
+def summary_rows(capacity: Dict[str, Any]) -> List[List[str]]:
+    """[Specification, Value] rows of a plan, for the SYSTEM REQUIREMENTS slides"""
+    rows = [
+        ["Cameras", f"{capacity['cameras']} ({capacity['resolution']}@{capacity['camera_fps']:g}fps)"],
+        ["AI Modules per Camera", str(capacity['modules_per_camera'])],
+        ["Analysed Frame Rate", f"{capacity['analysis_fps']:g} fps per module"],
+        ["GPU Load", f"{capacity['gpu_load']:g} x {REFERENCE_GPU} equivalents "
+                     f"(planned at {TARGET_UTILIZATION:.0%} utilization)"],
+        [f"{capacity['unit']}s", f"{capacity['servers']} x {capacity['hardware']}"],
+        ["Total Stream Bandwidth", f"{capacity['bandwidth_mbps']:g} Mbps"],
+        ["Event Storage", f"{capacity['storage_tb']:g} TB ({capacity['retention_days']} days)"],
+    ]
+    rows.extend(["Warning", warning] for warning in capacity['warnings'])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Size edge servers / cloud GPU instances for a proposal')
+    commands = parser.add_subparsers(dest='command', required=True)
+    plan_parser = commands.add_parser('plan', help='Plan the hardware for a project_info.json')
+    plan_parser.add_argument('project_info', help='<stem>_project_info.json written by generate_architecture.py')
+    plan_parser.add_argument('--fps', type=float, default=ANALYSIS_FPS,
+                             help=f'Analysed frames per second per module (default: {ANALYSIS_FPS})')
+    plan_parser.add_argument('--retention-days', type=int, default=RETENTION_DAYS,
+                             help=f'Days of event evidence kept (default: {RETENTION_DAYS})')
+    plan_parser.add_argument('--json', action='store_true', help='Print the plan as JSON')
+    commands.add_parser('costs', help='Print the resolved cost table (PROPOSAL_MODULE_COSTS format)')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'costs':
+            print(json.dumps(load_cost_table(), indent=2, ensure_ascii=False))
+            return
+        data = json.loads(Path(args.project_info).read_text(encoding='utf-8'))
+        capacity = plan(data.get('project_info', data), args.fps, args.retention_days)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if capacity is None:
+        print("⚠️  No camera number in project info, nothing to plan")
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(capacity, indent=2, ensure_ascii=False))
+        return
+    print(f"🖥️  Capacity plan ({capacity['target']})")
+    for name, value in summary_rows(capacity):
+        print(f"   {name}: {value}")
+    for row in capacity['sites']:
+        servers = f", {units_label(row['servers'], capacity['unit'])}" if row['servers'] is not None else ""
+        print(f"   - {row['name']}: {row['cameras']} cameras, {row['gpu_load']:g} GPU{servers}, "
+              f"{row['bandwidth_mbps']:g} Mbps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Single-pass multi-keyword scanner
+Finds every occurrence of a fixed keyword set in one sweep over the document
+(one compiled alternation over case-folded text), so extractors can answer
+"does keyword X appear in this section / the whole document" from the hit
+table instead of running one case-insensitive regex search per keyword
+"""
+
+import re
+import sys
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+
+def _is_word_char(char: str) -> bool:
+    """Same notion of a word character as regex \\w"""
+    return char.isalnum() or char == '_'
+
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter
+_ASCII_CASE_FOLDS = {'\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'}
+
+
+def fold_case(text: str) -> str:
+    """
+    Lowercase text without changing its length, so offsets stay valid for the original
+
+    ASCII keywords then match exactly where a re.IGNORECASE search would.
+    """
+    if text.isascii():
+        return text.lower()
+    for char, ascii_char in _ASCII_CASE_FOLDS.items():
+        if char in text:
+            text = text.replace(char, ascii_char)
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A few characters lowercase to more than one code point; leave those as they are
+    return ''.join(lower if len(lower) == 1 else char for char, lower in ((c, c.lower()) for c in text))
+
+
+def categorize(name: str, categories: Iterable, default: str) -> str:
+    """First category whose keywords occur in name (lowercase substring match), else default"""
+    name = name.lower()
+    for category, keywords in categories:
+        if any(keyword in name for keyword in keywords):
+            return category
+    return default
+
+
+class KeywordHits:
+    """Positions of every keyword occurrence found by one KeywordScanner sweep"""
+
+    def __init__(self, text: str, positions: Dict[str, List[int]]):
+        self.text = text
+        self.positions = positions
+
+    def _is_boundary(self, pos: int) -> bool:
+        """Regex \\b semantics at a character offset"""
+        before = pos > 0 and _is_word_char(self.text[pos - 1])
+        after = pos < len(self.text) and _is_word_char(self.text[pos])
+        return before != after
+
+    def find_all(self, keyword: str, start: int = 0, end: Optional[int] = None,
+                 whole_word: bool = True) -> List[int]:
+        """Start offsets of keyword hits lying entirely within [start, end)"""
+        keyword = keyword.lower()
+        end = len(self.text) if end is None else end
+        starts = self.positions.get(keyword, [])
+        hits = []
+        for pos in starts[bisect_left(starts, start):]:
+            if pos + len(keyword) > end:
+                break
+            if whole_word and not (self._is_boundary(pos) and self._is_boundary(pos + len(keyword))):
+                continue
+            hits.append(pos)
+        return hits
+
+    def contains(self, keyword: str, start: int = 0, end: Optional[int] = None, whole_word: bool = True) -> bool:
+        """True if keyword occurs within [start, end)"""
+        keyword = keyword.lower()
+        end = len(self.text) if end is None else end
+        starts = self.positions.get(keyword, [])
+        for pos in starts[bisect_left(starts, start):]:
+            if pos + len(keyword) > end:
+                return False
+            if not whole_word or (self._is_boundary(pos) and self._is_boundary(pos + len(keyword))):
+                return True
+        return False
+
+    def contains_any(self, keywords: Iterable[str], start: int = 0, end: Optional[int] = None,
+                     whole_word: bool = True) -> bool:
+        """True if any of the keywords occurs within [start, end)"""
+        return any(self.contains(keyword, start, end, whole_word) for keyword in keywords)
+
+
+class KeywordScanner:
+    """
+    Case-insensitive multi-keyword matcher compiled once for a keyword set
+
+    Keywords are tried longest first and hits do not overlap, so a keyword
+    that is a prefix of a longer one (on-prem / on-premise) is reported as
+    the longer keyword where both match. Keywords should not otherwise
+    contain one another.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({keyword.lower() for keyword in keywords}, key=lambda k: (-len(k), k))
+        self._pattern = re.compile('|'.join(re.escape(keyword) for keyword in self.keywords))
+
+    def scan(self, text: str) -> KeywordHits:
+        """Find every keyword occurrence in one pass over text"""
+        positions = {keyword: [] for keyword in self.keywords}
+        for match in self._pattern.finditer(fold_case(text)):
+            positions[match.group()].append(match.start())
+        return KeywordHits(text, positions)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python3 keyword_scanner.py <file.md> <keyword> [keyword ...]")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        hits = KeywordScanner(sys.argv[2:]).scan(f.read())
+    for keyword in sys.argv[2:]:
+        print(f"{keyword}: {len(hits.find_all(keyword))} whole-word, {len(hits.find_all(keyword, whole_word=False))} total")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Precompiled regex registry shared by all proposal extractors
+Patterns are compiled once at import instead of being passed as raw strings
+to re.search / re.sub inside per-line loops
+"""
+
+import re
+
+
+# Markdown document model (proposal_document.py)
+HEADING = re.compile(r'^(#+)[ \t]+(.+?)[ \t]*$', re.MULTILINE)
+FIELD = re.compile(r'\*\*([^*\n]+?):\*\*')
+NUMBERED_ITEM = re.compile(r'^\d+\.\s*(.+?)$')
+PLACEHOLDER = re.compile(r'\[([A-Z_]+\d+)\]')
+PLACEHOLDER_ID = re.compile(r'[A-Z_]+\d+')
+TABLE_SEPARATOR = re.compile(r'^\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?$')
+NEWLINE = re.compile(r'\n')
+
+# Checklist update (update_template_from_checklist.py): "<estimated value> [PLACEHOLDER_ID]".
+# The estimate is the text before the ID on the same line, after the last field label
+# ("**Label:**", "Label: "), table cell border, preceding placeholder or complete
+# markdown link. A single '*' (e.g. "5 * 2") is part of the estimate, only '**' is a
+# label boundary. Matches may only start at a boundary, which keeps re.sub linear on
+# long lines; a value may contain links, the caller keeps everything up to the last one.
+MARKDOWN_LINK = re.compile(r'\[[^\[\]\n]*\]\([^()\n]*\)')
+PLACEHOLDER_WITH_VALUE = re.compile(r'(?:^|(?<=[\[|])|(?<=\])(?!\()|(?<=\*\*)|(?<=:)(?=\s))'
+                                    r'(?P<value>(?:\[[^\[\]\n]*\]\([^()\n]*\)|[^\[\]\n|*:]|\*(?!\*)|:(?!\s))*?)'
+                                    r'[ \t]*\[(?P<id>[A-Z_]+\d+)\]',
+                                    re.MULTILINE)
+LIST_MARKER_PREFIX = re.compile(r'[ \t]*(?:(?:[-•]|\d+\.)[ \t]+)?')
+
+# Common markdown cleanup
+BOLD_MARKER = re.compile(r'\*\*')
+BULLET_PREFIX = re.compile(r'^[-*•]\s*')
+SOURCE_SUFFIX = re.compile(r'\*\*Source[:\s]*.*$', re.IGNORECASE)
+DASHES_ONLY = re.compile(r'^-+$')
+
+# Architecture parser (parse_proposal.py)
+CAMERA_COUNT_VALUE = re.compile(r'(\d+)\s*cameras?', re.IGNORECASE)
+CAMERA_COUNT_PATTERNS = [
+    re.compile(r'(\d+)\s*cameras?\s*(?:\(|at|total)', re.IGNORECASE),
+    re.compile(r'Camera.*?(\d+)\s*cameras?', re.IGNORECASE),
+]
+FIRST_NUMBER = re.compile(r'(\d+)')
+AI_MODULES_MARKER = re.compile(r'AI Modules:', re.IGNORECASE)
+INTERNET_CONFIRMED = re.compile(r'internet connection.*?(?:required|confirmed|yes|stable)', re.IGNORECASE)
+INTERNET_TYPE_CONTEXT = re.compile(r'(?:internet|connection|network).*?(?:4G|5G|WiFi|Wi-Fi|Ethernet|Fiber|Satellite)',
+                                   re.IGNORECASE)
+INTERNET_TYPE = re.compile(r'(4G|5G|WiFi|Wi-Fi|Ethernet|Fiber|Satellite|Broadband)', re.IGNORECASE)
+
+# Multi-site tables: any table with a site and a camera column, one row per site.
+# Header aliases per project_info site key (headers compared lowercased, bold removed).
+SITE_TABLE_COLUMNS = {
+    "name": ["site", "site name", "location"],
+    "cameras": ["cameras", "camera number", "no. of cameras", "number of cameras"],
+    "ai_modules": ["ai modules", "modules"],
+    "edge_servers": ["edge servers", "edge server", "ai workstations", "workstations"],
+    "bandwidth_mbps": ["bandwidth", "uplink", "uplink bandwidth"],
+}
+# Module cells meaning "every project module" (stored as an empty list)
+SITE_ALL_MODULES = {"", "-", "all", "all modules"}
+SITE_MODULE_SEPARATOR = re.compile(r'\s*(?:,|;|<br\s*/?>)\s*', re.IGNORECASE)
+BANDWIDTH_VALUE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:([gmk])bps)?', re.IGNORECASE)
+# Capacity planner inputs: "3-4 modules per camera" (upper bound used), "1080p@25fps"
+MODULES_PER_CAMERA_VALUE = re.compile(r'(\d+)(?:\s*[-–]\s*(\d+))?')
+CAMERA_STREAM_FORMAT = re.compile(r'(720p|1080p|1440p|2160p|4K)\s*@\s*(\d+)\s*fps', re.IGNORECASE)
+
+# Detection keywords for parse_proposal.py, matched case-insensitively on word
+# boundaries in one sweep by keyword_scanner.KeywordScanner.
+# "cloud" also covers "Cloud-based" and "On-cloud".
+DEPLOYMENT_SECTION_KEYWORDS = {
+    "cloud": ["cloud"],
+    "on-prem": ["on-premise", "on-prem", "on premise"],
+    "hybrid": ["hybrid"],
+}
+DEPLOYMENT_DOCUMENT_KEYWORDS = {
+    "cloud": ["cloud"],
+    "on-prem": ["on-prem", "on premise"],
+}
+ALERT_SECTION_KEYWORDS = [
+    ("Email", "email"),
+    ("Telegram", "telegram"),
+    ("Dashboard", "dashboard"),
+    ("Mobile", "mobile"),
+    ("SMS", "sms"),
+    ("WhatsApp", "whatsapp"),
+]
+ALERT_DOCUMENT_KEYWORDS = ALERT_SECTION_KEYWORDS[:3]
+NVR_KEYWORDS = ["nvr", "network video recorder"]
+OPTIONAL_KEYWORD = "optional"
+DETECTION_KEYWORDS = (
+    [keyword for group in DEPLOYMENT_SECTION_KEYWORDS.values() for keyword in group]
+    + [keyword for _, keyword in ALERT_SECTION_KEYWORDS]
+    + NVR_KEYWORDS
+    + [OPTIONAL_KEYWORD]
+)
+
+# Mermaid generator (generate_mermaid.py)
+TRAILING_PARENTHETICAL = re.compile(r'\s*\([^)]*\)\s*$')
+
+# AI module taxonomy: (category, name keywords), first category with a keyword in the
+# lowercased module name wins (keyword_scanner.categorize). Shared by the slide grouping
+# (map_to_slides.py) and aggregated architecture diagrams (generate_mermaid.py).
+MODULE_CATEGORIES = [
+    ("PPE Detection", ["helmet", "vest", "glove", "boot", "ppe"]),
+    ("Safety", ["safety", "unsafe", "danger"]),
+    ("Operations", ["count", "queue", "process"]),
+]
+OTHER_MODULE_CATEGORY = "Other"
+
+# Inference cost tiers for capacity_planner.py (same matching; unmatched modules are plain detectors)
+MODULE_COST_TIERS = [
+    ("recognition", ["facial", "face recognition", "license plate", "blacklist"]),
+    ("pose", ["lifting", "human down", "sleeping", "running", "ladder", "smoking", "phone"]),
+    ("tracking", ["counting", "speed", "collision", "idling", "leaving", "parking", "walkway", "intrusion",
+                  "zone", "theft", "unmanned", "dumping"]),
+]
+
+# Mermaid reader (architecture_graph.from_mermaid) - the flowchart subset the generator writes
+MERMAID_HEADER = re.compile(r'^(?:graph|flowchart)\s+(TB|TD|BT|LR|RL)$')
+MERMAID_SUBGRAPH = re.compile(r'^subgraph\s+(?:"([^"]*)"|(\w+)\s*\["?([^\]"]*)"?\]|(.+))$')
+MERMAID_DIRECTION = re.compile(r'^direction\s+(TB|TD|BT|LR|RL)$')
+MERMAID_NODE = re.compile(r'^(\w+)\s*(?:\["(.*)"\]|\[(.*)\]|\("(.*)"\)|\((.*)\))?$')
+MERMAID_EDGE = re.compile(r'^(\w+)\s*(-->|-\.->|==>)\s*(?:\|([^|]*)\|\s*)?(\w+)$')
+MERMAID_STYLE = re.compile(r'^style\s+(\w+)\s+(\S+)$')
+MERMAID_CLASS_DEF = re.compile(r'^classDef\s+(\w+)\s+(\S+)$')
+MERMAID_CLASS = re.compile(r'^class\s+([\w,]+)\s+(\w+)$')
+MERMAID_LINE_BREAK = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+# Slide mapper (map_to_slides.py)
+TECHNICAL_PROPOSAL_SUFFIX = re.compile(r'Technical\s+Proposal.*$', re.IGNORECASE)
+COVER_DATE = re.compile(r'\*\*Date\*\*[:\s]+(\d{4}-\d{2}-\d{2}|\w+\s+\d{4})', re.IGNORECASE)
+COVER_DATE_COLON = re.compile(r'\*\*Date:\*\*\s*(\d{4}-\d{2}-\d{2}|\w+\s+\d{4})', re.IGNORECASE)
+PROJECT_OWNER = re.compile(r'\*\*Project Owner:\*\*\s*(.+?)(?:\n|$)', re.IGNORECASE)
+PROJECT_OWNER_OUTSIDE_BOLD = re.compile(r'\*\*Project Owner\*\*[:\s]+(.+?)(?:\n|$)', re.IGNORECASE)
+WORK_SCOPE = re.compile(r'\*\*Work Scope\*\*[:\s]+(.+?)(?:\n\n|\n\*\*|$)', re.IGNORECASE | re.DOTALL)
+TABLE_KEY_VALUE = re.compile(r'\|\s*\*\*(.+?)\*\*\s*\|\s*(.+?)\s*\|')
+KEY_MARKER = re.compile(r'\*\*([^:*]+?):\*\*', re.MULTILINE)
+SEPARATOR_LINE = re.compile(r'\n\s*---\s*(\n|$)')
+TRAILING_SEPARATOR = re.compile(r'\n\s*---\s*$')
+NUMBERED_LIST_START = re.compile(r'^\d+\.\s+', re.MULTILINE)
+NEWLINES = re.compile(r'\n+')
+TRAILING_SOURCE_BLOCK = re.compile(r'\n\s*\*\*Source[:\s]*.*$', re.IGNORECASE | re.DOTALL)
+INDENTED_BULLET_PREFIX = re.compile(r'^\s*[-*•]\s*')
+BULLET_MARKER = re.compile(r'^[-*•]\s+')
+NESTED_BULLET_MARKER = re.compile(r'^\s+[-*•]\s+')
+SUBSECTION_HEADING = re.compile(r'^###\s+(.+?)$', re.MULTILINE)
+PHASE_HEADER = re.compile(r'\*\*Phase\s+(T\d+):\*\*\s*(.+?)(?=\n|$)', re.IGNORECASE | re.MULTILINE)
+PHASE_START = re.compile(r'\*\*Phase\s+T\d+', re.IGNORECASE)
+PHASE_DATE = re.compile(r'\(T\d+\s*[+\-]\s*(.+?)\)', re.IGNORECASE)
+PHASE_HEADER_OUTSIDE_BOLD = re.compile(r'\*\*Phase\s+(T\d+)\*\*[:\s]+(.+?)(?:\n|\*\*)', re.IGNORECASE | re.DOTALL)
+PHASE_OFFSET = re.compile(r'T\d+\s*[+\-]\s*(.+?)(?:\n|$)', re.IGNORECASE)
+NOTE_BOLD_PREFIX = re.compile(r'^-\s*\*\*')
+MODULE_HEADING = re.compile(r'^####\s+Module(?:\s+\d+)?\s*:\s*(.+?)$', re.IGNORECASE | re.MULTILINE)
+MODULE_HEADING_START = re.compile(r'^####\s+Module(?:\s+\d+)?\s*:\s*', re.IGNORECASE | re.MULTILINE)
+MODULE_BOLD = re.compile(r'\*\*Module\s+(?:\d+)?:\s*(.+?)\*\*', re.IGNORECASE)
+MODULE_BOLD_START = re.compile(r'\*\*Module\s+(?:\d+)?:\s*', re.IGNORECASE)
+MODULE_PLAIN = re.compile(r'(?:Module|Module Name)[:\s]+(.+?)(?:\n|$)', re.IGNORECASE | re.MULTILINE)
+FIELD_VALUE_AFTER_BOLD = re.compile(r':\*\*\s*(.+)$')
+FIELD_VALUE_AFTER_COLON = re.compile(r':\s*(.+)$')
+MERMAID_BLOCK = re.compile(r'```mermaid\s*\n(.*?)\n```', re.DOTALL)
+MERMAID_BLOCK_LOOSE = re.compile(r'```mermaid\s*\n(.*?)```', re.DOTALL)
+DETAILED_DESCRIPTION = re.compile(r'###\s+.*(?:Description|Data Flow|Components)', re.IGNORECASE)
+
+# Module description fields: (label, output key, word that disqualifies the line), in priority
+# order - when a line contains several labels the first entry wins
+MODULE_FIELDS = [
+    ("Module Type", "type", None),
+    ("Purpose Description", "purpose", None),
+    ("Alert Trigger Logic", "alert_logic", None),
+    ("Preconditions", "preconditions", "Purpose"),
+    ("Detection Criteria", "detection_criteria", None),
+    ("Image URL", "image_url", None),
+    ("Video URL", "video_url", None),
+    ("Data Requirements", "data_requirements", None),  # also "Client Data Requirements"
+]
+MODULE_FIELD_LABEL = re.compile('|'.join(re.escape(label) for label, _, _ in MODULE_FIELDS))
+
+# Output validators (validate_output.py)
+SOURCE_REFERENCE = re.compile(r'S[12]\s*-\s*["\']')
+REASONING_PATTERNS = [
+    re.compile(r'Based on\s+S[12]', re.IGNORECASE),      # "Based on S1" or "Based on S2"
+    re.compile(r'Logic:\s*[A-Z]', re.IGNORECASE),        # "Logic: ..."
+    re.compile(r'Calculated as\s*\d', re.IGNORECASE),    # "Calculated as 123"
+    re.compile(r'Extracted from\s+S[12]', re.IGNORECASE),  # "Extracted from S1"
+    re.compile(r'Source:\s*S[12]', re.IGNORECASE),       # "Source: S1"
+    re.compile(r'From\s+KB\s', re.IGNORECASE),           # "From KB ..."
+]
+# Literal (lowercase) start of each reasoning pattern: template_validator.py only tries a
+# pattern where its trigger occurs, instead of searching the whole document per pattern
+REASONING_TRIGGERS = ['based', 'logic:', 'calculated', 'extracted', 'source:', 'from']
+HORIZONTAL_RULE = re.compile(r'^---+?\s*$', re.MULTILINE)
+# First line of a section that is neither blank nor a horizontal rule
+SECTION_CONTENT = re.compile(r'^(?!---+[^\S\n]*$)[^\S\n]*\S', re.MULTILINE)
+TEMPLATE_CONTENT_REFERENCE = re.compile(r'\*\*Content in Template\*\*:')
+
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Proposal pipeline orchestrator
+Runs the skill scripts as a dependency graph of stages with declared inputs
+and outputs. A stage is skipped when the hashes of its inputs (and of the
+scripts that implement it) are unchanged since its last successful run, and
+stages that do not depend on each other run concurrently.
+
+Stages:
+    deal_transfer       Deal Transfer xlsx -> deal_transfer.json          (--deal-transfer)
+    update_template     checklist + template -> updated template           (--checklist)
+    validate_checklist  checklist + template -> checklist_validation.json  (--checklist)
+    architecture        template -> project info + Mermaid diagram
+    render              diagram -> SVG image (offline; a diagram it cannot parse is left unrendered)
+    slides              template + diagram + project info -> slide structure + summary (referencing the SVG if any)
+
+Usage:
+    python3 pipeline.py <template.md> --output-dir DIR [--checklist CHECKLIST.md] [--deal-transfer DT.xlsx]
+                        [--workers N] [--force] [--no-cache] [--watch [--debounce SECONDS]]
+
+With --watch the pipeline keeps running: it polls the stage inputs (the
+proposal, checklist, Deal Transfer file and the architecture diagram) and,
+once a burst of saves has settled, reruns only the stages those files feed.
+Watch runs happen in this process, so the skill modules and the parsed
+proposal stay loaded between iterations.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from artifact_cache import file_sha256, write_if_changed
+from capacity_planner import cost_files
+
+SHARED_DIR = Path(__file__).resolve().parent
+SKILLS_DIR = SHARED_DIR.parent
+STATE_FILE = '.pipeline_state.json'
+WATCH_INTERVAL = 0.5
+WATCH_DEBOUNCE = 0.3
+
+SCRIPTS = {
+    "deal_transfer": [SKILLS_DIR / 'proposal_outline' / 'scripts' / 'extract_deal_transfer.py',
+                      SKILLS_DIR / 'proposal_outline' / 'scripts' / 'xlsx_reader.py'],
+    "update_template": [SKILLS_DIR / 'proposal-checklist-update' / 'scripts' / 'update_template_from_checklist.py'],
+    "validate_checklist": [SKILLS_DIR / 'proposal-checklist-update' / 'scripts' / 'validate_checklist_completion.py'],
+    "architecture": [SKILLS_DIR / 'architecture-generator-skill' / 'scripts' / name
+                     for name in ('generate_architecture.py', 'parse_proposal.py', 'generate_mermaid.py',
+                                  'architecture_graph.py')],
+    "render": [SKILLS_DIR / 'architecture-generator-skill' / 'scripts' / name
+               for name in ('render_diagram.py', 'architecture_graph.py')],
+    "slides": [SKILLS_DIR / 'slide-content-mapper' / 'scripts' / 'map_to_slides.py'],
+}
+
+
+def _skill_module(skill: str, module: str):
+    """Import a skill script as a module (scripts add 01_skills/shared to sys.path themselves)"""
+    scripts_dir = str(SKILLS_DIR / skill / 'scripts')
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return importlib.import_module(module)
+
+
+# Stage implementations - run in worker processes, return (success, message)
+
+def run_deal_transfer(excel_file, output_file, use_cache):
+    extract = _skill_module('proposal_outline', 'extract_deal_transfer')
+    result = extract.extract_deal_transfer(excel_file, use_cache=use_cache)
+    if 'error' in result:
+        return False, result['error']
+    write_if_changed(output_file, json.dumps(result, indent=2, default=str))
+    return True, f"{len(result['S1']['data'])} commercial / {len(result['S2']['data'])} technical rows"
+
+
+def run_update_template(checklist_file, template_file, output_file):
+    from proposal_document import load_document
+
+    if not load_document(template_file).placeholder_ids():
+        # Template already processed - pass it through unchanged
+        write_if_changed(output_file, Path(template_file).read_text(encoding='utf-8'))
+        return True, "No placeholders in template, copied as-is"
+
+    update = _skill_module('proposal-checklist-update', 'update_template_from_checklist')
+    success, result = update.update_template_from_checklist(checklist_file, template_file, output_file)
+    if not success:
+        return False, result
+    return True, (f"{len(result['replaced'])} replaced, {len(result['kept_estimate'])} kept, "
+                  f"{len(result['not_found'])} not found")
+
+
+def run_validate_checklist(checklist_file, template_file, output_file):
+    validate = _skill_module('proposal-checklist-update', 'validate_checklist_completion')
+    errors, warnings = validate.validate_checklist_completion(checklist_file, template_file)
+    report = {"complete": not errors, "errors": errors, "warnings": warnings}
+    write_if_changed(output_file, json.dumps(report, indent=2, ensure_ascii=False))
+    if errors:
+        return False, f"Checklist is NOT complete: {len(errors)} error(s), see {Path(output_file).name}"
+    return True, f"Checklist complete ({len(warnings)} warning(s))"
+
+
+def run_architecture(proposal_file, output_dir, use_cache):
+    generate = _skill_module('architecture-generator-skill', 'generate_architecture')
+    result = generate.generate_architecture_from_proposal(proposal_file, output_dir, use_cache)
+    if not result:
+        return False, "Architecture generation failed (camera number or AI modules not found)"
+    info = result["project_info"]
+    return True, f"{info['num_cameras']} cameras, {len(info['ai_modules'])} AI modules, {info['deployment_method']}"
+
+
+def run_render(diagram_file, output_file, use_cache):
+    render = _skill_module('architecture-generator-skill', 'render_diagram')
+    try:
+        result = render.render_file(diagram_file, output_file, 'svg', use_cache)
+    except ValueError as e:
+        # Hand-edited Mermaid the offline renderer cannot parse: the slides go ahead without an image
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(output_file)  # the previous diagram's image would be stale
+        return True, f"⚠️  Not rendered ({e}); slides reference the diagram source only"
+    return True, f"{Path(output_file).name}{' (cached render)' if result['cached'] else ''}"
+
+
+def run_slides(proposal_file, architecture_diagram, output_dir, use_cache, diagram_image=None, project_info=None):
+    mapper = _skill_module('slide-content-mapper', 'map_to_slides')
+    if diagram_image and not Path(diagram_image).exists():
+        diagram_image = None
+    result = mapper.map_proposal_to_slides(proposal_file, architecture_diagram, output_dir, use_cache, diagram_image,
+                                           project_info)
+    if not result:
+        return False, "Slide mapping failed"
+    return True, f"{result['slide_structure']['total_slides']} slides"
+
+
+def _run_stage(func, kwargs):
+    """Worker: run one stage, capturing its console output"""
+    started = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            success, message = func(**kwargs)
+        outcome = {"status": "ok" if success else "failed", "message": message}
+    except (Exception, SystemExit) as e:  # skill scripts exit on unreadable files
+        outcome = {"status": "failed", "message": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    outcome["log"] = log.getvalue()
+    outcome["seconds"] = round(time.perf_counter() - started, 4)
+    return outcome
+
+
+def build_stages(template_file, output_dir, checklist_file=None, deal_transfer_file=None, use_cache=True):
+    """
+    Declare the pipeline graph
+
+    Returns:
+        List of stage dicts: name, deps, inputs, outputs, func, kwargs
+    """
+    template_file = Path(template_file).resolve()
+    output_dir = Path(output_dir).resolve()
+    stages = []
+
+    if deal_transfer_file:
+        output_file = output_dir / 'deal_transfer.json'
+        stages.append({
+            "name": "deal_transfer", "deps": [],
+            "inputs": [Path(deal_transfer_file).resolve()], "outputs": [output_file],
+            "func": run_deal_transfer,
+            "kwargs": {"excel_file": str(Path(deal_transfer_file).resolve()), "output_file": str(output_file),
+                       "use_cache": use_cache},
+        })
+
+    proposal_file = template_file
+    proposal_deps = []
+    if checklist_file:
+        checklist_file = Path(checklist_file).resolve()
+        proposal_file = output_dir / template_file.name
+        proposal_deps = ["update_template"]
+        stages.append({
+            "name": "update_template", "deps": [],
+            "inputs": [checklist_file, template_file], "outputs": [proposal_file],
+            "func": run_update_template,
+            "kwargs": {"checklist_file": str(checklist_file), "template_file": str(template_file),
+                       "output_file": str(proposal_file)},
+        })
+        validation_file = output_dir / 'checklist_validation.json'
+        stages.append({
+            "name": "validate_checklist", "deps": [],
+            "inputs": [checklist_file, template_file], "outputs": [validation_file],
+            "func": run_validate_checklist,
+            "kwargs": {"checklist_file": str(checklist_file), "template_file": str(template_file),
+                       "output_file": str(validation_file)},
+        })
+
+    architecture_dir = output_dir / 'architecture'
+    diagram_file = architecture_dir / f"{proposal_file.stem}_architecture_diagram.md"
+    project_info_file = architecture_dir / f"{proposal_file.stem}_project_info.json"
+    # The module cost table sizes the hardware in the diagram labels and the capacity slide
+    stages.append({
+        "name": "architecture", "deps": proposal_deps,
+        "inputs": [proposal_file] + cost_files(),
+        "outputs": [project_info_file, diagram_file],
+        "func": run_architecture,
+        "kwargs": {"proposal_file": str(proposal_file), "output_dir": str(architecture_dir), "use_cache": use_cache},
+    })
+
+    image_file = architecture_dir / f"{proposal_file.stem}_architecture.svg"
+    stages.append({
+        "name": "render", "deps": ["architecture"],
+        "inputs": [diagram_file], "outputs": [image_file],
+        "func": run_render,
+        "kwargs": {"diagram_file": str(diagram_file), "output_file": str(image_file), "use_cache": use_cache},
+    })
+
+    slides_dir = output_dir / 'slides'
+    stages.append({
+        "name": "slides", "deps": proposal_deps + ["architecture", "render"],
+        "inputs": [proposal_file, diagram_file, project_info_file, image_file] + cost_files(),
+        "outputs": [slides_dir / f"{proposal_file.stem}_slide_structure.json",
+                    slides_dir / f"{proposal_file.stem}_slide_content.md"],
+        "func": run_slides,
+        "kwargs": {"proposal_file": str(proposal_file), "architecture_diagram": str(diagram_file),
+                   "output_dir": str(slides_dir), "use_cache": use_cache, "diagram_image": str(image_file),
+                   "project_info": str(project_info_file)},
+    })
+    return stages
+
+
+def _hash_files(paths) -> Dict[str, str]:
+    """SHA-256 per existing file (missing files hash to None)"""
+    return {str(path): file_sha256(path) if Path(path).exists() else None for path in paths}
+
+
+def stage_fingerprint(stage) -> str:
+    """Hash of a stage's input files, its parameters and the code that implements it"""
+    digest = hashlib.sha256()
+    digest.update(stage["name"].encode('utf-8'))
+    digest.update(json.dumps(stage["kwargs"], sort_keys=True).encode('utf-8'))
+    code_files = SCRIPTS[stage["name"]] + sorted(SHARED_DIR.glob('*.py'))
+    for path, sha in sorted(_hash_files(list(stage["inputs"]) + code_files).items()):
+        digest.update(f"{path}\0{sha}\0".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_state(output_dir) -> Dict[str, Any]:
+    try:
+        return json.loads((Path(output_dir) / STATE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(output_dir, state):
+    write_if_changed(Path(output_dir) / STATE_FILE, json.dumps(state, indent=2, sort_keys=True))
+
+
+def is_up_to_date(stage, fingerprint, state, check_outputs=True) -> bool:
+    """True if the stage last succeeded with the same fingerprint and (if check_outputs) its outputs are untouched"""
+    previous = state.get(stage["name"])
+    if not previous or previous.get("fingerprint") != fingerprint:
+        return False
+    return not check_outputs or previous.get("outputs") == _hash_files(stage["outputs"])
+
+
+class _InlineExecutor:
+    """Stand-in for the process pool that runs each stage in this process as it is submitted"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+
+def run_pipeline(stages: List[Dict[str, Any]], output_dir, workers=None, force=False, on_event=None,
+                 inline=False, keep_edited_outputs=False):
+    """
+    Run stages in dependency order, skipping up-to-date stages and running
+    independent stages concurrently
+
+    Args:
+        inline: Run the stages one by one in this process instead of a process pool
+        keep_edited_outputs: Do not rerun a stage just because its outputs were edited by hand
+            (stages reading those outputs still rerun, as their inputs changed)
+
+    Returns:
+        Dict stage name -> result (status: ok / skipped / failed / blocked)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for stage in stages:
+        for output in stage["outputs"]:
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+
+    by_name = {stage["name"]: stage for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage["deps"] if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Stage {stage['name']} depends on unknown stage(s): {', '.join(unknown)}")
+
+    state = {} if force else load_state(output_dir)
+    results = {}
+    pending = list(stages)
+    running = {}
+    fingerprints = {}
+    workers = max(1, min(workers or os.cpu_count() or 1, len(stages)))
+    notify = on_event or (lambda name, result: None)
+
+    with (_InlineExecutor() if inline else ProcessPoolExecutor(max_workers=workers)) as pool:
+        while pending or running:
+            # Schedule every stage whose dependencies have finished
+            for stage in list(pending):
+                dep_results = [results.get(dep) for dep in stage["deps"]]
+                if any(result is None for result in dep_results):
+                    continue
+                pending.remove(stage)
+                name = stage["name"]
+
+                failed_deps = [dep for dep, result in zip(stage["deps"], dep_results)
+                               if result["status"] in ("failed", "blocked")]
+                if failed_deps:
+                    results[name] = {"status": "blocked", "message": f"Blocked by {', '.join(failed_deps)}"}
+                    notify(name, results[name])
+                    continue
+
+                fingerprints[name] = stage_fingerprint(stage)
+                if is_up_to_date(stage, fingerprints[name], state, check_outputs=not keep_edited_outputs):
+                    results[name] = {"status": "skipped", "message": "Inputs unchanged"}
+                    notify(name, results[name])
+                    continue
+
+                running[pool.submit(_run_stage, stage["func"], stage["kwargs"])] = stage
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle between stages: {', '.join(s['name'] for s in pending)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                name = stage["name"]
+                results[name] = future.result()
+                if results[name]["status"] == "ok":
+                    state[name] = {"fingerprint": fingerprints[name], "outputs": _hash_files(stage["outputs"])}
+                else:
+                    state.pop(name, None)
+                save_state(output_dir, state)
+                notify(name, results[name])
+
+    return results
+
+
+def watched_files(stages) -> List[Path]:
+    """Every stage input, generated ones included (a hand-edited diagram reruns the slides)"""
+    paths = []
+    for stage in stages:
+        for path in stage["inputs"]:
+            if Path(path) not in paths:
+                paths.append(Path(path))
+    return paths
+
+
+def _snapshot(paths) -> Dict[str, Any]:
+    """(mtime, size) per path, None for missing files"""
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            snapshot[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            snapshot[str(path)] = None
+    return snapshot
+
+
+def watch_pipeline(stages, output_dir, interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE, force=False,
+                   on_event=None, on_change=None, on_run=None, max_runs=None):
+    """
+    Run the pipeline, then rerun it whenever a watched input changes
+
+    Changes are picked up by polling (mtime and size) every interval seconds
+    and debounced: a run starts once the files have stayed the same for
+    debounce seconds, so an editor's save burst triggers one run. Files
+    written by a run do not trigger the next one. The watch stops when a
+    pipeline script changes (the loaded code would be stale) or after
+    max_runs runs.
+
+    Returns:
+        Results of the last run
+    """
+    paths = watched_files(stages)
+    code_files = sorted({path for files in SCRIPTS.values() for path in files} | set(SHARED_DIR.glob('*.py')))
+    code = _snapshot(code_files)
+    notify_change = on_change or (lambda changed: None)
+    notify_run = on_run or (lambda results: None)
+
+    results = run_pipeline(stages, output_dir, force=force, on_event=on_event, inline=True)
+    notify_run(results)
+    runs = 1
+    while max_runs is None or runs < max_runs:
+        baseline = _snapshot(paths)
+        current = baseline
+        while current == baseline:
+            time.sleep(interval)
+            if _snapshot(code_files) != code:
+                return results
+            current = _snapshot(paths)
+
+        settled = None
+        while settled != current:
+            settled = current
+            time.sleep(debounce)
+            current = _snapshot(paths)
+
+        notify_change([Path(path) for path in current if current[path] != baseline[path]])
+        results = run_pipeline(stages, output_dir, on_event=on_event, inline=True, keep_edited_outputs=True)
+        notify_run(results)
+        runs += 1
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run the proposal skills as an incremental dependency graph'
+    )
+    parser.add_argument('template_file', help='Proposal template markdown')
+    parser.add_argument('--output-dir', '-o', required=True, help='Directory for all pipeline outputs')
+    parser.add_argument('--checklist', help='Presale checklist to apply and validate')
+    parser.add_argument('--deal-transfer', help='Deal Transfer Excel file to extract')
+    parser.add_argument('--workers', '-w', type=int, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rerun every stage even if its inputs are unchanged')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the artifact cache inside stages')
+    parser.add_argument('--watch', action='store_true', help='Keep running and rerun affected stages when inputs change')
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE,
+                        help=f'--watch: seconds the inputs must stay unchanged before a rerun (default: {WATCH_DEBOUNCE})')
+
+    args = parser.parse_args()
+
+    if not Path(args.template_file).exists():
+        print(f"❌ Template file not found: {args.template_file}")
+        sys.exit(1)
+
+    stages = build_stages(args.template_file, args.output_dir, args.checklist, args.deal_transfer,
+                          use_cache=not args.no_cache)
+    print(f"📄 Pipeline: {' -> '.join(stage['name'] for stage in stages)}\n")
+
+    icons = {"ok": "✅", "skipped": "♻️ ", "failed": "❌", "blocked": "⛔"}
+
+    def report(name, result):
+        seconds = f" {result['seconds']:.2f}s" if "seconds" in result else ""
+        print(f"{icons[result['status']]} {name:<20}{seconds} - {result['message']}")
+
+    def summarize(results, started):
+        failed = [name for name, result in results.items() if result["status"] in ("failed", "blocked")]
+        for name in failed:
+            if results[name].get("log"):
+                print(f"\n--- {name} output ---\n{results[name]['log'].rstrip()}")
+
+        print(f"\n{'='*50}")
+        ran = sum(1 for result in results.values() if result["status"] == "ok")
+        skipped = sum(1 for result in results.values() if result["status"] == "skipped")
+        print(f"Ran: {ran}, Skipped: {skipped}, Failed: {len(failed)}")
+        print(f"Elapsed: {time.perf_counter() - started:.2f}s")
+        print(f"📁 Outputs: {Path(args.output_dir).resolve()}")
+        return failed
+
+    if args.watch:
+        run_started = [time.perf_counter()]
+
+        def on_change(changed):
+            print(f"\n🔄 Changed: {', '.join(path.name for path in changed)}")
+            run_started[0] = time.perf_counter()
+
+        def on_run(results):
+            summarize(results, run_started[0])
+            print(f"👀 Watching {len(watched_files(stages))} file(s) for changes (Ctrl+C to stop)", flush=True)
+
+        try:
+            watch_pipeline(stages, args.output_dir, debounce=args.debounce, force=args.force,
+                           on_event=report, on_change=on_change, on_run=on_run)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+            return
+        print("\n⚠️  Pipeline scripts changed on disk; restart the watch to load them")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    results = run_pipeline(stages, args.output_dir, args.workers, args.force, on_event=report)
+    failed = summarize(results, started)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
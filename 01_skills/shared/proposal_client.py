@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Thin client for proposal_daemon.py
+Sends one script invocation (name, arguments, working directory) to the warm
+daemon and replays its stdout, stderr and exit code, so it behaves exactly
+like running the script directly. If no daemon is listening - or it cannot
+serve the request (different PROPOSAL_* settings, code changed since it
+started) - the script runs in this process instead.
+
+Kept to cheap imports on purpose: this is what editors launch per call.
+
+Usage:
+    python3 proposal_client.py <script> [args...]
+    python3 proposal_client.py validate_output my_template.md
+
+Set PROPOSAL_DAEMON_AUTOSTART=1 to start a daemon in the background when none
+is running (the current call still runs in-process).
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+
+DEFAULT_SOCKET_NAME = 'proposal-skills-{uid}.sock'
+CONNECT_TIMEOUT_SECONDS = 0.2
+
+
+def socket_path() -> str:
+    """Daemon socket: PROPOSAL_DAEMON_SOCKET, else a per-user socket in the runtime/temp directory"""
+    configured = os.environ.get('PROPOSAL_DAEMON_SOCKET')
+    if configured:
+        return configured
+    directory = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(directory, DEFAULT_SOCKET_NAME.format(uid=uid))
+
+
+def socket_trusted(path: str) -> bool:
+    """
+    Whether path is a socket owned by this user
+
+    The default path in a shared temp directory is predictable, so another
+    user could listen there first; requests (argv, cwd, PROPOSAL_* settings)
+    only go to a socket this user created.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(info.st_mode):
+        return False
+    return not hasattr(os, 'getuid') or info.st_uid == os.getuid()
+
+
+def proposal_env() -> dict:
+    """PROPOSAL_* settings of this process; the daemon only serves callers with the same settings"""
+    return {key: value for key, value in os.environ.items()
+            if key.startswith('PROPOSAL_') and not key.startswith('PROPOSAL_DAEMON_')}
+
+
+def call(method: str, params=None, path=None, timeout=None):
+    """
+    Send one JSON-RPC request to the daemon
+
+    Returns:
+        The result dict, or None if no daemon is reachable, the socket is not
+        this user's (see socket_trusted) or the daemon declined the request
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = path or socket_path()
+    if not socket_trusted(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT_SECONDS)
+            sock.connect(path)
+            sock.settimeout(timeout)
+            request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    response = json.loads(line)
+    return response.get("result")
+
+
+def run(script: str, argv) -> int:
+    """Run script with argv through the daemon (or in-process); returns its exit code"""
+    result = call("run", {"script": script, "argv": list(argv), "cwd": os.getcwd(), "env": proposal_env()})
+    if result is None:
+        if os.environ.get('PROPOSAL_DAEMON_AUTOSTART') == '1' and hasattr(socket, 'AF_UNIX'):
+            _start_daemon()
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from proposal_daemon import run_script
+        result = run_script(script, argv)
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["exit_code"]
+
+
+def _start_daemon():
+    import subprocess
+
+    daemon = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'proposal_daemon.py')
+    subprocess.Popen([sys.executable, daemon, 'serve'], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 proposal_client.py <script> [args...]")
+        sys.exit(1)
+
+    sys.exit(run(sys.argv[1], sys.argv[2:]))
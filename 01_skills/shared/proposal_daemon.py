@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Long-lived daemon that keeps the skill scripts warm
+Imports every script once (with its regexes, shared modules and the parsed
+document cache) and then runs script invocations on request - same arguments,
+working directory, stdout, stderr and exit code as the command line - over a
+Unix socket or JSON-RPC on stdin/stdout. proposal_client.py is the matching
+thin client and falls back to running the script in-process.
+
+Protocol: one JSON-RPC 2.0 request per line, one response per line
+    {"jsonrpc": "2.0", "id": 1, "method": "run",
+     "params": {"script": "validate_output", "argv": ["x_template.md"], "cwd": "/work", "env": {...}}}
+    -> {"jsonrpc": "2.0", "id": 1, "result": {"stdout": "...", "stderr": "", "exit_code": 0, "seconds": 0.001}}
+Methods: run, ping, shutdown. A run is refused (error) when the caller's
+PROPOSAL_* settings differ from the daemon's, and after any loaded script
+or shared module changed on disk (the daemon then exits).
+
+Requests are handled one at a time: scripts use the process-wide argv,
+working directory and stdout.
+
+Usage:
+    python3 proposal_daemon.py serve [--stdio] [--socket PATH] [--idle-timeout SECONDS]
+    python3 proposal_daemon.py start | stop | status [--socket PATH]
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+SHARED_DIR = Path(__file__).resolve().parent
+SKILLS_DIR = SHARED_DIR.parent
+sys.path.insert(0, str(SHARED_DIR))
+
+from proposal_client import call, proposal_env, socket_path, socket_trusted
+
+# Script name -> skill holding it; each script's command line is its main()
+SCRIPTS = {
+    "extract_deal_transfer": 'proposal_outline',
+    "validate_output": 'proposal_outline',
+    "generate_architecture": 'architecture-generator-skill',
+    "render_diagram": 'architecture-generator-skill',
+    "map_to_slides": 'slide-content-mapper',
+    "update_template_from_checklist": 'proposal-checklist-update',
+    "validate_checklist_completion": 'proposal-checklist-update',
+    "validate_no_placeholders": 'proposal-checklist-update',
+    "template_validator": 'shared',
+    "capacity_planner": 'shared',
+}
+DEFAULT_IDLE_TIMEOUT = 1800
+START_TIMEOUT_SECONDS = 10
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SETTINGS_DIFFER = -32001
+CODE_CHANGED = -32002
+
+
+def load_script(name: str):
+    """Import a script as a module (once per process)"""
+    skill = SCRIPTS[name]
+    scripts_dir = str(SHARED_DIR if skill == 'shared' else SKILLS_DIR / skill / 'scripts')
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return importlib.import_module(name)
+
+
+def _exit_code(code) -> int:
+    """Process exit status for a SystemExit code, as the interpreter computes it"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_script(name: str, argv, cwd=None) -> Dict[str, Any]:
+    """
+    Run a script's command line in this process
+
+    Returns:
+        Dict with stdout, stderr, exit_code and seconds
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    started = time.perf_counter()
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    exit_code = 0
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                if name not in SCRIPTS:
+                    raise SystemExit(f"❌ Unknown script: {name} (available: {', '.join(sorted(SCRIPTS))})")
+                module = load_script(name)
+                sys.argv = [f'{name}.py'] + [str(arg) for arg in argv]
+                if cwd:
+                    os.chdir(cwd)
+                module.main()
+            except SystemExit as e:
+                exit_code = _exit_code(e.code)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "exit_code": exit_code,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def _response(request_id, result=None, error_code=None, message=None) -> Dict[str, Any]:
+    if error_code is not None:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": error_code, "message": message}}
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+class ProposalDaemon:
+    """Request handling shared by the socket and stdio transports"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = 0
+        self.stopping = False
+        self.env = proposal_env()
+        self.code_mtimes: Dict[str, int] = {}
+
+    def preload(self):
+        """Import every script up front so the first request is warm too"""
+        for name in SCRIPTS:
+            load_script(name)
+        self.code_changed()
+
+    def code_changed(self) -> bool:
+        """True if a loaded module under 01_skills changed on disk since it was first seen"""
+        changed = False
+        for module in list(sys.modules.values()):
+            path = getattr(module, '__file__', None)
+            if not path or not path.startswith(str(SKILLS_DIR)):
+                continue
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            changed = changed or self.code_mtimes.setdefault(path, mtime) != mtime
+        return changed
+
+    def handle_line(self, line) -> Optional[Dict[str, Any]]:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return _response(None, error_code=PARSE_ERROR, message="Parse error")
+        return self.handle(message)
+
+    def handle(self, message) -> Optional[Dict[str, Any]]:
+        """Answer one JSON-RPC request (None for notifications)"""
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return _response(None, error_code=INVALID_REQUEST, message="Invalid request")
+        request_id = message.get("id")
+        params = message.get("params") or {}
+        method = message["method"]
+
+        if method == "run":
+            script, argv = params.get("script"), params.get("argv", [])
+            if script not in SCRIPTS or not isinstance(argv, list):
+                response = _response(request_id, error_code=INVALID_PARAMS,
+                                     message=f"Expected a script in {sorted(SCRIPTS)} and a list of arguments")
+            elif params.get("env") is not None and params["env"] != self.env:
+                response = _response(request_id, error_code=SETTINGS_DIFFER,
+                                     message="PROPOSAL_* settings differ from the daemon's")
+            elif self.code_changed():
+                self.stopping = True
+                response = _response(request_id, error_code=CODE_CHANGED,
+                                     message="Scripts changed on disk; daemon is exiting")
+            else:
+                self.requests += 1
+                response = _response(request_id, run_script(script, argv, params.get("cwd")))
+        elif method == "ping":
+            response = _response(request_id, {
+                "pid": os.getpid(),
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "scripts": sorted(SCRIPTS),
+            })
+        elif method == "shutdown":
+            self.stopping = True
+            response = _response(request_id, {"stopping": True})
+        else:
+            response = _response(request_id, error_code=METHOD_NOT_FOUND, message=f"Unknown method: {method}")
+
+        return response if "id" in message else None
+
+
+def serve_stdio(daemon: ProposalDaemon, stdin=None, stdout=None):
+    """Serve requests read from stdin, writing responses to stdout (the protocol owns both)"""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = daemon.handle_line(line)
+        if response is not None:
+            stdout.write(json.dumps(response, ensure_ascii=False) + '\n')
+            stdout.flush()
+        if daemon.stopping:
+            break
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    timeout = 60  # drop connections idle this long so other clients are not blocked
+
+    def handle(self):
+        daemon = self.server.proposal_daemon
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                response = daemon.handle_line(line)
+                if response is not None:
+                    self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+                if daemon.stopping:
+                    return
+        except OSError:
+            pass
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    def handle_timeout(self):
+        self.proposal_daemon.stopping = True
+
+
+def serve_socket(daemon: ProposalDaemon, path: str, idle_timeout: float):
+    """Serve requests on a Unix socket until shutdown, idle timeout or a code change"""
+    if os.path.lexists(path):
+        if not socket_trusted(path):
+            raise RuntimeError(f"{path} exists and is not this user's socket; set PROPOSAL_DAEMON_SOCKET")
+        if call("ping", path=path) is not None:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        os.unlink(path)  # left behind by a daemon that was killed
+
+    # Socket usable by this user only (set before any request is served, while single-threaded)
+    umask = os.umask(0o077)
+    try:
+        server = _UnixServer(path, _RequestHandler)
+    finally:
+        os.umask(umask)
+    server.proposal_daemon = daemon
+    server.timeout = idle_timeout or None
+    try:
+        while not daemon.stopping:
+            server.handle_request()
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+
+
+def _start(path: str) -> bool:
+    """Start a background daemon on path and wait until it answers"""
+    subprocess.Popen([sys.executable, str(Path(__file__).resolve()), 'serve', '--socket', path],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+    deadline = time.time() + START_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        if call("ping", path=path) is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep the proposal skill scripts warm in a long-lived process')
+    parser.add_argument('command', choices=['serve', 'start', 'stop', 'status'])
+    parser.add_argument('--socket', default=None, help='Socket path (default: PROPOSAL_DAEMON_SOCKET or per-user temp socket)')
+    parser.add_argument('--stdio', action='store_true', help='serve: JSON-RPC on stdin/stdout instead of a socket')
+    parser.add_argument('--idle-timeout', type=float,
+                        default=float(os.environ.get('PROPOSAL_DAEMON_IDLE_SECONDS', DEFAULT_IDLE_TIMEOUT)),
+                        help=f'serve: exit after this many idle seconds, 0 = never (default: {DEFAULT_IDLE_TIMEOUT})')
+    args = parser.parse_args()
+    path = args.socket or socket_path()
+
+    if args.command == 'serve':
+        daemon = ProposalDaemon()
+        daemon.preload()
+        if args.stdio:
+            serve_stdio(daemon)
+            return
+        if not hasattr(socket, 'AF_UNIX'):
+            print("❌ Unix sockets are not available here; use serve --stdio")
+            sys.exit(1)
+        try:
+            serve_socket(daemon, path, args.idle_timeout)
+        except (OSError, RuntimeError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+
+    status = call("ping", path=path)
+    if args.command == 'status':
+        if status is None:
+            print(f"⚪ No daemon on {path}")
+            sys.exit(1)
+        print(f"🟢 Daemon pid {status['pid']} on {path}: up {status['uptime_seconds']}s, "
+              f"{status['requests']} request(s) served")
+    elif args.command == 'stop':
+        if status is None:
+            print(f"⚪ No daemon on {path}")
+            return
+        call("shutdown", path=path)
+        print(f"🛑 Stopped daemon pid {status['pid']}")
+    elif status is not None:
+        print(f"🟢 Daemon already running (pid {status['pid']}) on {path}")
+    elif _start(path):
+        print(f"🟢 Daemon started on {path}")
+    else:
+        print(f"❌ Daemon did not come up on {path} within {START_TIMEOUT_SECONDS}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Shared markdown document model for proposal templates and checklists
+Parses a proposal into headings, sections, tables, key/value fields,
+numbered lists and placeholders (each on first use) so every skill script
+can reuse the result
+"""
+
+import sys
+from bisect import bisect_right
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import patterns
+
+
+class ProposalDocument:
+    """Markdown proposal parsed once into a reusable document model"""
+
+    def __init__(self, content: str, path: Optional[str] = None):
+        self.content = content
+        self.path = Path(path) if path else None
+        self._section_cache = {}
+
+    @classmethod
+    def from_file(cls, markdown_file) -> 'ProposalDocument':
+        """Read and parse a markdown file"""
+        path = Path(markdown_file)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), path)
+
+    # Parsed views, each built on first access and then reused
+
+    @cached_property
+    def _line_starts(self) -> List[int]:
+        return [0] + [m.end() for m in patterns.NEWLINE.finditer(self.content)]
+
+    @cached_property
+    def headings(self) -> List[Dict[str, Any]]:
+        return self._parse_headings()
+
+    @cached_property
+    def sections(self) -> Dict[str, str]:
+        return self._build_sections()
+
+    @cached_property
+    def tables(self) -> List[Dict[str, Any]]:
+        return self._parse_tables()
+
+    @cached_property
+    def fields(self) -> Dict[str, Dict[str, Any]]:
+        return self._parse_fields()
+
+    @cached_property
+    def numbered_lists(self) -> List[Dict[str, Any]]:
+        return self._parse_numbered_lists()
+
+    @cached_property
+    def placeholders(self) -> List[Dict[str, Any]]:
+        return self._parse_placeholders()
+
+    # Parsing
+
+    def _parse_headings(self) -> List[Dict[str, Any]]:
+        """Tokenize all markdown headings into an offset index"""
+        headings = []
+        for match in patterns.HEADING.finditer(self.content):
+            headings.append({
+                "level": len(match.group(1)),
+                "title": match.group(2),
+                "key": normalize_name(match.group(2)),
+                "start": match.start(),
+                "end": match.end(),
+                "line": self.line_number(match.start()),
+            })
+
+        # body_end: next ## (or deeper) heading, i.e. content directly under the heading
+        # section_end: next heading at the same or a higher level (## is the top level)
+        body_end = len(self.content)
+        section_ends = {}
+        for heading in reversed(headings):
+            heading["body_end"] = body_end
+            heading["section_end"] = min(
+                [end for level, end in section_ends.items() if 2 <= level <= max(heading["level"], 2)],
+                default=len(self.content)
+            )
+            if heading["level"] >= 2:
+                body_end = heading["start"]
+                section_ends[heading["level"]] = heading["start"]
+        return headings
+
+    def _build_sections(self) -> Dict[str, str]:
+        """Map each ## section title to its stripped content"""
+        sections = {}
+        for heading in self.headings:
+            if heading["level"] == 2:
+                sections[heading["title"]] = self.content[heading["end"]:heading["section_end"]].strip()
+        return sections
+
+    def _parse_tables(self) -> List[Dict[str, Any]]:
+        """Parse runs of consecutive |-prefixed lines into tables"""
+        tables = []
+        current = None
+        for line_no, start in enumerate(self._line_starts, 1):
+            end = self.content.find('\n', start)
+            if end == -1:
+                end = len(self.content)
+            line = self.content[start:end].strip()
+
+            if not line.startswith('|'):
+                current = None
+                continue
+
+            if current is None:
+                current = {"start": start, "end": end, "line": line_no, "headers": split_table_row(line), "rows": []}
+                tables.append(current)
+                continue
+
+            current["end"] = end
+            if not patterns.TABLE_SEPARATOR.match(line):
+                current["rows"].append(split_table_row(line))
+        return tables
+
+    def _parse_fields(self) -> Dict[str, Dict[str, Any]]:
+        """Parse **Key:** Value fields, keeping the first occurrence of each key"""
+        fields = {}
+        for match in patterns.FIELD.finditer(self.content):
+            key = normalize_name(match.group(1))
+            if key in fields:
+                continue
+            line_end = self.content.find('\n', match.end())
+            if line_end == -1:
+                line_end = len(self.content)
+            value = self.content[match.end():line_end].strip()
+            if not value:
+                # Value on the following non-blank line (e.g. a list after the field)
+                rest = self.content[line_end:].lstrip()
+                value = rest.split('\n', 1)[0].strip() if rest else ""
+            fields[key] = {"name": match.group(1).strip(), "value": value, "start": match.start(), "end": match.end()}
+        return fields
+
+    def _parse_numbered_lists(self) -> List[Dict[str, Any]]:
+        """Parse runs of consecutive '1. item' lines"""
+        lists = []
+        current = None
+        for start in self._line_starts:
+            end = self.content.find('\n', start)
+            if end == -1:
+                end = len(self.content)
+            line = self.content[start:end]
+
+            match = patterns.NUMBERED_ITEM.match(line) if line[:1].isdigit() else None
+            if not match:
+                current = None
+                continue
+
+            if current is None:
+                current = {"start": start, "end": end, "items": []}
+                lists.append(current)
+            current["end"] = end
+            current["items"].append(match.group(1).strip())
+        return lists
+
+    def _parse_placeholders(self) -> List[Dict[str, Any]]:
+        """Find all [ID_NNN] placeholders with their line and estimated value"""
+        placeholders = []
+        for match in patterns.PLACEHOLDER.finditer(self.content):
+            start = match.start()
+            line_no = self.line_number(start)
+            placeholders.append({
+                "id": match.group(1),
+                "start": start,
+                "end": match.end(),
+                "line": line_no,
+                "value": estimated_value(self.content, start),
+            })
+        return placeholders
+
+    # Lookup helpers
+
+    def line_number(self, offset: int) -> int:
+        """1-based line number of a character offset"""
+        return bisect_right(self._line_starts, offset)
+
+    @property
+    def title(self) -> Optional[str]:
+        """Title from the first # heading"""
+        for heading in self.headings:
+            if heading["level"] == 1:
+                return heading["title"]
+        return None
+
+    def section_range(self, name: str) -> Optional[tuple]:
+        """(start, end) offsets of the first ## (or deeper) heading body whose title starts with name"""
+        key = normalize_name(name)
+        if key not in self._section_cache:
+            section_range = None
+            for heading in self.headings:
+                if heading["level"] >= 2 and heading["key"].startswith(key):
+                    section_range = (min(heading["end"] + 1, heading["body_end"]), heading["body_end"])
+                    break
+            self._section_cache[key] = section_range
+        return self._section_cache[key]
+
+    def section(self, name: str) -> Optional[str]:
+        """Body of the first ## (or deeper) heading whose title starts with name"""
+        section_range = self.section_range(name)
+        if section_range is None:
+            return None
+        return self.content[section_range[0]:section_range[1]]
+
+    def subsections(self, section_title: str) -> Dict[str, str]:
+        """Map each ### heading under a ## section to its stripped content"""
+        subsections = {}
+        parent = None
+        for heading in self.headings:
+            if heading["level"] == 2:
+                parent = heading["title"]
+            elif heading["level"] == 3 and parent == section_title:
+                subsections[heading["title"]] = self.content[heading["end"]:heading["section_end"]].strip()
+        return subsections
+
+    def field(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Value of the first **Name:** field (case-insensitive)"""
+        field = self.fields.get(normalize_name(name))
+        return field["value"] if field else default
+
+    def find_table(self, column: str) -> Optional[Dict[str, Any]]:
+        """First table whose header row contains the given column"""
+        for table in self.tables:
+            if column in table["headers"]:
+                return table
+        return None
+
+    def numbered_list_after(self, offset: int) -> Optional[Dict[str, Any]]:
+        """First numbered list that starts at or after the given offset"""
+        for numbered_list in self.numbered_lists:
+            if numbered_list["start"] >= offset:
+                return numbered_list
+        return None
+
+    def placeholder_ids(self) -> set:
+        """Set of all placeholder IDs in the document"""
+        return {p["id"] for p in self.placeholders}
+
+
+def as_document(content) -> ProposalDocument:
+    """Wrap raw markdown in a ProposalDocument (parsed documents pass through)"""
+    if isinstance(content, ProposalDocument):
+        return content
+    return ProposalDocument(content)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a heading or field name for lookup (case and whitespace insensitive)"""
+    return ' '.join(name.split()).lower()
+
+
+def estimated_value(content: str, start: int) -> Optional[str]:
+    """
+    Estimated value written before the placeholder at start ("30 Mbps [NETWORK_001]")
+
+    Text after the previous bracket on a single line, separated from the
+    placeholder by whitespace (same result as the validators' former regex).
+    None if there is no such text.
+    """
+    boundary = max(content.rfind('[', 0, start), content.rfind(']', 0, start)) + 1
+    value_end = start
+    while value_end > boundary and content[value_end - 1].isspace():
+        value_end -= 1
+    if value_end == start:
+        return None
+
+    if value_end > boundary:
+        value_start = max(boundary, content.rfind('\n', 0, value_end) + 1)
+        return content[value_start:value_end]
+
+    # Only whitespace since the previous bracket: the regex takes a single character
+    for pos in range(boundary, start - 1):
+        if content[pos] != '\n':
+            return content[pos]
+    return None
+
+
+def split_table_row(line: str) -> List[str]:
+    """Split a markdown table row into stripped cells"""
+    return [cell.strip() for cell in line.strip().split('|')[1:-1]]
+
+
+def parse_checklist_table(document: ProposalDocument):
+    """
+    Extract placeholder IDs and presale answers from the checklist table(s)
+
+    Returns:
+        (placeholders, error) where placeholders maps ID -> answer
+    """
+    tables = [table for table in document.tables if 'ID' in table["headers"]]
+    if not tables:
+        return None, "Checklist table not found"
+
+    if not any(table["rows"] for table in tables):
+        return None, "Checklist table has no data rows"
+
+    placeholders = {}
+    for table in tables:
+        columns = table["headers"]
+        try:
+            id_col = columns.index('ID')
+            answer_col = columns.index("presale's Answer")
+        except ValueError as e:
+            return None, f"Required columns not found: {e}"
+
+        for cells in table["rows"]:
+            if len(cells) > max(id_col, answer_col):
+                # Remove brackets if present (e.g., [NETWORK_001] -> NETWORK_001)
+                placeholder_id = cells[id_col].replace('[', '').replace(']', '')
+                if placeholder_id:
+                    placeholders[placeholder_id] = cells[answer_col]
+
+    return placeholders, None
+
+
+_document_cache = {}
+# Parsed documents kept per process (least recently used are dropped first)
+DOCUMENT_CACHE_SIZE = 64
+
+
+def load_document(markdown_file) -> ProposalDocument:
+    """
+    Load a ProposalDocument, reusing the parsed model while the file is unchanged
+
+    Scripts that run in the same process (pipeline, daemon, watch mode) share
+    one parse per file instead of each re-reading and re-scanning it.
+    """
+    path = Path(markdown_file).resolve()
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _document_cache.pop(path, None)
+    if cached and cached[0] == signature:
+        _document_cache[path] = cached
+        return cached[1]
+
+    document = ProposalDocument.from_file(path)
+    _document_cache[path] = (signature, document)
+    while len(_document_cache) > DOCUMENT_CACHE_SIZE:
+        del _document_cache[next(iter(_document_cache))]
+    return document
+
+
+if __name__ == "__main__":
+    import json
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 proposal_document.py <proposal_file.md>")
+        sys.exit(1)
+
+    doc = load_document(sys.argv[1])
+    print(json.dumps({
+        "title": doc.title,
+        "headings": [{"level": h["level"], "title": h["title"], "line": h["line"]} for h in doc.headings],
+        "tables": len(doc.tables),
+        "fields": {f["name"]: f["value"] for f in doc.fields.values()},
+        "numbered_lists": [nl["items"] for nl in doc.numbered_lists],
+        "placeholders": sorted(doc.placeholder_ids()),
+    }, indent=2, ensure_ascii=False))
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Crash- and concurrency-safe output writer
+Outputs are written to a temp file in the target directory, fsynced and
+renamed over the target, so readers see either the old or the new file and
+never a truncated one. Writers of the same path are serialized with an
+advisory lock (fcntl.flock on a per-path lock file in PROPOSAL_LOCK_DIR or a
+per-user temp directory, so output directories stay clean), and a write whose bytes match the existing
+file is skipped so its mtime - and any watcher or cache keyed on it - is
+left alone.
+"""
+
+import hashlib
+import os
+import secrets
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None
+
+
+DEFAULT_LOCK_DIR_NAME = 'proposal-skills-locks-{uid}'
+
+
+def lock_path(path) -> Path:
+    """Lock file for an output path (one per absolute path; PROPOSAL_LOCK_DIR, else a per-user temp directory)"""
+    lock_dir = os.environ.get('PROPOSAL_LOCK_DIR')
+    if not lock_dir:
+        uid = os.getuid() if hasattr(os, 'getuid') else 0
+        lock_dir = Path(tempfile.gettempdir()) / DEFAULT_LOCK_DIR_NAME.format(uid=uid)
+    digest = hashlib.sha256(str(Path(path).resolve()).encode('utf-8')).hexdigest()[:32]
+    return Path(lock_dir) / f'{digest}.lock'
+
+
+def _open_lock(lock_file: Path):
+    """Lock file descriptor, or None if the lock directory is unusable"""
+    try:
+        lock_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if (not os.environ.get('PROPOSAL_LOCK_DIR') and hasattr(os, 'getuid')
+                and lock_file.parent.stat().st_uid != os.getuid()):
+            return None  # a per-user directory someone else created: they could hold every lock forever
+        # flock needs no write access, so writers sharing a PROPOSAL_LOCK_DIR open each other's lock files read-only
+        return os.open(lock_file, os.O_RDONLY | os.O_CREAT, 0o666)
+    except OSError:
+        return None
+
+
+@contextmanager
+def locked(path):
+    """
+    Hold an exclusive advisory lock for path (not re-entrant within a process)
+
+    Without a usable lock directory the write goes ahead unlocked; it is still atomic.
+    """
+    fd = _open_lock(lock_path(path)) if fcntl is not None else None
+    if fd is None:
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # also releases the lock
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename; not supported everywhere, so best effort"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _unchanged(path: Path, data: bytes) -> bool:
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def write_atomic(path, data: Union[str, bytes], skip_unchanged: bool = True, lock: bool = True) -> bool:
+    """
+    Atomically replace path with data (str is written as UTF-8)
+
+    Args:
+        skip_unchanged: Leave the file untouched if it already holds exactly these bytes
+        lock: Take the advisory lock for path; pass False when the caller holds it via locked()
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if not lock:
+        return _write(path, data, skip_unchanged)
+    with locked(path):
+        return _write(path, data, skip_unchanged)
+
+
+def _write(path: Path, data: bytes, skip_unchanged: bool) -> bool:
+    if skip_unchanged and _unchanged(path, data):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except OSError:
+        mode = None
+
+    # Created 0o666 so the kernel applies the umask, like a plain open(path, 'w')
+    while True:
+        tmp_name = path.parent / f'.{path.name}.{secrets.token_hex(4)}.tmp'
+        try:
+            fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            # Replacing a file keeps its permissions
+            os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(path.parent)
+    return True
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python3 safe_write.py <output_file> < content")
+        sys.exit(1)
+
+    written = write_atomic(sys.argv[1], sys.stdin.buffer.read())
+    print(f"{'📝 Written' if written else '♻️  Unchanged'}: {sys.argv[1]}")
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Single-pass proposal validator with pluggable rules
+A document is tokenized once - headings, [PLACEHOLDER_ID]s and the trigger
+words the rules register - by one compiled alternation over its case-folded
+text, and every rule runs as a visitor over that token stream. A rule that
+looks for a phrase ("Based on S1") registers the phrase's literal start as a
+trigger and confirms its full pattern only at those offsets, instead of
+running its own case-insensitive search over the whole document.
+
+Writing a rule:
+    class NoTodoRule(Rule):
+        triggers = ('todo',)
+
+        def on_trigger(self, token):
+            line = self.document.line_number(token.start)
+            self.warnings.append(f"⚠️  TODO left in template (line {line})")
+
+Plugins are Python files defining RULES (Rule subclasses or instances); they
+are loaded from PROPOSAL_VALIDATOR_PLUGINS (os.pathsep-separated paths) or
+--plugin, and run after the built-in template rules.
+
+Usage:
+    python3 template_validator.py <template_file> [--plugin FILE ...] [--json]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import patterns
+from keyword_scanner import fold_case
+from proposal_document import ProposalDocument, as_document, estimated_value, load_document
+
+
+class Token(NamedTuple):
+    """
+    One token of the stream
+
+    kind: 'heading' (value: level, start/end: the heading line),
+          'placeholder' (value: the ID, start/end: the [ID] brackets) or
+          'trigger' (value: the lowercase trigger, start/end: its occurrence)
+    """
+    kind: str
+    start: int
+    end: int
+    value: Union[int, str]
+
+
+class Rule:
+    """
+    Base class for validation rules
+
+    Override the hooks a rule needs; begin() resets per-document state, so a
+    rule instance can be reused across documents (one at a time). Messages go
+    to self.errors / self.warnings and are reported in rule order.
+    """
+
+    # Lowercase literals whose occurrences are passed to on_trigger (matched
+    # case-insensitively; triggers should not overlap one another)
+    triggers: Tuple[str, ...] = ()
+
+    def begin(self, document: ProposalDocument):
+        self.document = document
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+
+    def on_heading(self, token: Token):
+        pass
+
+    def on_placeholder(self, token: Token):
+        pass
+
+    def on_trigger(self, token: Token):
+        pass
+
+    def finish(self):
+        pass
+
+
+class TemplateValidator:
+    """Runs a set of rules over one token stream per document"""
+
+    def __init__(self, rules):
+        self.rules = [rule() if isinstance(rule, type) else rule for rule in rules]
+
+        triggers = sorted({trigger.lower() for rule in self.rules for trigger in rule.triggers},
+                          key=lambda trigger: (-len(trigger), trigger))
+        # Placeholders are matched case-insensitively here and confirmed against the original text.
+        # Triggers are the ungrouped tail of the alternation (match.lastgroup is None): every branch
+        # then starts with a literal, which lets the regex engine skip ahead to candidate characters.
+        alternatives = [r'\n(?P<heading>#+)(?=[ \t][^\n])', r'\[(?P<placeholder>[a-z_]+\d+)\]']
+        alternatives.extend(re.escape(trigger) for trigger in triggers)
+        self._pattern = re.compile('|'.join(alternatives))
+
+        def handlers(hook):
+            return [getattr(rule, hook) for rule in self.rules
+                    if getattr(type(rule), hook) is not getattr(Rule, hook)]
+
+        self._heading_handlers = handlers('on_heading')
+        self._placeholder_handlers = handlers('on_placeholder')
+        self._trigger_handlers: Dict[str, list] = {trigger: [] for trigger in triggers}
+        for rule in self.rules:
+            for trigger in {trigger.lower() for trigger in rule.triggers}:
+                self._trigger_handlers[trigger].append(rule.on_trigger)
+
+    def validate(self, content) -> Tuple[List[str], List[str]]:
+        """Run every rule over content (str or ProposalDocument); returns (errors, warnings)"""
+        document = as_document(content)
+        text = document.content
+        for rule in self.rules:
+            rule.begin(document)
+
+        # Scanned with a leading newline so a heading on the first line matches like the others;
+        # offsets in the scanned text are one past those in text
+        for match in self._pattern.finditer('\n' + fold_case(text)):
+            kind = match.lastgroup
+            if kind is None:
+                start, end = match.span()
+                token = Token('trigger', start - 1, end - 1, match.group())
+                for handler in self._trigger_handlers[token.value]:
+                    handler(token)
+            elif kind == 'placeholder':
+                start, end = match.start() - 1, match.end() - 1
+                if not self._placeholder_handlers or not patterns.PLACEHOLDER.match(text, start):
+                    continue
+                token = Token('placeholder', start, end, text[start + 1:end - 1])
+                for handler in self._placeholder_handlers:
+                    handler(token)
+            elif self._heading_handlers:
+                start = match.start('heading') - 1
+                end = text.find('\n', start)
+                token = Token('heading', start, len(text) if end == -1 else end, match.end('heading') - 1 - start)
+                for handler in self._heading_handlers:
+                    handler(token)
+
+        errors, warnings = [], []
+        for rule in self.rules:
+            rule.finish()
+            errors.extend(rule.errors)
+            warnings.extend(rule.warnings)
+        return errors, warnings
+
+
+# Built-in template rules (same checks and messages as validate_output.py always had)
+
+class SourceReferenceRule(Rule):
+    """Templates must not quote the Deal Transfer sources (S1 - "...")"""
+    triggers = ('s1', 's2')
+
+    def on_trigger(self, token):
+        if not self.errors and patterns.SOURCE_REFERENCE.match(self.document.content, token.start):
+            self.errors.append("❌ Template contains source references (S1/S2)")
+
+
+class ReasoningTextRule(Rule):
+    """Templates must not contain reasoning text; reports the first pattern of patterns.REASONING_PATTERNS found"""
+    triggers = tuple(patterns.REASONING_TRIGGERS)
+
+    def begin(self, document):
+        super().begin(document)
+        self.first_match = len(patterns.REASONING_PATTERNS)
+
+    def on_trigger(self, token):
+        for index, trigger in enumerate(patterns.REASONING_TRIGGERS[:self.first_match]):
+            if trigger == token.value and patterns.REASONING_PATTERNS[index].match(self.document.content, token.start):
+                self.first_match = index
+                return
+
+    def finish(self):
+        if self.first_match < len(patterns.REASONING_PATTERNS):
+            pattern = patterns.REASONING_PATTERNS[self.first_match]
+            self.errors.append(f"❌ Template contains reasoning text (matched: {pattern.pattern})")
+
+
+class PlaceholderFormatRule(Rule):
+    """Every "<estimated value> [PLACEHOLDER_ID]" needs a value and a well-formed ID"""
+
+    def begin(self, document):
+        super().begin(document)
+        self.count = 0
+
+    def on_placeholder(self, token):
+        value = estimated_value(self.document.content, token.start)
+        if value is None:
+            return
+        self.count += 1
+        if not value.strip():
+            self.errors.append(f"❌ Empty value before placeholder: [{token.value}]")
+        if not patterns.PLACEHOLDER_ID.match(token.value):
+            self.errors.append(f"❌ Invalid placeholder ID format: [{token.value}]")
+
+    def finish(self):
+        if not self.count:
+            self.warnings.append("⚠️  No placeholders found (may be intentional if all values confirmed)")
+
+
+class EmptySectionRule(Rule):
+    """Warn about ## sections with nothing but blank lines and horizontal rules before the next ##"""
+
+    def begin(self, document):
+        super().begin(document)
+        self.open_section: Optional[Token] = None
+        self.empty_sections: List[str] = []
+
+    def _close_section(self, end: int):
+        section = self.open_section
+        if section and not patterns.SECTION_CONTENT.search(self.document.content, section.end, end):
+            self.empty_sections.append(self.document.content[section.start:section.end])
+
+    def on_heading(self, token):
+        if token.value == 2:
+            self._close_section(token.start)
+            self.open_section = token
+
+    def finish(self):
+        self._close_section(len(self.document.content))
+        if self.empty_sections:
+            self.warnings.append(f"⚠️  Found {len(self.empty_sections)} empty section(s): "
+                                 f"{', '.join(self.empty_sections[:3])}")
+
+
+TEMPLATE_RULES = [SourceReferenceRule, ReasoningTextRule, PlaceholderFormatRule, EmptySectionRule]
+
+
+def load_plugins(paths=None) -> list:
+    """Rules defined as RULES in plugin files (default: the PROPOSAL_VALIDATOR_PLUGINS path list)"""
+    if paths is None:
+        paths = [path for path in os.environ.get('PROPOSAL_VALIDATOR_PLUGINS', '').split(os.pathsep) if path]
+    rules = []
+    for path in paths:
+        spec = importlib.util.spec_from_file_location(f'validator_plugin_{Path(path).stem}', path)
+        if spec is None:
+            raise ImportError(f"Cannot load validator plugin: {path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        rules.extend(getattr(module, 'RULES', []))
+    return rules
+
+
+def template_validator(plugins=None) -> TemplateValidator:
+    """Validator with the built-in template rules followed by plugin rules"""
+    return TemplateValidator(TEMPLATE_RULES + load_plugins(plugins))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a proposal template in one pass')
+    parser.add_argument('template_file')
+    parser.add_argument('--plugin', action='append', help='Rule plugin file (repeatable; adds to PROPOSAL_VALIDATOR_PLUGINS)')
+    parser.add_argument('--json', action='store_true', help='Print {"errors", "warnings", "elapsed_ms"} as JSON')
+    args = parser.parse_args()
+
+    plugins = [path for path in os.environ.get('PROPOSAL_VALIDATOR_PLUGINS', '').split(os.pathsep) if path]
+    validator = template_validator(plugins + (args.plugin or []))
+    started = time.perf_counter()
+    errors, warnings = validator.validate(load_document(args.template_file))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps({"errors": errors, "warnings": warnings, "elapsed_ms": round(elapsed_ms, 3)},
+                         ensure_ascii=False))
+    else:
+        for message in errors + warnings:
+            print(message)
+        if not errors and not warnings:
+            print("✅ Template file is valid")
+        print(f"⏱️  {elapsed_ms:.2f} ms")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
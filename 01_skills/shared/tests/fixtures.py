@@ -0,0 +1,32 @@
+"""
+Shared fixtures for the verify_*.py scripts: project_info dicts shaped like
+parse_proposal.py output, without parsing a proposal
+"""
+
+
+def site(name: str, cameras: int) -> dict:
+    """One site row as ProposalParser.extract_sites returns it (running every project module)"""
+    return {'name': name, 'cameras': cameras, 'ai_modules': [], 'edge_servers': None, 'bandwidth_mbps': None}
+
+
+def project_info(method: str = 'on-prem', cameras: int = 0, modules=(), sites=(), compact: bool = True) -> dict:
+    """
+    project_info for a deployment
+
+    Args:
+        sites: (name, cameras) pairs; with sites, num_cameras is their total (as parse_proposal.py sets it)
+    """
+    info = {
+        'project_name': 'Verification Project',
+        'deployment_method': method,
+        'num_cameras': cameras,
+        'ai_modules': list(modules),
+        'alert_methods': ['Email'],
+        'include_nvr': True,
+        'list_ai_modules': True,
+        'compact_mode': compact,
+    }
+    if sites:
+        info['sites'] = [site(name, count) for name, count in sites]
+        info['num_cameras'] = sum(count for _, count in sites)
+    return info
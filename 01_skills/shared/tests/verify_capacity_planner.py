@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Verify capacity_planner.plan against worked examples
+
+Each example is sized by hand: GPU load = cameras x modules x ms/frame x fps
+/ 1000 reference GPUs, units = max(load / (capacity x 0.7 headroom),
+cameras / max_streams), rounded up. Module costs are fixed here so the
+examples do not depend on STANDARD_MODULES.md.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from capacity_planner import HARDWARE, RESOLUTIONS, TARGET_UTILIZATION, TIER_COSTS, load_cost_table, plan
+from fixtures import project_info
+
+
+def cost_table(module_costs: dict) -> dict:
+    return {
+        "modules": module_costs,
+        "tiers": dict(TIER_COSTS),
+        "hardware": {target: dict(profile) for target, profile in HARDWARE.items()},
+        "resolutions": {name: dict(values) for name, values in RESOLUTIONS.items()},
+    }
+
+
+# (description, method, cameras, {module: ms per frame}, sites, expected gpu_load, expected units)
+EXAMPLES = [
+    ("42 cameras x 4 detection modules: 3.36 / 0.7 = 4.8", 'on-prem', 42,
+     {f"Module {i}": 4.0 for i in range(4)}, None, 3.36, 5),
+    ("load exactly at the 0.7 target", 'on-prem', 7, {"Heavy": 20.0}, None, 0.7, 1),
+    ("load just over the 0.7 target", 'on-prem', 7, {"Heavy": 20.1}, None, 0.7, 2),
+    ("32 streams fit one edge server", 'on-prem', 32, {"Tiny": 0.01}, None, 0.0, 1),
+    ("33 streams need a second edge server", 'on-prem', 33, {"Tiny": 0.01}, None, 0.0, 2),
+    ("24 streams fit one cloud instance", 'cloud', 24, {"Tiny": 0.01}, None, 0.0, 1),
+    ("25 streams need a second cloud instance", 'cloud', 25, {"Tiny": 0.01}, None, 0.0, 2),
+    ("cloud instance at 0.8 x 0.7 = 0.56", 'cloud', 7, {"Heavy": 16.0}, None, 0.56, 1),
+    ("cloud instance just over 0.56", 'cloud', 7, {"Heavy": 16.5}, None, 0.58, 2),
+    ("edge servers summed per site (2 + 1)", 'hybrid', 0, {"Tiny": 0.01},
+     [("North", 40), ("South", 10)], 0.0, 3),
+]
+
+
+def check_example(description, method, cameras, costs, sites, gpu_load, units) -> list:
+    """Errors of one example (empty when it holds)"""
+    result = plan(project_info(method, cameras, costs, sites or ()), table=cost_table(costs))
+    errors = []
+    if result is None:
+        return [f"{description}: no plan"]
+    if result["gpu_load"] != gpu_load:
+        errors.append(f"{description}: gpu_load {result['gpu_load']}, expected {gpu_load}")
+    if result["servers"] != units:
+        errors.append(f"{description}: {result['servers']} unit(s), expected {units}")
+    return errors
+
+
+def main():
+    errors = []
+    for example in EXAMPLES:
+        errors.extend(check_example(*example))
+
+    if TARGET_UTILIZATION != 0.7:
+        errors.append(f"TARGET_UTILIZATION is {TARGET_UTILIZATION}; the examples assume 0.7")
+    if plan(project_info('on-prem', 0, ["Tiny"]), table=cost_table({"Tiny": 0.01})) is not None:
+        errors.append("a proposal without cameras should give no plan")
+
+    # A missing override file is a ValueError, which the generators turn into a warning
+    os.environ['PROPOSAL_MODULE_COSTS'] = str(Path(__file__).resolve().parent / 'missing_costs.json')
+    try:
+        load_cost_table()
+        errors.append("a missing PROPOSAL_MODULE_COSTS file was not reported")
+    except ValueError:
+        pass
+    finally:
+        del os.environ['PROPOSAL_MODULE_COSTS']
+
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        print(f"\n❌ {len(errors)} error(s) in {len(EXAMPLES)} examples")
+        sys.exit(1)
+    print(f"✅ {len(EXAMPLES)} capacity examples sized as worked by hand")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Verify pipeline.py reruns exactly the stages whose fingerprint changed
+
+Runs the pipeline (inline) on a copy of test/AVA_DT_template.md in a temp
+directory and checks which stages run or are skipped after: no change, a
+touch without a content change, a content edit, a hand-edited output (with
+and without keep_edited_outputs), a hand-edited diagram the offline renderer
+cannot parse (slides still built, without the image) and --force.
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline import build_stages, run_pipeline, stage_fingerprint
+
+FIXTURE = Path(__file__).resolve().parents[3] / 'test' / 'AVA_DT_template.md'
+STAGES = ['architecture', 'render', 'slides']
+
+
+def expect(errors: list, step: str, results, skipped_stages: list):
+    """Record an error unless exactly skipped_stages were skipped and every other stage ran ok"""
+    for name in STAGES:
+        status = results[name]["status"]
+        expected = "skipped" if name in skipped_stages else "ok"
+        if status != expected:
+            errors.append(f"{step}: {name} {status} ({results[name].get('message', '')}), expected {expected}")
+
+
+def main():
+    errors = []
+    with tempfile.TemporaryDirectory() as work:
+        proposal = Path(work) / FIXTURE.name
+        shutil.copy(FIXTURE, proposal)
+        output_dir = Path(work) / 'out'
+        stages = build_stages(proposal, output_dir)
+
+        def run(**kwargs):
+            return run_pipeline(stages, output_dir, inline=True, **kwargs)
+
+        expect(errors, "first run", run(), [])
+        expect(errors, "second run", run(), STAGES)
+
+        proposal.touch()
+        expect(errors, "touched proposal", run(), STAGES)
+
+        # The diagram comes out the same, so only the stages reading the proposal rerun
+        proposal.write_text(proposal.read_text(encoding='utf-8') + '\nEdited note.\n', encoding='utf-8')
+        expect(errors, "edited proposal", run(), ['render'])
+
+        slides = next(stage for stage in stages if stage["name"] == "slides")
+        slides_json = slides["outputs"][0]
+        slides_json.write_text(slides_json.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+        expect(errors, "hand-edited output, kept", run(keep_edited_outputs=True), STAGES)
+        expect(errors, "hand-edited output", run(), ['architecture', 'render'])
+
+        render = next(stage for stage in stages if stage["name"] == "render")
+        diagram, image = render["inputs"][0], render["outputs"][0]
+        content = diagram.read_text(encoding='utf-8')
+        end = content.index('\n```', content.index('```mermaid') + 3)
+        diagram.write_text(content[:end] + '\n    A -- text --> B & C' + content[end:], encoding='utf-8')
+        expect(errors, "unparseable diagram", run(keep_edited_outputs=True), ['architecture'])
+        if image.exists():
+            errors.append("unparseable diagram: the previous image was left behind")
+        if image.name in slides_json.read_text(encoding='utf-8'):
+            errors.append("unparseable diagram: slides still reference the image")
+
+        expect(errors, "forced run", run(force=True), [])
+
+        changed = dict(slides, kwargs=dict(slides["kwargs"], use_cache=False))
+        if stage_fingerprint(changed) == stage_fingerprint(slides):
+            errors.append("stage parameters do not change the fingerprint")
+
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        print(f"\n❌ {len(errors)} error(s)")
+        sys.exit(1)
+    print("✅ Pipeline reruns only stages whose inputs, parameters or outputs changed")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,24 +6,44 @@ Converts TEMPLATE.md sections to slide-by-slide structure following SLIDE_TEMPLA
 
 import sys
 import json
-import re
+from bisect import bisect_left
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+# Shared utilities live in 01_skills/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+
+import patterns
+import capacity_planner
+import keyword_scanner
+import proposal_document
+from keyword_scanner import categorize
+from proposal_document import ProposalDocument, load_document
+from artifact_cache import ArtifactCache, code_fingerprint, write_if_changed
+
+# Bump when the slide structure format changes to invalidate cached artifacts
+MAPPER_VERSION = "1.1"
+
+# Module fields in output order (labels are registered in patterns.MODULE_FIELDS)
+MODULE_FIELD_KEYS = ["type", "purpose", "alert_logic", "preconditions", "detection_criteria",
+                     "data_requirements", "image_url", "video_url"]
+URL_FIELD_KEYS = {"image_url", "video_url"}
+NOT_AVAILABLE_VALUES = {'[not available]', 'not available', 'n/a', ''}
+
 
 class ProposalParser:
-    """Parse proposal markdown template"""
+    """Parse proposal markdown template (sections come from the shared ProposalDocument)"""
     
     def __init__(self, markdown_file: str):
         self.file_path = Path(markdown_file)
-        self.content = self._read_file()
+        self.document = self._load_document()
+        self.content = self.document.content
         self.sections = {}
         
-    def _read_file(self) -> str:
-        """Read markdown file"""
+    def _load_document(self) -> ProposalDocument:
+        """Load the parsed markdown document"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return load_document(self.file_path)
         except Exception as e:
             print(f"Error reading file: {e}")
             sys.exit(1)
@@ -34,57 +54,35 @@ class ProposalParser:
         project_name = self._extract_project_name()
         
         # Extract sections
-        sections = self._extract_sections()
+        self.sections = self.document.sections
         
         return {
             "project_name": project_name,
-            "sections": sections
+            "sections": self.sections
         }
     
     def _extract_project_name(self) -> str:
         """Extract project name from proposal"""
         # Try to find from title or first heading
-        pattern = r'^#\s+(.+?)$'
-        match = re.search(pattern, self.content, re.MULTILINE)
-        if match:
-            title = match.group(1).strip()
+        title = self.document.title
+        if title:
             # Remove "Technical Proposal" or similar
-            title = re.sub(r'Technical\s+Proposal.*$', '', title, flags=re.IGNORECASE).strip()
+            title = patterns.TECHNICAL_PROPOSAL_SUFFIX.sub('', title).strip()
             return title
         
         # Fallback to filename
         return self.file_path.stem
-    
-    def _extract_sections(self) -> Dict[str, str]:
-        """Extract sections from markdown"""
-        sections = {}
-        
-        # Pattern to match section headers (## Section Name)
-        section_pattern = r'^##\s+(.+?)$'
-        matches = list(re.finditer(section_pattern, self.content, re.MULTILINE))
-        
-        for i, match in enumerate(matches):
-            section_name = match.group(1).strip()
-            start_pos = match.end()
-            
-            # Find end position (next section or end of file)
-            if i + 1 < len(matches):
-                end_pos = matches[i + 1].start()
-            else:
-                end_pos = len(self.content)
-            
-            section_content = self.content[start_pos:end_pos].strip()
-            sections[section_name] = section_content
-        
-        return sections
 
 
 class SlideMapper:
     """Map proposal sections to slide structure"""
     
-    def __init__(self, proposal_data: Dict[str, Any], architecture_diagram_path: Optional[str] = None):
+    def __init__(self, proposal_data: Dict[str, Any], architecture_diagram_path: Optional[str] = None,
+                 diagram_image: Optional[str] = None, capacity: Optional[Dict[str, Any]] = None):
         self.proposal_data = proposal_data
         self.architecture_diagram_path = architecture_diagram_path
+        self.diagram_image = diagram_image
+        self.capacity = capacity
         self.slides = []
         self.slide_number = 1
         
@@ -139,10 +137,10 @@ class SlideMapper:
         work_scope = self._extract_work_scope(project_req)
         
         # Extract date - supports both **Date:** and **Date** formats
-        date_match = re.search(r'\*\*Date\*\*[:\s]+(\d{4}-\d{2}-\d{2}|\w+\s+\d{4})', cover_page, re.IGNORECASE)
+        date_match = patterns.COVER_DATE.search(cover_page)
         if not date_match:
             # Try alternative format: **Date:** value
-            date_match = re.search(r'\*\*Date:\*\*\s*(\d{4}-\d{2}-\d{2}|\w+\s+\d{4})', cover_page, re.IGNORECASE)
+            date_match = patterns.COVER_DATE_COLON.search(cover_page)
         if date_match:
             date = date_match.group(1)
         else:
@@ -212,15 +210,19 @@ class SlideMapper:
             diagram_code = self._read_architecture_diagram()
         
         # Slide 1: Diagram
+        diagram = {
+            "type": "mermaid",
+            "code": diagram_code or "",
+            "description": self._extract_architecture_description(section_content)
+        }
+        if self.diagram_image:
+            # Rendered SVG/PNG of the same diagram (render_diagram.py), ready to place on the slide
+            diagram["image"] = str(self.diagram_image)
         self.slides.append({
             "slide_number": self.slide_number,
             "type": "diagram",
             "title": "Proposed System Architecture",
-            "diagram": {
-                "type": "mermaid",
-                "code": diagram_code or "",
-                "description": self._extract_architecture_description(section_content)
-            }
+            "diagram": diagram
         })
         self.slide_number += 1
         
@@ -265,6 +267,19 @@ class SlideMapper:
                     "content": self._format_bullet_points(subsection_content)
                 })
             self.slide_number += 1
+        
+        # Hardware sized from cameras x modules (capacity_planner.py), when a plan was given
+        if self.capacity:
+            self.slides.append({
+                "slide_number": self.slide_number,
+                "type": "content_table",
+                "title": "System Requirements: Capacity Plan",
+                "table": {
+                    "headers": ["Specification", "Value"],
+                    "rows": capacity_planner.summary_rows(self.capacity)
+                }
+            })
+            self.slide_number += 1
     
     def _map_implementation_plan(self, sections: Dict[str, str]):
         """Map Implementation Plan to timeline slide"""
@@ -347,11 +362,11 @@ class SlideMapper:
         """Extract client name from Project Requirement Statement"""
         project_req = sections.get("2. PROJECT REQUIREMENT STATEMENT", "")
         # Try pattern 1: **Project Owner:** Value (colon inside bold)
-        match = re.search(r'\*\*Project Owner:\*\*\s*(.+?)(?:\n|$)', project_req, re.IGNORECASE)
+        match = patterns.PROJECT_OWNER.search(project_req)
         if match:
             return match.group(1).strip()
         # Try pattern 2: **Project Owner** Value (colon outside bold)
-        match = re.search(r'\*\*Project Owner\*\*[:\s]+(.+?)(?:\n|$)', project_req, re.IGNORECASE)
+        match = patterns.PROJECT_OWNER_OUTSIDE_BOLD.search(project_req)
         if match:
             return match.group(1).strip()
         print("⚠️  Warning: Client Name (Project Owner) not found. Please verify.")
@@ -359,7 +374,7 @@ class SlideMapper:
     
     def _extract_work_scope(self, content: str) -> str:
         """Extract work scope one-liner"""
-        match = re.search(r'\*\*Work Scope\*\*[:\s]+(.+?)(?:\n\n|\n\*\*|$)', content, re.IGNORECASE | re.DOTALL)
+        match = patterns.WORK_SCOPE.search(content)
         if match:
             scope = match.group(1).strip()
             # Take first sentence or first 100 chars
@@ -373,21 +388,20 @@ class SlideMapper:
         pairs = {}
         
         # Method 1: Try table format first (| **Key** | Value |)
-        table_pattern = r'\|\s*\*\*(.+?)\*\*\s*\|\s*(.+?)\s*\|'
-        matches = re.finditer(table_pattern, content)
+        matches = patterns.TABLE_KEY_VALUE.finditer(content)
         for match in matches:
             key = match.group(1).strip()
             value = match.group(2).strip()
             # Clean value (remove markdown, source references)
-            value = re.sub(r'\*\*Source[:\s]*.*$', '', value, flags=re.IGNORECASE).strip()
-            value = re.sub(r'\*\*', '', value).strip()
+            value = patterns.SOURCE_SUFFIX.sub('', value).strip()
+            value = patterns.BOLD_MARKER.sub('', value).strip()
             pairs[key] = value
         
         # Method 2: Try **Key:** Value format (if table format didn't find anything)
         if not pairs:
             # Split content by key-value pairs
             # Pattern to find all **Key:** markers
-            key_markers = list(re.finditer(r'\*\*([^:*]+?):\*\*', content, re.MULTILINE))
+            key_markers = list(patterns.KEY_MARKER.finditer(content))
             
             for i, marker in enumerate(key_markers):
                 key = marker.group(1).strip()
@@ -402,28 +416,28 @@ class SlideMapper:
                 # Extract value, but stop at separator (---) if found
                 value_section = content[start_pos:end_pos]
                 # Check for separator (--- on its own line)
-                separator_match = re.search(r'\n\s*---\s*(\n|$)', value_section)
+                separator_match = patterns.SEPARATOR_LINE.search(value_section)
                 if separator_match:
                     value_section = value_section[:separator_match.start()]
                 
                 value = value_section.strip()
                 
                 # Remove any trailing separators or extra dashes
-                value = re.sub(r'\n\s*---\s*$', '', value).strip()
+                value = patterns.TRAILING_SEPARATOR.sub('', value).strip()
                 
                 # Special handling for list values (like AI Modules)
                 # If value starts with numbered list (1. 2. 3.), keep line breaks
-                if re.match(r'^\d+\.\s+', value, re.MULTILINE):
+                if patterns.NUMBERED_LIST_START.match(value):
                     # Keep as multiline, just clean up extra whitespace
                     lines = [line.strip() for line in value.split('\n') if line.strip()]
                     value = '\n'.join(lines)
                 else:
                     # For non-list values, replace newlines with space
-                    value = re.sub(r'\n+', ' ', value).strip()
+                    value = patterns.NEWLINES.sub(' ', value).strip()
                 
                 # Clean value - remove trailing source references
-                value = re.sub(r'\n\s*\*\*Source[:\s]*.*$', '', value, flags=re.IGNORECASE | re.DOTALL).strip()
-                value = re.sub(r'\*\*', '', value).strip()
+                value = patterns.TRAILING_SOURCE_BLOCK.sub('', value).strip()
+                value = patterns.BOLD_MARKER.sub('', value).strip()
                 
                 if value:
                     pairs[key] = value
@@ -481,11 +495,11 @@ class SlideMapper:
                     line_stripped.startswith('*') or 
                     line_stripped.startswith('•')):
                     # Remove bullet marker
-                    item = re.sub(r'^\s*[-*•]\s*', '', line)
+                    item = patterns.INDENTED_BULLET_PREFIX.sub('', line)
                     # Remove markdown bold markers
-                    item = re.sub(r'\*\*', '', item).strip()
+                    item = patterns.BOLD_MARKER.sub('', item).strip()
                     # Skip if item is just dashes, empty, or separator
-                    if item and not re.match(r'^-+$', item) and item != '---':
+                    if item and not patterns.DASHES_ONLY.match(item) and item != '---':
                         items.append(item)
                 # If we hit an empty line after collecting items, continue
                 # (might be spacing between items)
@@ -497,8 +511,7 @@ class SlideMapper:
     def _extract_subsection(self, content: str) -> Dict[str, str]:
         """Extract sub-sections (### Subsection Name)"""
         subsections = {}
-        pattern = r'^###\s+(.+?)$'
-        matches = list(re.finditer(pattern, content, re.MULTILINE))
+        matches = list(patterns.SUBSECTION_HEADING.finditer(content))
         
         for i, match in enumerate(matches):
             subsection_name = match.group(1).strip()
@@ -523,17 +536,17 @@ class SlideMapper:
             level = 0
             if line.startswith('-') or line.startswith('*') or line.startswith('•'):
                 level = 0
-                line = re.sub(r'^[-*•]\s+', '', line)
+                line = patterns.BULLET_MARKER.sub('', line)
             elif line.startswith('  -') or line.startswith('  *'):
                 level = 1
-                line = re.sub(r'^\s+[-*•]\s+', '', line)
+                line = patterns.NESTED_BULLET_MARKER.sub('', line)
             elif line.startswith('    -') or line.startswith('    *'):
                 level = 2
-                line = re.sub(r'^\s+[-*•]\s+', '', line)
+                line = patterns.NESTED_BULLET_MARKER.sub('', line)
             
             # Clean markdown
-            line = re.sub(r'\*\*', '', line)
-            line = re.sub(r'\*\*Source[:\s]*.*$', '', line, flags=re.IGNORECASE).strip()
+            line = patterns.BOLD_MARKER.sub('', line)
+            line = patterns.SOURCE_SUFFIX.sub('', line).strip()
             
             if line:
                 bullets.append({
@@ -548,8 +561,7 @@ class SlideMapper:
         milestones = []
         
         # Pattern 1: **Phase T0:** Event Name (with colon inside bold)
-        pattern1 = r'\*\*Phase\s+(T\d+):\*\*\s*(.+?)(?=\n|$)'
-        matches1 = list(re.finditer(pattern1, content, re.IGNORECASE | re.MULTILINE))
+        matches1 = list(patterns.PHASE_HEADER.finditer(content))
         
         for match in matches1:
             phase = match.group(1).strip()
@@ -558,13 +570,13 @@ class SlideMapper:
             # Find the section content after this phase header
             start_pos = match.end()
             # Look for next phase or end of section
-            next_phase = re.search(r'\*\*Phase\s+T\d+', content[start_pos:], re.IGNORECASE)
+            next_phase = patterns.PHASE_START.search(content[start_pos:])
             end_pos = start_pos + next_phase.start() if next_phase else len(content)
             phase_content = content[start_pos:end_pos]
             
             # Extract date/duration from event name or content
             date = ""
-            date_match = re.search(r'\(T\d+\s*[+\-]\s*(.+?)\)', event_name + phase_content, re.IGNORECASE)
+            date_match = patterns.PHASE_DATE.search(event_name + phase_content)
             if date_match:
                 date = date_match.group(1).strip()
             
@@ -573,8 +585,8 @@ class SlideMapper:
             for line in phase_content.split('\n'):
                 line = line.strip()
                 if line.startswith('-') and not line.startswith('---'):
-                    note = re.sub(r'^-\s*\*\*', '', line)
-                    note = re.sub(r'\*\*', '', note).strip()
+                    note = patterns.NOTE_BOLD_PREFIX.sub('', line)
+                    note = patterns.BOLD_MARKER.sub('', note).strip()
                     if note:
                         notes.append(note)
             
@@ -587,15 +599,14 @@ class SlideMapper:
         
         # Pattern 2: **Phase T0** Event Name (colon outside bold) - fallback
         if not milestones:
-            pattern2 = r'\*\*Phase\s+(T\d+)\*\*[:\s]+(.+?)(?:\n|\*\*)'
-            matches2 = re.finditer(pattern2, content, re.IGNORECASE | re.DOTALL)
+            matches2 = patterns.PHASE_HEADER_OUTSIDE_BOLD.finditer(content)
             
             for match in matches2:
                 phase = match.group(1).strip()
                 description = match.group(2).strip()
                 
                 # Extract date/duration
-                date_match = re.search(r'T\d+\s*[+\-]\s*(.+?)(?:\n|$)', description, re.IGNORECASE)
+                date_match = patterns.PHASE_OFFSET.search(description)
                 date = date_match.group(1).strip() if date_match else ""
                 
                 milestones.append({
@@ -627,70 +638,25 @@ class SlideMapper:
         
         # Pattern 1: #### Module [number]: [Name] (markdown header format)
         # Supports both "#### Module: Name" and "#### Module 1: Name"
-        pattern1 = r'^####\s+Module(?:\s+\d+)?\s*:\s*(.+?)$'
-        matches1 = list(re.finditer(pattern1, content, re.IGNORECASE | re.MULTILINE))
-        
-        for match in matches1:
-            module_name = match.group(1).strip()
-            # Extract module details from the section following this module name
-            start_pos = match.end()
-            # Find the end of this module's section (next module or end of content)
-            next_module = re.search(r'^####\s+Module(?:\s+\d+)?\s*:\s*', content[start_pos:], re.IGNORECASE | re.MULTILINE)
-            end_pos = start_pos + next_module.start() if next_module else len(content)
-            module_content = content[start_pos:end_pos]
-            
-            # Extract module fields
-            module_data = self._extract_module_fields(module_content)
-            modules.append({
-                "name": module_name,
-                "type": module_data["type"],
-                "purpose": module_data["purpose"],
-                "alert_logic": module_data["alert_logic"],
-                "preconditions": module_data["preconditions"],
-                "detection_criteria": module_data["detection_criteria"],
-                "data_requirements": module_data["data_requirements"],
-                "image_url": module_data["image_url"],
-                "video_url": module_data["video_url"]
-            })
+        for module_name, start_pos, end_pos in self._module_spans(content, patterns.MODULE_HEADING,
+                                                                  patterns.MODULE_HEADING_START):
+            modules.append(self._build_module(module_name, content[start_pos:end_pos]))
         
         # Pattern 2: **Module [number]: [Name]** (e.g., **Module 1: Safety Helmet Detection**)
         # Fallback pattern for bold format
         if not modules:
-            pattern2 = r'\*\*Module\s+(?:\d+)?:\s*(.+?)\*\*'
-            matches2 = list(re.finditer(pattern2, content, re.IGNORECASE))
-            
-            for match in matches2:
-                module_name = match.group(1).strip()
-                # Extract module details from the section following this module name
-                start_pos = match.end()
-                # Find the end of this module's section (next module or end of content)
-                next_module = re.search(r'\*\*Module\s+(?:\d+)?:\s*', content[start_pos:], re.IGNORECASE)
-                end_pos = start_pos + next_module.start() if next_module else len(content)
-                module_content = content[start_pos:end_pos]
-                
-                # Extract module fields
-                module_data = self._extract_module_fields(module_content)
-                modules.append({
-                    "name": module_name,
-                    "type": module_data["type"],
-                    "purpose": module_data["purpose"],
-                    "alert_logic": module_data["alert_logic"],
-                    "preconditions": module_data["preconditions"],
-                    "detection_criteria": module_data["detection_criteria"],
-                    "data_requirements": module_data["data_requirements"],
-                    "image_url": module_data["image_url"],
-                    "video_url": module_data["video_url"]
-                })
+            for module_name, start_pos, end_pos in self._module_spans(content, patterns.MODULE_BOLD,
+                                                                      patterns.MODULE_BOLD_START):
+                modules.append(self._build_module(module_name, content[start_pos:end_pos]))
         
         # Pattern 3: Module: [Name] or Module Name: [Name] (fallback for other formats)
         if not modules:
             # Try pattern without ** markers
-            pattern2 = r'(?:Module|Module Name)[:\s]+(.+?)(?:\n|$)'
-            matches2 = re.finditer(pattern2, content, re.IGNORECASE | re.MULTILINE)
+            matches2 = patterns.MODULE_PLAIN.finditer(content)
             for match in matches2:
                 module_name = match.group(1).strip()
                 # Remove markdown if present
-                module_name = re.sub(r'\*\*', '', module_name).strip()
+                module_name = patterns.BOLD_MARKER.sub('', module_name).strip()
                 if module_name:
                     modules.append({
                         "name": module_name,
@@ -706,97 +672,60 @@ class SlideMapper:
         
         return modules
     
+    def _module_spans(self, content: str, header_pattern, boundary_pattern) -> List[tuple]:
+        """
+        (name, start, end) for each module header: the module body runs from the
+        end of its header to the next module boundary (or end of content).
+        
+        Boundaries are collected in one pass and paired by offset, so large
+        proposals are not rescanned from every header.
+        """
+        boundaries = [m.start() for m in boundary_pattern.finditer(content)]
+        spans = []
+        for match in header_pattern.finditer(content):
+            start_pos = match.end()
+            next_index = bisect_left(boundaries, start_pos)
+            end_pos = boundaries[next_index] if next_index < len(boundaries) else len(content)
+            spans.append((match.group(1).strip(), start_pos, end_pos))
+        return spans
+    
+    def _build_module(self, module_name: str, module_content: str) -> Dict[str, str]:
+        """Module entry with fields extracted from the module's content"""
+        return {"name": module_name, **self._extract_module_fields(module_content)}
+    
     def _extract_module_fields(self, module_content: str) -> Dict[str, str]:
         """Extract module fields from module content section"""
-        module_type = ""  # Changed: no default, must be extracted
-        purpose = ""
-        alert_logic = ""
-        preconditions = ""
-        detection_criteria = ""
-        data_requirements = ""
-        image_url = ""
-        video_url = ""
-        
-        lines = module_content.split('\n')
-        for line in lines:
+        fields = {key: "" for key in MODULE_FIELD_KEYS}  # no defaults, must be extracted
+        
+        for line in module_content.split('\n'):
             line_stripped = line.strip()
-            if not line_stripped:
-                continue
-            
-            # Extract field value using multiple format patterns
             # Format 1: - **Field:** Value
             # Format 2: • Field: Value
             # Format 3: Field: Value (plain)
+            if ':' not in line_stripped:
+                continue
             
-            # Module Type
-            if 'Module Type' in line_stripped and (':**' in line_stripped or ':' in line_stripped):
-                value = self._extract_field_value(line_stripped)
-                if value:
-                    module_type = value
-            
-            # Purpose Description
-            elif 'Purpose Description' in line_stripped and (':**' in line_stripped or ':' in line_stripped):
-                value = self._extract_field_value(line_stripped)
-                if value:
-                    purpose = value
-            
-            # Alert Trigger Logic
-            elif 'Alert Trigger Logic' in line_stripped and (':**' in line_stripped or ':' in line_stripped):
-                value = self._extract_field_value(line_stripped)
-                if value:
-                    alert_logic = value
-            
-            # Preconditions (check for exact match to avoid matching "Purpose Description")
-            elif ('Preconditions' in line_stripped and 
-                  'Purpose' not in line_stripped and
-                  (':**' in line_stripped or ':' in line_stripped)):
-                value = self._extract_field_value(line_stripped)
-                if value:
-                    preconditions = value
-            
-            # Detection Criteria
-            elif 'Detection Criteria' in line_stripped and (':**' in line_stripped or ':' in line_stripped):
-                value = self._extract_field_value(line_stripped)
-                if value:
-                    detection_criteria = value
-            
-            # Image URL
-            elif 'Image URL' in line_stripped and (':**' in line_stripped or ':' in line_stripped):
-                value = self._extract_field_value(line_stripped)
-                if value:
-                    # Handle [Not available] or actual URLs
-                    if value.lower() in ['[not available]', 'not available', 'n/a', '']:
-                        image_url = ""
-                    else:
-                        image_url = value
-            
-            # Video URL
-            elif 'Video URL' in line_stripped and (':**' in line_stripped or ':' in line_stripped):
-                value = self._extract_field_value(line_stripped)
-                if value:
-                    # Handle [Not available] or actual URLs
-                    if value.lower() in ['[not available]', 'not available', 'n/a', '']:
-                        video_url = ""
-                    else:
-                        video_url = value
+            key = self._match_module_field(line_stripped)
+            if not key:
+                continue
             
-            # Client Data Requirements
-            elif ('Client Data Requirements' in line_stripped or 
-                  'Data Requirements' in line_stripped) and (':**' in line_stripped or ':' in line_stripped):
-                value = self._extract_field_value(line_stripped)
-                if value:
-                    data_requirements = value
-        
-        return {
-            "type": module_type,
-            "purpose": purpose,
-            "alert_logic": alert_logic,
-            "preconditions": preconditions,
-            "detection_criteria": detection_criteria,
-            "data_requirements": data_requirements,
-            "image_url": image_url,
-            "video_url": video_url
-        }
+            value = self._extract_field_value(line_stripped)
+            if value:
+                # Handle [Not available] or actual URLs
+                if key in URL_FIELD_KEYS and value.lower() in NOT_AVAILABLE_VALUES:
+                    value = ""
+                fields[key] = value
+        
+        return fields
+    
+    def _match_module_field(self, line: str) -> Optional[str]:
+        """Output key of the highest-priority module field label found in the line"""
+        if not patterns.MODULE_FIELD_LABEL.search(line):
+            return None
+        for label, key, excluded in patterns.MODULE_FIELDS:
+            if label in line and not (excluded and excluded in line):
+                return key
+        return None
     
     def _extract_field_value(self, line: str) -> str:
         """
@@ -807,43 +736,32 @@ class SlideMapper:
         - • Field: Value
         """
         # Remove leading bullet markers
-        line = re.sub(r'^[-*•]\s*', '', line.strip())
+        line = patterns.BULLET_PREFIX.sub('', line.strip())
         
         # Try to extract value after :** or :
         # Pattern 1: **Field:** Value
-        match = re.search(r':\*\*\s*(.+)$', line)
+        match = patterns.FIELD_VALUE_AFTER_BOLD.search(line)
         if match:
             return match.group(1).strip()
         
         # Pattern 2: Field: Value
-        match = re.search(r':\s*(.+)$', line)
+        match = patterns.FIELD_VALUE_AFTER_COLON.search(line)
         if match:
             value = match.group(1).strip()
             # Remove remaining markdown
-            value = re.sub(r'\*\*', '', value).strip()
+            value = patterns.BOLD_MARKER.sub('', value).strip()
             return value
         
         return ""
     
     def _group_modules(self, modules: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Group modules by category"""
-        groups = {
-            "PPE Detection": [],
-            "Safety": [],
-            "Operations": [],
-            "Other": []
-        }
+        groups = {category: [] for category, _ in patterns.MODULE_CATEGORIES}
+        groups[patterns.OTHER_MODULE_CATEGORY] = []
         
         for module in modules:
-            name = module.get("name", "").lower()
-            if any(keyword in name for keyword in ["helmet", "vest", "glove", "boot", "ppe"]):
-                groups["PPE Detection"].append(module)
-            elif any(keyword in name for keyword in ["safety", "unsafe", "danger"]):
-                groups["Safety"].append(module)
-            elif any(keyword in name for keyword in ["count", "queue", "process"]):
-                groups["Operations"].append(module)
-            else:
-                groups["Other"].append(module)
+            category = categorize(module.get("name", ""), patterns.MODULE_CATEGORIES, patterns.OTHER_MODULE_CATEGORY)
+            groups[category].append(module)
         
         # Remove empty groups
         return {k: v for k, v in groups.items() if v}
@@ -886,7 +804,7 @@ class SlideMapper:
             
             # Extract mermaid code block - try multiple patterns
             # Pattern 1: ```mermaid\n...\n``` (with newline before closing ```)
-            match = re.search(r'```mermaid\s*\n(.*?)\n```', content, re.DOTALL)
+            match = patterns.MERMAID_BLOCK.search(content)
             if match:
                 code = match.group(1).strip()
                 if code:
@@ -894,7 +812,7 @@ class SlideMapper:
                     return code
             
             # Pattern 2: ```mermaid...``` (more flexible, without requiring newline before ```)
-            match = re.search(r'```mermaid\s*\n(.*?)```', content, re.DOTALL)
+            match = patterns.MERMAID_BLOCK_LOOSE.search(content)
             if match:
                 code = match.group(1).strip()
                 if code:
@@ -929,10 +847,12 @@ class SlideMapper:
     def _has_detailed_description(self, content: str) -> bool:
         """Check if architecture section has detailed description"""
         # Check for subsection headers or detailed content
-        return bool(re.search(r'###\s+.*(?:Description|Data Flow|Components)', content, re.IGNORECASE))
+        return bool(patterns.DETAILED_DESCRIPTION.search(content))
 
 
-def map_proposal_to_slides(proposal_file: str, architecture_diagram: Optional[str] = None, output_dir: Optional[str] = None) -> Dict[str, str]:
+def map_proposal_to_slides(proposal_file: str, architecture_diagram: Optional[str] = None, output_dir: Optional[str] = None,
+                           use_cache: bool = True, diagram_image: Optional[str] = None,
+                           project_info: Optional[str] = None) -> Dict[str, str]:
     """
     Main function to map proposal template to slide structure
     
@@ -940,6 +860,10 @@ def map_proposal_to_slides(proposal_file: str, architecture_diagram: Optional[st
         proposal_file: Path to proposal markdown template
         architecture_diagram: Optional path to architecture diagram markdown
         output_dir: Output directory (default: same as proposal file)
+        use_cache: Reuse cached slide structure when proposal and diagram are unchanged (default: True)
+        diagram_image: Optional path to a rendered image of the diagram, referenced from the architecture slide
+        project_info: Optional path to the project_info.json of generate_architecture.py; adds a
+            "Capacity Plan" System Requirements slide sized by capacity_planner.py
     
     Returns:
         Dict with output file paths
@@ -950,18 +874,44 @@ def map_proposal_to_slides(proposal_file: str, architecture_diagram: Optional[st
         print(f"Error: Proposal file not found: {proposal_file}")
         return {}
     
-    print(f"📄 Parsing proposal: {proposal_file.name}")
-    
-    # Parse proposal
-    parser = ProposalParser(str(proposal_file))
-    proposal_data = parser.parse()
-    
-    print(f"✅ Extracted {len(proposal_data['sections'])} sections")
-    
-    # Map to slides
-    print("🗺️  Mapping to slide structure...")
-    mapper = SlideMapper(proposal_data, architecture_diagram)
-    slide_structure = mapper.map()
+    # Cache key: proposal + diagram + project info (+ module cost table) content + mapper version (+ mapper source)
+    cache = ArtifactCache() if use_cache else None
+    cache_key = None
+    cached = None
+    if cache:
+        version = f"{MAPPER_VERSION}-{code_fingerprint(sys.modules[__name__], proposal_document, patterns, keyword_scanner, capacity_planner)}"
+        if diagram_image:
+            version += f"-{diagram_image}"
+        input_files = [proposal_file, architecture_diagram]
+        if project_info:
+            input_files += [project_info] + capacity_planner.cost_files()
+        cache_key = cache.key_for(input_files, "slides", version)
+        cached = cache.get(cache_key)
+    
+    if cached:
+        print(f"♻️  Proposal unchanged, using cached slide structure: {proposal_file.name}")
+        slide_structure = json.loads(cached["slide_structure.json"])
+    else:
+        print(f"📄 Parsing proposal: {proposal_file.name}")
+        
+        # Parse proposal
+        parser = ProposalParser(str(proposal_file))
+        proposal_data = parser.parse()
+        
+        print(f"✅ Extracted {len(proposal_data['sections'])} sections")
+        
+        capacity = None
+        if project_info:
+            try:
+                info = json.loads(Path(project_info).read_text(encoding='utf-8'))
+                capacity = capacity_planner.plan(info.get('project_info', info))
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Warning: no capacity plan slide: {e}")
+        
+        # Map to slides
+        print("🗺️  Mapping to slide structure...")
+        mapper = SlideMapper(proposal_data, architecture_diagram, diagram_image, capacity)
+        slide_structure = mapper.map()
     
     # Generate output
     if output_dir is None:
@@ -972,27 +922,25 @@ def map_proposal_to_slides(proposal_file: str, architecture_diagram: Optional[st
     
     # Save JSON
     json_file = output_dir / f"{proposal_file.stem}_slide_structure.json"
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(slide_structure, f, indent=2, ensure_ascii=False)
+    if cached:
+        structure_json = cached["slide_structure.json"]
+    else:
+        structure_json = json.dumps(slide_structure, indent=2, ensure_ascii=False)
+    write_if_changed(json_file, structure_json)
     print(f"✅ Saved slide structure to: {json_file}")
     
     # Save human-readable summary (optional)
     md_file = output_dir / f"{proposal_file.stem}_slide_content.md"
-    with open(md_file, 'w', encoding='utf-8') as f:
-        f.write(f"# Slide Content Summary: {slide_structure['project_name']}\n\n")
-        f.write(f"**Client:** {slide_structure['client_name']}\n")
-        f.write(f"**Total Slides:** {slide_structure['total_slides']}\n\n")
-        f.write("---\n\n")
-        
-        for slide in slide_structure['slides']:
-            f.write(f"## Slide {slide['slide_number']}: {slide.get('title', 'Untitled')}\n\n")
-            f.write(f"**Type:** {slide['type']}\n\n")
-            # Add content preview
-            if 'table' in slide:
-                f.write("**Content:** Table format\n\n")
-            elif 'content' in slide:
-                f.write(f"**Content:** {len(slide['content'])} bullet points\n\n")
-            f.write("---\n\n")
+    if cached:
+        summary = cached["slide_content.md"]
+    else:
+        summary = _format_slide_summary(slide_structure)
+        if cache:
+            cache.put(cache_key, {
+                "slide_structure.json": structure_json,
+                "slide_content.md": summary,
+            })
+    write_if_changed(md_file, summary)
     
     print(f"✅ Saved slide summary to: {md_file}")
     
@@ -1011,15 +959,51 @@ def map_proposal_to_slides(proposal_file: str, architecture_diagram: Optional[st
     }
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python map_to_slides.py <proposal_template.md> [architecture_diagram.md] [output_dir]")
+def _format_slide_summary(slide_structure: Dict[str, Any]) -> str:
+    """Human-readable slide content summary (markdown)"""
+    lines = [
+        f"# Slide Content Summary: {slide_structure['project_name']}\n\n",
+        f"**Client:** {slide_structure['client_name']}\n",
+        f"**Total Slides:** {slide_structure['total_slides']}\n\n",
+        "---\n\n",
+    ]
+    
+    for slide in slide_structure['slides']:
+        lines.append(f"## Slide {slide['slide_number']}: {slide.get('title', 'Untitled')}\n\n")
+        lines.append(f"**Type:** {slide['type']}\n\n")
+        # Add content preview
+        if 'table' in slide:
+            lines.append("**Content:** Table format\n\n")
+        elif 'content' in slide:
+            lines.append(f"**Content:** {len(slide['content'])} bullet points\n\n")
+        lines.append("---\n\n")
+    
+    return ''.join(lines)
+
+
+def main():
+    use_cache = '--no-cache' not in sys.argv
+    diagram_image = None
+    project_info = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--diagram-image='):
+            diagram_image = arg.split('=', 1)[1]
+        elif arg.startswith('--project-info='):
+            project_info = arg.split('=', 1)[1]
+    args = [arg for arg in sys.argv[1:] if arg != '--no-cache'
+            and not arg.startswith(('--diagram-image=', '--project-info='))]
+    
+    if len(args) < 1:
+        print("Usage: python map_to_slides.py <proposal_template.md> [architecture_diagram.md] [output_dir] [--no-cache] "
+              "[--diagram-image=PATH] [--project-info=PROJECT_INFO.json]")
         sys.exit(1)
     
-    proposal_file = sys.argv[1]
-    architecture_diagram = sys.argv[2] if len(sys.argv) > 2 else None
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else None
+    proposal_file = args[0]
+    architecture_diagram = args[1] if len(args) > 1 else None
+    output_dir = args[2] if len(args) > 2 else None
     
-    map_proposal_to_slides(proposal_file, architecture_diagram, output_dir)
+    map_proposal_to_slides(proposal_file, architecture_diagram, output_dir, use_cache, diagram_image, project_info)
 
 
+if __name__ == "__main__":
+    main()